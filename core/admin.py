@@ -0,0 +1,75 @@
+from django.contrib import admin
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils.html import format_html, format_html_join
+
+from .models import Job, RequestProfile
+from .profiling import format_stats
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    """Admin configuration for background jobs (mainly failed ones)."""
+    list_display = ("id", "name", "status", "attempts", "run_at", "created_at")
+    list_filter = ("status", "name")
+    readonly_fields = ("created_at", "locked_by", "locked_at", "last_error")
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    """Read-only view of captured request profiles, with .pstats download."""
+    list_display = ("id", "method", "path", "status_code", "duration_ms", "query_count", "user", "created_at")
+    list_filter = ("method", "status_code")
+    search_fields = ("path",)
+    fields = (
+        "method", "path", "status_code", "duration_ms", "user", "created_at",
+        "download", "report", "sql",
+    )
+    readonly_fields = fields
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_urls(self):
+        return [
+            path(
+                "<int:pk>/download/",
+                self.admin_site.admin_view(self.download_view),
+                name="core_requestprofile_download",
+            ),
+        ] + super().get_urls()
+
+    def download_view(self, request, pk):
+        profile = get_object_or_404(RequestProfile, pk=pk)
+        response = HttpResponse(bytes(profile.stats), content_type="application/octet-stream")
+        response["Content-Disposition"] = f'attachment; filename="request-{pk}.pstats"'
+        return response
+
+    @admin.display(description="Queries")
+    def query_count(self, obj):
+        return len(obj.queries)
+
+    @admin.display(description="pstats file")
+    def download(self, obj):
+        url = reverse("admin:core_requestprofile_download", args=[obj.pk])
+        return format_html('<a href="{}">request-{}.pstats</a>', url, obj.pk)
+
+    @admin.display(description="Top functions (cumulative)")
+    def report(self, obj):
+        return format_html("<pre>{}</pre>", format_stats(bytes(obj.stats)))
+
+    @admin.display(description="SQL")
+    def sql(self, obj):
+        rows = format_html_join(
+            "",
+            "<tr><td>{}</td><td>{}</td><td><code>{}</code></td></tr>",
+            ((q["ms"], q["origin"], q["sql"]) for q in obj.queries),
+        )
+        return format_html(
+            "<table><tr><th>ms</th><th>Issued by</th><th>Statement</th></tr>{}</table>",
+            rows,
+        )
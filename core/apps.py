@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'core'
+
+    def ready(self):
+        # Register job handlers declared in `<app>/jobs.py` modules.
+        from .jobs import autodiscover
+        autodiscover()
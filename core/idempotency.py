@@ -0,0 +1,160 @@
+"""
+Idempotent retries for unsafe requests.
+
+Clients may send `Idempotency-Key: <unique value>` with POST, PUT, PATCH
+or DELETE. IdempotencyMiddleware (core/middleware.py) then:
+
+- claims the key by inserting a pending IdempotencyKey row, unique per
+  user, and stores the status, body, ETag and Location of the response
+  once it is done;
+- answers retries with the stored response (header
+  `Idempotent-Replayed: true`) without reaching the view, so no
+  validation, permission checks or writes run again;
+- makes a retry that arrives while the first request is still running
+  wait for it (up to IDEMPOTENCY_WAIT seconds, then 409);
+- rejects a key reused for a different request with 422.
+
+Only final outcomes are stored. 5xx responses, exceptions and answers
+that depend on state the client is expected to fix or wait out (409,
+412, 428, 429) release the key so the request can be retried for real.
+A pending claim older than IDEMPOTENCY_LOCK_TIMEOUT (its worker died)
+is taken over by the next retry. Keys expire after IDEMPOTENCY_TTL and are swept by the
+`purge_idempotency_keys` command.
+"""
+import hashlib
+import time
+from datetime import timedelta
+from typing import Union
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Q
+from django.http import HttpResponse, JsonResponse
+from django.utils import timezone
+
+from .models import IdempotencyKey
+
+HEADER = "HTTP_IDEMPOTENCY_KEY"
+MAX_KEY_LENGTH = 255
+POLL_INTERVAL = 0.05
+DEFAULT_BATCH_SIZE = 1000
+# Responses that are not stored: retrying may legitimately succeed.
+RETRYABLE_STATUSES = frozenset({409, 412, 428, 429})
+# Response headers stored and replayed along with the body.
+REPLAYED_HEADERS = ("ETag", "Location")
+
+
+def _ttl() -> timedelta:
+    return getattr(settings, "IDEMPOTENCY_TTL", timedelta(hours=24))
+
+
+def _lock_timeout() -> timedelta:
+    return getattr(settings, "IDEMPOTENCY_LOCK_TIMEOUT", timedelta(minutes=1))
+
+
+def fingerprint(request) -> str:
+    """Digest identifying the request a key was first used for."""
+    digest = hashlib.sha256()
+    digest.update(request.method.encode())
+    digest.update(b"\0" + request.get_full_path().encode() + b"\0")
+    digest.update(request.body)
+    return digest.hexdigest()
+
+
+def _claim(user_id: int, key: str, digest: str):
+    """Insert a pending record; return (record, created)."""
+    now = timezone.now()
+    IdempotencyKey.objects.filter(
+        Q(expires_at__lte=now)
+        | Q(status_code__isnull=True, created_at__lte=now - _lock_timeout()),
+        user_id=user_id,
+        key=key,
+    ).delete()
+    try:
+        with transaction.atomic():
+            record = IdempotencyKey.objects.create(
+                user_id=user_id, key=key, fingerprint=digest, expires_at=now + _ttl()
+            )
+        return record, True
+    except IntegrityError:
+        return IdempotencyKey.objects.filter(user_id=user_id, key=key).first(), False
+
+
+def replay(record: IdempotencyKey) -> HttpResponse:
+    response = HttpResponse(
+        bytes(record.body), status=record.status_code, content_type=record.content_type
+    )
+    for name, value in record.headers.items():
+        response[name] = value
+    response["Idempotent-Replayed"] = "true"
+    return response
+
+
+def begin(request, user_id: int, key: str) -> Union[IdempotencyKey, HttpResponse]:
+    """
+    Claim `key` for this request and return the pending record, or return
+    the response to send instead (replay, 409 or 422).
+    """
+    digest = fingerprint(request)
+    deadline = time.monotonic() + getattr(settings, "IDEMPOTENCY_WAIT", 10)
+    while True:
+        record, created = _claim(user_id, key, digest)
+        if created:
+            return record
+        if record is not None:
+            if record.fingerprint != digest:
+                return JsonResponse(
+                    {"detail": "Idempotency-Key was already used for a different request."},
+                    status=422,
+                )
+            if record.status_code is not None:
+                return replay(record)
+        # Pending (or just released): wait for the first request to finish.
+        if time.monotonic() >= deadline:
+            response = JsonResponse(
+                {"detail": "A request with this Idempotency-Key is still in progress."},
+                status=409,
+            )
+            response["Retry-After"] = "1"
+            return response
+        time.sleep(POLL_INTERVAL)
+
+
+def finish(record: IdempotencyKey, response) -> None:
+    """Store a final response for replays; release the key for any other."""
+    if (
+        response.streaming
+        or response.status_code >= 500
+        or response.status_code in RETRYABLE_STATUSES
+    ):
+        release(record)
+        return
+    headers = {name: response[name] for name in REPLAYED_HEADERS if response.has_header(name)}
+    IdempotencyKey.objects.filter(pk=record.pk).update(
+        status_code=response.status_code,
+        content_type=response.get("Content-Type", ""),
+        headers=headers,
+        body=response.content,
+    )
+
+
+def release(record: IdempotencyKey) -> None:
+    IdempotencyKey.objects.filter(pk=record.pk).delete()
+
+
+def purge_expired_keys(batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """Delete expired keys in bounded batches; return how many went."""
+    table = IdempotencyKey._meta.db_table
+    sql = (
+        f"DELETE FROM {table} WHERE id IN "
+        f"(SELECT id FROM {table} WHERE expires_at <= %s LIMIT %s)"
+    )
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+    total = 0
+    while True:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(sql, [now, batch_size])
+            deleted = cursor.rowcount
+        total += deleted
+        if deleted < batch_size:
+            return total
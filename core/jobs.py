@@ -0,0 +1,147 @@
+"""
+Minimal database-backed job queue.
+
+Handlers are registered by name with the `@job` decorator in a `jobs.py`
+module of any installed app. Views call `enqueue()`, which inserts a row
+once the surrounding transaction commits. The `run_jobs` management
+command polls for due rows, claims them with a conditional UPDATE (so
+several workers never run the same job) and retries failures with
+exponential backoff. While a job runs, its worker refreshes `locked_at`
+every HEARTBEAT_INTERVAL; only a job whose heartbeat stopped for
+STALE_AFTER (its worker died) is queued again. No broker is needed; the
+database is the queue.
+"""
+import logging
+import traceback
+from datetime import timedelta
+from typing import Any, Callable, Dict, Optional
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+logger = logging.getLogger(__name__)
+
+# Delay before retry n is BACKOFF_BASE * 2 ** (n - 1), capped at BACKOFF_MAX.
+BACKOFF_BASE = timedelta(seconds=10)
+BACKOFF_MAX = timedelta(hours=1)
+
+# Workers refresh the lock of their running jobs this often ...
+HEARTBEAT_INTERVAL = timedelta(minutes=1)
+# ... so running jobs whose lock is older than this are assumed to be
+# orphaned by a crashed worker and are queued again.
+STALE_AFTER = timedelta(minutes=15)
+
+_registry: Dict[str, Callable[..., Any]] = {}
+
+
+def job(name: str):
+    """Register the decorated function as the handler for `name`."""
+    def decorator(func):
+        _registry[name] = func
+        return func
+    return decorator
+
+
+def autodiscover():
+    """Import `jobs` modules of all installed apps to fill the registry."""
+    autodiscover_modules("jobs")
+
+
+def enqueue(
+    name: str,
+    payload: Optional[Dict[str, Any]] = None,
+    delay: timedelta = timedelta(),
+    max_attempts: int = 5,
+):
+    """
+    Schedule handler `name` with keyword arguments `payload`.
+    The row is written via transaction.on_commit, so a rolled back request
+    never leaves work behind; outside a transaction it is written at once.
+    """
+    if name not in _registry:
+        raise LookupError(f"No job handler registered as {name!r}.")
+
+    def insert():
+        from .models import Job
+        Job.objects.create(
+            name=name,
+            payload=payload or {},
+            run_at=timezone.now() + delay,
+            max_attempts=max_attempts,
+        )
+
+    transaction.on_commit(insert)
+
+
+def backoff(attempts: int) -> timedelta:
+    """Return the retry delay after `attempts` failed runs."""
+    return min(BACKOFF_BASE * 2 ** max(attempts - 1, 0), BACKOFF_MAX)
+
+
+def requeue_stale() -> int:
+    """Put jobs orphaned by a crashed worker back into the queue."""
+    from .models import Job
+    return Job.objects.filter(
+        status=Job.RUNNING, locked_at__lt=timezone.now() - STALE_AFTER
+    ).update(status=Job.QUEUED, locked_by="", locked_at=None)
+
+
+def heartbeat(workers) -> int:
+    """Refresh the lock of the jobs `workers` are running; return how many."""
+    from .models import Job
+    return Job.objects.filter(status=Job.RUNNING, locked_by__in=list(workers)).update(
+        locked_at=timezone.now()
+    )
+
+
+def claim_next(worker: str):
+    """
+    Claim the next due job for `worker`, or return None if nothing is due.
+    A candidate is taken by a conditional UPDATE on its status; losing the
+    race to another worker simply moves on to the next candidate.
+    """
+    from .models import Job
+    now = timezone.now()
+    candidates = (
+        Job.objects.filter(status=Job.QUEUED, run_at__lte=now)
+        .order_by("run_at")
+        .values_list("pk", flat=True)[:10]
+    )
+    for pk in candidates:
+        claimed = Job.objects.filter(pk=pk, status=Job.QUEUED).update(
+            status=Job.RUNNING,
+            locked_by=worker,
+            locked_at=now,
+            attempts=F("attempts") + 1,
+        )
+        if claimed:
+            return Job.objects.get(pk=pk)
+    return None
+
+
+def execute(job_row) -> bool:
+    """
+    Run a claimed job. On success the row is deleted; on failure it is
+    rescheduled with backoff or marked failed after `max_attempts`.
+    Returns True on success.
+    """
+    try:
+        handler = _registry[job_row.name]
+        handler(**job_row.payload)
+    except Exception:
+        logger.exception("Job %s (%s) failed", job_row.pk, job_row.name)
+        job_row.last_error = traceback.format_exc()
+        job_row.locked_by = ""
+        job_row.locked_at = None
+        if job_row.attempts >= job_row.max_attempts:
+            job_row.status = job_row.FAILED
+        else:
+            job_row.status = job_row.QUEUED
+            job_row.run_at = timezone.now() + backoff(job_row.attempts)
+        job_row.save(update_fields=["status", "run_at", "last_error", "locked_by", "locked_at"])
+        return False
+
+    job_row.delete()
+    return True
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from core.idempotency import DEFAULT_BATCH_SIZE, purge_expired_keys
+
+
+class Command(BaseCommand):
+    """
+    Delete expired Idempotency-Key records in bounded batches.
+    Intended to run on a schedule (e.g. hourly from cron).
+    """
+
+    help = "Purge expired idempotency keys in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="Maximum rows removed per DELETE statement.",
+        )
+
+    def handle(self, *args, **options):
+        deleted = purge_expired_keys(batch_size=options["batch_size"])
+        self.stdout.write(f"Purged {deleted} expired idempotency key(s).")
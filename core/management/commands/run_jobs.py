@@ -0,0 +1,96 @@
+import os
+import signal
+import socket
+import threading
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+
+from core.jobs import HEARTBEAT_INTERVAL, claim_next, execute, heartbeat, requeue_stale
+
+
+class Command(BaseCommand):
+    """
+    Worker for the database-backed job queue (see core/jobs.py).
+    Runs N threads that poll for due jobs, plus one that keeps the locks
+    of their running jobs fresh. Ctrl+C / SIGTERM stop taking new jobs and
+    exit once the running ones finish.
+    """
+
+    help = "Process queued background jobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=2,
+            help="Number of worker threads.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Seconds to sleep when the queue is empty.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the due jobs and exit instead of polling forever.",
+        )
+
+    def handle(self, *args, **options):
+        self.stop = threading.Event()
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+        workers = [f"{prefix}:{n}" for n in range(options["threads"])]
+        threads = [
+            threading.Thread(
+                target=self._work,
+                args=(worker, options["poll_interval"], options["once"]),
+                daemon=True,
+            )
+            for worker in workers
+        ]
+        pulse = threading.Thread(target=self._heartbeat, args=(workers,), daemon=True)
+        previous = signal.signal(signal.SIGTERM, lambda signum, frame: self.stop.set())
+        requeue_stale()
+        for thread in threads + [pulse]:
+            thread.start()
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(timeout=0.5)
+        except KeyboardInterrupt:
+            self.stop.set()
+            for thread in threads:
+                thread.join()
+        finally:
+            self.stop.set()
+            pulse.join()
+            signal.signal(signal.SIGTERM, previous)
+
+    def _heartbeat(self, workers):
+        """Refresh the locks of this process's running jobs until stopped."""
+        try:
+            while not self.stop.wait(HEARTBEAT_INTERVAL.total_seconds()):
+                close_old_connections()
+                heartbeat(workers)
+        finally:
+            connection.close()
+
+    def _work(self, worker, poll_interval, once):
+        """Worker thread loop: claim and execute jobs until stopped."""
+        try:
+            while not self.stop.is_set():
+                close_old_connections()
+                job_row = claim_next(worker)
+                if job_row is None:
+                    if once:
+                        break
+                    requeue_stale()
+                    self.stop.wait(poll_interval)
+                    continue
+                label = f"{job_row.name}#{job_row.pk}"
+                ok = execute(job_row)
+                self.stdout.write(f"[{worker}] {label}: {'done' if ok else 'failed'}")
+        finally:
+            connection.close()
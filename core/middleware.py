@@ -0,0 +1,204 @@
+"""Project-wide middleware."""
+import cProfile
+import gzip
+import re
+import time
+
+import brotli
+from django.conf import settings
+from django.db import connection
+from django.http import JsonResponse
+from django.utils.cache import patch_vary_headers
+from rest_framework.exceptions import AuthenticationFailed
+
+from user_auth_app.authentication import ExpiringTokenAuthentication
+
+# Preferred first; brotli compresses JSON noticeably better than gzip.
+SUPPORTED_ENCODINGS = ("br", "gzip")
+
+
+def negotiate_encoding(accept_encoding: str):
+    """Pick the best supported encoding from an Accept-Encoding header."""
+    accepted = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        match = re.search(r"q=([0-9.]+)", params)
+        if match:
+            try:
+                quality = float(match.group(1))
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.strip().lower()] = quality
+    for encoding in SUPPORTED_ENCODINGS:
+        if accepted.get(encoding, accepted.get("*", 0)) > 0:
+            return encoding
+    return None
+
+
+def compression_exempt(view_func):
+    """
+    Mark a view whose responses carry secrets (e.g. auth tokens) next to
+    attacker-influenced input; compressing those leaks the secret through
+    the response length (BREACH), so CompressionMiddleware skips them.
+    """
+    view_func.compression_exempt = True
+    return view_func
+
+
+class CompressionMiddleware:
+    """
+    Compress response bodies with brotli or gzip, negotiated through
+    Accept-Encoding. Bodies smaller than COMPRESSION_MIN_SIZE bytes are
+    sent as-is, since compressing them costs more than it saves; views
+    marked with `compression_exempt` are never compressed.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.min_size = getattr(settings, "COMPRESSION_MIN_SIZE", 1024)
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if response.streaming or response.has_header("Content-Encoding"):
+            return response
+        match = getattr(request, "resolver_match", None)
+        if match is not None and getattr(match.func, "compression_exempt", False):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        if len(response.content) < self.min_size:
+            return response
+
+        encoding = negotiate_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if encoding == "br":
+            compressed = brotli.compress(response.content, quality=5)
+        elif encoding == "gzip":
+            compressed = gzip.compress(response.content, compresslevel=6)
+        else:
+            return response
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response["Content-Length"] = str(len(compressed))
+        response["Content-Encoding"] = encoding
+        # The body bytes changed, so a strong validator would be wrong.
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        return response
+
+
+def _request_user(request):
+    """The authenticated user (API token or session), else None."""
+    try:
+        result = ExpiringTokenAuthentication().authenticate(request)
+    except AuthenticationFailed:
+        return None
+    if result is not None:
+        return result[0]
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return user
+    return None
+
+
+class IdempotencyMiddleware:
+    """
+    Replay the stored response for retried unsafe requests that carry an
+    `Idempotency-Key` header (see core/idempotency.py). Requests without
+    the header, or from anonymous users, pass through untouched.
+    """
+
+    UNSAFE_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        from . import idempotency
+
+        key = request.META.get(idempotency.HEADER)
+        if not key or request.method not in self.UNSAFE_METHODS:
+            return self.get_response(request)
+        user = _request_user(request)
+        if user is None:
+            return self.get_response(request)
+        if len(key) > idempotency.MAX_KEY_LENGTH:
+            return JsonResponse(
+                {"detail": f"Idempotency-Key must be at most {idempotency.MAX_KEY_LENGTH} characters."},
+                status=400,
+            )
+
+        outcome = idempotency.begin(request, user.pk, key)
+        if not isinstance(outcome, idempotency.IdempotencyKey):
+            return outcome
+        try:
+            response = self.get_response(request)
+        except Exception:
+            idempotency.release(outcome)
+            raise
+        idempotency.finish(outcome, response)
+        return response
+
+
+class ProfilingMiddleware:
+    """
+    Run a single request under cProfile when a staff user asks for it with
+    `X-Profile: 1` or `?_profile=1`. The stats and the SQL trace are stored
+    as a RequestProfile (see the admin) and its id is returned in the
+    `X-Profile-Id` response header. Other requests pass through untouched.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not self._requested(request):
+            return self.get_response(request)
+        user = self._staff_user(request)
+        if user is None:
+            return self.get_response(request)
+
+        from .models import RequestProfile
+        from .profiling import QueryRecorder, dump_stats
+
+        recorder = QueryRecorder()
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        with connection.execute_wrapper(recorder):
+            profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.disable()
+        duration_ms = (time.perf_counter() - start) * 1000
+
+        profile = RequestProfile.objects.create(
+            user=user,
+            method=request.method,
+            path=request.get_full_path()[:500],
+            status_code=response.status_code,
+            duration_ms=round(duration_ms, 3),
+            stats=dump_stats(profiler),
+            queries=recorder.queries,
+        )
+        response["X-Profile-Id"] = str(profile.pk)
+        return response
+
+    @staticmethod
+    def _requested(request) -> bool:
+        return (
+            request.META.get("HTTP_X_PROFILE") == "1"
+            or request.GET.get("_profile") == "1"
+        )
+
+    @staticmethod
+    def _staff_user(request):
+        """The requesting staff user (token or session), else None."""
+        user = _request_user(request)
+        if user is not None and user.is_active and user.is_staff:
+            return user
+        return None
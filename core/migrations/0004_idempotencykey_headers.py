@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-19 11:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_idempotencykey'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='idempotencykey',
+            name='headers',
+            field=models.JSONField(blank=True, default=dict, help_text='Response headers replayed with the body (ETag, Location).'),
+        ),
+    ]
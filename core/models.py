@@ -0,0 +1,111 @@
+from django.conf import settings
+from django.db import models
+
+
+class Job(models.Model):
+    """
+    A unit of deferred work, executed by the `run_jobs` worker command.
+    Successful jobs are deleted; failed ones stay for inspection.
+    """
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    FAILED = "failed"
+    STATUS = (
+        (QUEUED, QUEUED),
+        (RUNNING, RUNNING),
+        (FAILED, FAILED),
+    )
+
+    name = models.CharField(
+        max_length=100,
+        help_text="Registered handler name, e.g. 'kanban_app.purge_board'.",
+    )
+    payload = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Keyword arguments passed to the handler.",
+    )
+    status = models.CharField(max_length=10, choices=STATUS, default=QUEUED)
+    run_at = models.DateTimeField(
+        help_text="Earliest time the job may run (pushed back on retry)."
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Serves the worker's "next due job" poll.
+            models.Index(fields=["status", "run_at"], name="job_status_run_at_idx"),
+        ]
+
+    def __str__(self):
+        return f"Job#{self.pk} {self.name} ({self.status})"
+
+
+class RequestProfile(models.Model):
+    """
+    cProfile output and SQL trace of a single request, captured on demand
+    by ProfilingMiddleware for staff users and inspected in the admin.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        on_delete=models.SET_NULL,
+        help_text="Staff user who requested the profile.",
+    )
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=500)
+    status_code = models.PositiveSmallIntegerField()
+    duration_ms = models.FloatField()
+    stats = models.BinaryField(help_text="Marshalled pstats data (load with pstats.Stats).")
+    queries = models.JSONField(
+        default=list,
+        help_text="Executed SQL with timing (ms) and the code that issued it.",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.duration_ms:.0f} ms)"
+
+
+class IdempotencyKey(models.Model):
+    """
+    First response to a request sent with an `Idempotency-Key` header,
+    replayed verbatim for retries of the same request (see idempotency.py).
+    `status_code` stays NULL while the first request is still running;
+    a pending row older than IDEMPOTENCY_LOCK_TIMEOUT is treated as stale.
+    """
+
+    user_id = models.BigIntegerField(help_text="Requesting user; keys are scoped per user.")
+    key = models.CharField(max_length=255)
+    fingerprint = models.CharField(
+        max_length=64,
+        help_text="SHA-256 of method, path and body; a reused key must match it.",
+    )
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    content_type = models.CharField(max_length=100, blank=True)
+    headers = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Response headers replayed with the body (ETag, Location).",
+    )
+    body = models.BinaryField(blank=True, default=b"")
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user_id", "key"], name="idempotency_user_key_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.key} (user {self.user_id}, {self.status_code or 'pending'})"
@@ -0,0 +1,87 @@
+"""
+On-demand profiling of single requests.
+
+ProfilingMiddleware (core/middleware.py) runs a request under cProfile
+when a staff user sends `X-Profile: 1` or `?_profile=1`. Every SQL
+statement executed meanwhile is recorded with its duration and the code
+that issued it: the innermost serializer method on the stack (e.g.
+"BoardDetailSerializer.get_tasks"), otherwise the innermost project frame.
+"""
+import io
+import marshal
+import pstats
+import sys
+import time
+from pathlib import Path
+
+from django.conf import settings
+from rest_framework.serializers import BaseSerializer
+
+PROJECT_ROOT = str(Path(settings.BASE_DIR).resolve())
+_DRF_ROOT = str(Path(sys.modules["rest_framework"].__file__).resolve().parent)
+# Frames of the profiling machinery itself are never reported as origin.
+_OWN_FILES = {
+    str(Path(__file__).resolve()),
+    str(Path(__file__).resolve().with_name("middleware.py")),
+}
+
+
+def _origin(frame) -> str:
+    """Describe the code responsible for the query executed below `frame`."""
+    fallback = None
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        owner = frame.f_locals.get("self")
+        if isinstance(owner, BaseSerializer) and not filename.startswith(_DRF_ROOT):
+            return f"{type(owner).__name__}.{frame.f_code.co_name}"
+        if (
+            fallback is None
+            and filename.startswith(PROJECT_ROOT)
+            and "site-packages" not in filename
+            and filename not in _OWN_FILES
+        ):
+            relative = filename[len(PROJECT_ROOT) + 1:]
+            fallback = f"{relative}:{frame.f_lineno} ({frame.f_code.co_name})"
+        frame = frame.f_back
+    return fallback or "?"
+
+
+class QueryRecorder:
+    """`connection.execute_wrapper` hook collecting SQL, timings and origins."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append({
+                "sql": sql,
+                "ms": round((time.perf_counter() - start) * 1000, 3),
+                "origin": _origin(sys._getframe(1)),
+            })
+
+
+def dump_stats(profiler) -> bytes:
+    """Serialize profiler results in the pstats file format."""
+    return marshal.dumps(pstats.Stats(profiler).stats)
+
+
+class _StoredStats:
+    """Adapter letting pstats.Stats load previously marshalled data."""
+
+    def __init__(self, data: bytes):
+        self.stats = marshal.loads(data)
+
+    def create_stats(self):
+        pass
+
+
+def format_stats(data: bytes, limit: int = 40) -> str:
+    """Human-readable top functions by cumulative time."""
+    stream = io.StringIO()
+    stats = pstats.Stats(_StoredStats(data), stream=stream)
+    stats.sort_stats("cumulative").print_stats(limit)
+    return stream.getvalue()
@@ -0,0 +1,25 @@
+"""Additional DRF renderers."""
+import msgpack
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Render responses as MessagePack. Selected with
+    `Accept: application/msgpack` or `?format=msgpack`.
+    """
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def __init__(self):
+        # Reuse DRF's JSON conversions for dates, decimals, UUIDs, ...
+        self._encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=self._encoder.default, use_bin_type=True)
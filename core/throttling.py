@@ -0,0 +1,134 @@
+"""
+Fixed-window counter throttles.
+
+DRF's SimpleRateThrottle stores the full list of request timestamps per
+key and rewrites it to the cache on every request, so a 5000/day rate
+means thousands of floats (de)serialized per call. These throttles keep a
+single integer per key and window instead. A small in-process shard
+batches increments and only talks to the shared cache every few hits,
+more often as the count approaches the limit, which bounds overshoot to
+roughly one batch per process.
+
+Scopes and rates come from the usual DEFAULT_THROTTLE_RATES setting.
+"""
+import threading
+import time
+
+from rest_framework import throttling
+
+# A process syncs with the shared cache after this share of the limit ...
+SYNC_FRACTION = 50
+# ... or after this many seconds, whichever comes first.
+SYNC_INTERVAL = 5.0
+
+
+class _Window:
+    """Local view of one counter window."""
+    __slots__ = ("known", "pending", "synced_at", "expires_at")
+
+    def __init__(self, now, expires_at):
+        self.known = 0
+        self.pending = 0
+        self.synced_at = now
+        self.expires_at = expires_at
+
+
+class LocalCounterShard:
+    """Process-local batching layer in front of the shared cache counters."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.windows = {}
+
+    def hit(self, cache, key, ttl, limit):
+        """Count one request for `key`; return the estimated window total."""
+        now = time.monotonic()
+        batch = max(1, limit // SYNC_FRACTION)
+        with self.lock:
+            window = self.windows.get(key)
+            if window is None or now >= window.expires_at:
+                if len(self.windows) > 10000:
+                    self._prune(now)
+                window = self.windows[key] = _Window(now, now + ttl)
+            window.pending += 1
+            estimate = window.known + window.pending
+            must_sync = (
+                window.pending >= batch
+                or estimate >= limit - batch
+                or now - window.synced_at >= SYNC_INTERVAL
+            )
+            if not must_sync:
+                return estimate
+            delta, window.pending = window.pending, 0
+            window.synced_at = now
+
+        total = self._increment(cache, key, delta, ttl)
+        with self.lock:
+            window.known = total
+            return total + window.pending
+
+    @staticmethod
+    def _increment(cache, key, delta, ttl):
+        cache.add(key, 0, ttl)
+        try:
+            return cache.incr(key, delta)
+        except ValueError:
+            # Expired between add() and incr(): start a fresh window.
+            cache.set(key, delta, ttl)
+            return delta
+
+    def _prune(self, now):
+        for key in [k for k, w in self.windows.items() if now >= w.expires_at]:
+            del self.windows[key]
+
+
+_shard = LocalCounterShard()
+
+
+class FixedWindowThrottleMixin:
+    """
+    Replace SimpleRateThrottle's timestamp history with one counter per
+    key and fixed window. Keys are scoped by window index, so expired
+    windows simply time out of the cache.
+    """
+
+    shard = _shard
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window = int(self.now // self.duration)
+        self.window_end = (window + 1) * self.duration
+        count = self.shard.hit(
+            self.cache, f"{self.key}:{window}", self.duration + 1, self.num_requests
+        )
+        return count <= self.num_requests
+
+    def wait(self):
+        return max(self.window_end - self.now, 0)
+
+
+class AnonRateThrottle(FixedWindowThrottleMixin, throttling.AnonRateThrottle):
+    """Counter-based replacement for DRF's AnonRateThrottle (scope 'anon')."""
+
+
+class UserRateThrottle(FixedWindowThrottleMixin, throttling.UserRateThrottle):
+    """Counter-based replacement for DRF's UserRateThrottle (scope 'user')."""
+
+
+class ScopedRateThrottle(FixedWindowThrottleMixin, throttling.ScopedRateThrottle):
+    """Counter-based replacement for DRF's ScopedRateThrottle (view `throttle_scope`)."""
+
+    def allow_request(self, request, view):
+        # Same scope resolution as DRF: no throttle_scope, no throttling.
+        self.scope = getattr(view, self.scope_attr, None)
+        if not self.scope:
+            return True
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return FixedWindowThrottleMixin.allow_request(self, request, view)
@@ -4,7 +4,7 @@ from django.contrib import admin
 
 from .boards.models import Board, BoardMember
 from .comments.models import Comment
-from .tasks.models import Task
+from .tasks.models import Label, Task
 
 
 # --- Boards -----------------------------------------------------------------
@@ -36,6 +36,15 @@ class BoardMemberAdmin(admin.ModelAdmin):
     readonly_fields = ("joined_at",)
 
 
+@admin.register(Label)
+class LabelAdmin(admin.ModelAdmin):
+    """Admin configuration for board labels."""
+    list_display = ("id", "name", "board", "color", "usage_count", "created_at")
+    search_fields = ("name", "board__title")
+    autocomplete_fields = ("board",)
+    readonly_fields = ("usage_count", "created_at")
+
+
 # --- Tasks & Comments --------------------------------------------------------
 
 
@@ -0,0 +1,146 @@
+"""
+POST /api/batch/ - several kanban API calls in one round trip.
+
+    {
+      "parallel": true,
+      "requests": [
+        {"method": "GET", "path": "/api/boards/3/"},
+        {"method": "GET", "path": "/api/tasks/assigned-to-me/?status=review"},
+        {"method": "POST", "path": "/api/tasks/12/comments/", "body": {"content": "ok"}}
+      ]
+    }
+
+Sub-requests are dispatched to the routes of kanban_app/urls.py as the
+batch's authenticated user: authentication happens once, for the batch
+itself, and board membership checks are memoized across all
+sub-requests. Every sub-request is charged against the user and scoped
+throttles like a separate request; one over the limit gets its own 429
+entry (with Retry-After) while the rest of the batch proceeds. The response is an array with one
+{"status", "headers", "body"} entry per sub-request, in order. Writes run
+sequentially, each on its own (as separate requests would). With
+"parallel": true, a batch made only of GETs runs on a small thread pool.
+"""
+import io
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import connections
+from django.urls import Resolver404, resolve
+from rest_framework import serializers, status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .resolvers import MEMBERSHIP_MEMO_ATTR, membership_memo
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX = "/api/"
+MAX_SUBREQUESTS = 20
+MAX_PARALLEL = 4
+# Response headers worth passing through to the client.
+FORWARDED_HEADERS = ("ETag", "Location", "Retry-After")
+
+
+class SubRequestSerializer(serializers.Serializer):
+    method = serializers.ChoiceField(choices=["GET", "POST", "PUT", "PATCH", "DELETE"])
+    path = serializers.CharField()
+    body = serializers.JSONField(required=False)
+
+    def validate_path(self, value):
+        if not value.startswith(API_PREFIX):
+            raise serializers.ValidationError(f"Path must start with {API_PREFIX}.")
+        return value
+
+
+class BatchSerializer(serializers.Serializer):
+    requests = serializers.ListField(
+        child=SubRequestSerializer(), allow_empty=False, max_length=MAX_SUBREQUESTS
+    )
+    parallel = serializers.BooleanField(default=False)
+
+
+class BatchView(APIView):
+    """Run a list of kanban API sub-requests in one authenticated context."""
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = BatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        items = serializer.validated_data["requests"]
+        memo = membership_memo(request)
+
+        if serializer.validated_data["parallel"] and all(i["method"] == "GET" for i in items):
+            with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL, len(items))) as pool:
+                results = list(pool.map(lambda item: self._run_in_thread(request, item, memo), items))
+        else:
+            results = []
+            for item in items:
+                results.append(self._run(request, item, memo))
+                if item["method"] != "GET":
+                    # A write may have changed memberships.
+                    memo.clear()
+        return Response(results, status=status.HTTP_200_OK)
+
+    def _run_in_thread(self, request, item, memo):
+        try:
+            return self._run(request, item, memo)
+        finally:
+            # Worker threads open their own connections; don't leak them.
+            connections.close_all()
+
+    def _run(self, request, item, memo):
+        url = urlsplit(item["path"])
+        try:
+            match = resolve(url.path[len(API_PREFIX) - 1:], urlconf="kanban_app.urls")
+        except Resolver404:
+            return _result(status.HTTP_404_NOT_FOUND, {}, {"detail": "Not found."})
+        if match.func.view_class is BatchView:
+            return _result(status.HTTP_400_BAD_REQUEST, {}, {"detail": "Batches cannot be nested."})
+
+        sub_request = _sub_request(request, item, url)
+        setattr(sub_request, MEMBERSHIP_MEMO_ATTR, memo)
+        try:
+            response = match.func(sub_request, *match.args, **match.kwargs)
+        except Exception:
+            logger.exception("Batch sub-request %s %s failed", item["method"], item["path"])
+            return _result(
+                status.HTTP_500_INTERNAL_SERVER_ERROR, {}, {"detail": "Internal server error."}
+            )
+        headers = {name: response[name] for name in FORWARDED_HEADERS if response.has_header(name)}
+        return _result(response.status_code, headers, getattr(response, "data", None))
+
+
+def _result(status_code, headers, body):
+    return {"status": status_code, "headers": headers, "body": body}
+
+
+def _sub_request(request, item, url) -> WSGIRequest:
+    """Build the HttpRequest for one sub-request, authenticated as the batch user."""
+    body = b""
+    if "body" in item:
+        body = json.dumps(item["body"]).encode()
+    environ = {
+        key: value
+        for key, value in request.META.items()
+        if key.startswith(("HTTP_", "SERVER_", "REMOTE_", "wsgi."))
+        and key != "HTTP_IDEMPOTENCY_KEY"
+    }
+    environ.update({
+        "REQUEST_METHOD": item["method"],
+        "PATH_INFO": url.path,
+        "SCRIPT_NAME": "",
+        "QUERY_STRING": url.query,
+        "CONTENT_TYPE": "application/json",
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.input": io.BytesIO(body),
+    })
+    sub_request = WSGIRequest(environ)
+    # Reuse the batch's authentication instead of running it again.
+    sub_request._force_auth_user = request.user
+    sub_request._force_auth_token = request.auth
+    return sub_request
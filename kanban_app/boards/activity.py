@@ -0,0 +1,34 @@
+"""
+Board change tracking.
+
+Every write that changes what GET /api/boards/{id}/ returns (tasks, their
+ranks, rollups, labels and comment counters) calls `touch_board` in the
+same transaction. It bumps `Board.version`, which keys the board detail
+single-flight and is its ETag, and moves `Board.last_activity_at` for the
+board list ordering, in one UPDATE.
+
+Writes that read the board's tasks before changing them (rank neighbours,
+parent links) first take `lock_board`. Locks are taken task rows first,
+board row second, the order every write reaches `touch_board` in.
+"""
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Board
+
+
+def touch_board(board_id: int) -> None:
+    """Record a change to the board's payload (new version, activity now)."""
+    touch_boards([board_id])
+
+
+def touch_boards(board_ids) -> None:
+    """`touch_board` for several boards (ids or an id subquery) at once."""
+    Board.all_objects.filter(pk__in=board_ids).update(
+        version=F("version") + 1, last_activity_at=timezone.now()
+    )
+
+
+def lock_board(board_id: int) -> None:
+    """Lock the board row until the transaction ends (SELECT ... FOR UPDATE)."""
+    list(Board.all_objects.select_for_update().filter(pk=board_id).values_list("pk"))
@@ -1,10 +1,13 @@
+import re
 from typing import TYPE_CHECKING, Any, Dict
 
 from django.contrib.auth import get_user_model
 from django.db import IntegrityError
-from django.db.models import Count 
 from rest_framework import serializers
 
+from ...sparse import SparseFieldsetMixin, trim_queryset, wants
+from ...tasks.labels import label_prefetch, task_label_ids
+from ...tasks.models import Label, Task
 from ..models import Board, BoardMember
 
 if TYPE_CHECKING:
@@ -12,8 +15,11 @@ if TYPE_CHECKING:
 
 User = get_user_model()
 
+# Upper bound for one POST /api/boards/{id}/members/invite/ request.
+MAX_INVITE_EMAILS = 500
 
-class BoardListSerializer(serializers.ModelSerializer):
+
+class BoardListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer for listing boards with aggregated counters.
     """
@@ -34,6 +40,9 @@ class BoardListSerializer(serializers.ModelSerializer):
             "tasks_to_do_count",
             "tasks_high_prio_count",
             "owner_id",
+            "archived",
+            "is_template",
+            "last_activity_at",
         ]
 
 
@@ -106,11 +115,32 @@ class UserLiteSerializer(serializers.ModelSerializer):
         return name.strip() or obj.username
 
 
-class TaskLiteSerializer(serializers.Serializer):
+class TaskLiteSerializer(SparseFieldsetMixin, serializers.Serializer):
     """
     Lightweight serializer for tasks, including basic fields and user references.
     """
 
+    expandable_fields = {"assignee": "assignee_id", "reviewer": "reviewer_id"}
+
+    # Model fields read per payload field (see kanban_app.sparse.trim_queryset)
+    sparse_columns = {
+        "title": ["title"],
+        "description": ["description"],
+        "status": ["status"],
+        "priority": ["priority"],
+        "assignee": ["assignee"],
+        "reviewer": ["reviewer"],
+        "due_date": ["due_date"],
+        "rank": ["rank"],
+        "version": ["version"],
+        "comments_count": ["comments_count"],
+        "last_comment_at": ["last_comment_at"],
+        "labels": [],
+        "parent": ["parent"],
+        "subtasks_total": ["subtasks_total"],
+        "subtasks_done": ["subtasks_done"],
+    }
+
     id = serializers.IntegerField()
     title = serializers.CharField()
     description = serializers.SerializerMethodField()
@@ -119,7 +149,14 @@ class TaskLiteSerializer(serializers.Serializer):
     assignee = serializers.SerializerMethodField()
     reviewer = serializers.SerializerMethodField()
     due_date = serializers.SerializerMethodField()
-    comments_count = serializers.SerializerMethodField()
+    comments_count = serializers.IntegerField()
+    last_comment_at = serializers.DateTimeField()
+    labels = serializers.SerializerMethodField()
+    parent = serializers.IntegerField(source="parent_id", allow_null=True)
+    subtasks_total = serializers.IntegerField()
+    subtasks_done = serializers.IntegerField()
+    rank = serializers.CharField()
+    version = serializers.IntegerField()
 
     def get_description(self, obj):
         return getattr(obj, "description", None)
@@ -140,22 +177,62 @@ class TaskLiteSerializer(serializers.Serializer):
         d = getattr(obj, "due_date", None)
         return d.isoformat() if d else None
 
-    def get_comments_count(self, obj):
-        return getattr(obj, "comments_count", 0)
+    def get_labels(self, obj):
+        return task_label_ids(obj)
 
 
-class BoardDetailSerializer(serializers.ModelSerializer):
+class LabelSerializer(serializers.ModelSerializer):
+    """
+    Serializer for board labels. The board comes from the URL and is passed
+    in the context; names are unique per board.
+    """
+
+    class Meta:
+        model = Label
+        fields = ["id", "name", "color", "usage_count"]
+        read_only_fields = ["usage_count"]
+
+    def validate_color(self, value):
+        if not re.fullmatch(r"#[0-9a-fA-F]{6}", value):
+            raise serializers.ValidationError("Expected a hex color like #1e88e5.")
+        return value.lower()
+
+    def validate_name(self, value):
+        value = value.strip()
+        if not value:
+            raise serializers.ValidationError("This field may not be blank.")
+        clashes = Label.objects.filter(board=self.context["board"], name=value)
+        if self.instance is not None:
+            clashes = clashes.exclude(pk=self.instance.pk)
+        if clashes.exists():
+            raise serializers.ValidationError("A label with this name already exists.")
+        return value
+
+
+class BoardDetailSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer for retrieving a board with owner, members, and tasks.
+    Supports ?fields= (e.g. "id,title,tasks.id,tasks.status") and ?expand=.
     """
 
     owner_id = serializers.IntegerField(read_only=True)
     members = serializers.SerializerMethodField()
+    labels = serializers.SerializerMethodField()
     tasks = serializers.SerializerMethodField()
 
     class Meta:
         model = Board
-        fields = ["id", "title", "owner_id", "members", "tasks"]
+        fields = [
+            "id",
+            "title",
+            "owner_id",
+            "archived",
+            "is_template",
+            "version",
+            "members",
+            "labels",
+            "tasks",
+        ]
 
     def get_members(self, obj):
         """
@@ -164,26 +241,47 @@ class BoardDetailSerializer(serializers.ModelSerializer):
         qs = obj.members.exclude(pk=obj.owner_id)
         return UserLiteSerializer(qs, many=True).data
 
+    def get_labels(self, obj):
+        """
+        Return the board's labels, so task label ids can be resolved client-side.
+        """
+        qs = Label.objects.filter(board_id=obj.pk).order_by("name")
+        return LabelSerializer(qs, many=True).data
+
     def get_tasks(self, obj):
         """
-        Return lightweight representation of tasks belonging to this board.
+        Return lightweight representation of tasks belonging to this board,
+        ordered by column and rank (served by the board/status/rank index).
+        Only the columns and joins needed by the requested task fields are
+        loaded; comment counts are plain columns on Task and label ids come
+        from one prefetch query on TaskLabel.
         """
-        qs = (
-            obj.tasks.all()
-            .only("id", "title", "status", "priority", "assignee_id", "reviewer_id")
-            .select_related("assignee", "reviewer")
-            .annotate(comments_count=Count("comments"))
-        )
-        return TaskLiteSerializer(qs, many=True).data
+        fieldset = self.nested_fieldset("tasks")
+        expand = self.context.get("expand") or set()
+        # Not obj.tasks: the related manager would load deferred board_id per row.
+        qs = trim_queryset(
+            Task.all_objects.filter(board_id=obj.pk),
+            fieldset,
+            expand,
+            columns=TaskLiteSerializer.sparse_columns,
+            relations=("assignee", "reviewer"),
+        ).order_by("status", "rank", "id")
+        if wants(fieldset, "labels"):
+            qs = qs.prefetch_related(label_prefetch())
+        return TaskLiteSerializer(
+            qs, many=True, fieldset=fieldset, context={"expand": expand}
+        ).data
 
 
 class BoardPatchSerializer(serializers.Serializer):
     """
     Input serializer for partially updating a board.
-    Supports updating title and replacing members.
+    Supports updating title, archiving, the template flag and replacing members.
     """
 
     title = serializers.CharField(max_length=200, required=False, allow_blank=False)
+    archived = serializers.BooleanField(required=False)
+    is_template = serializers.BooleanField(required=False)
     members = serializers.ListField(
         child=serializers.IntegerField(min_value=1),
         required=False,
@@ -205,6 +303,31 @@ class BoardPatchSerializer(serializers.Serializer):
         return ids
 
 
+class BoardInviteSerializer(serializers.Serializer):
+    """
+    Input serializer for inviting users to a board by email.
+    Emails are compared case-insensitively; duplicates are collapsed.
+    """
+
+    emails = serializers.ListField(
+        child=serializers.EmailField(),
+        allow_empty=False,
+        max_length=MAX_INVITE_EMAILS,
+    )
+
+
+class BoardCloneSerializer(serializers.Serializer):
+    """
+    Input serializer for cloning a board (e.g. a template) into a new one
+    owned by the requesting user. The title defaults to the source's.
+    """
+
+    title = serializers.CharField(max_length=200, required=False, allow_blank=False)
+    include_members = serializers.BooleanField(default=True)
+    include_comments = serializers.BooleanField(default=False)
+    as_template = serializers.BooleanField(default=False)
+
+
 class BoardUpdateResponseSerializer(serializers.ModelSerializer):
     """
     Output serializer for board updates.
@@ -216,7 +339,15 @@ class BoardUpdateResponseSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Board
-        fields = ["id", "title", "owner_data", "members_data"]
+        fields = [
+            "id",
+            "title",
+            "archived",
+            "is_template",
+            "version",
+            "owner_data",
+            "members_data",
+        ]
 
     def _fullname(self, u: "DjangoUser") -> str:
         name = f"{u.first_name} {u.last_name}".strip()
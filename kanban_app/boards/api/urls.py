@@ -1,8 +1,24 @@
 from django.urls import path
 
-from .views import BoardListCreateView, BoardDetailUpdateDeleteView
+from kanban_app.tasks.api.views import BoardTaskListView
+
+from .views import (
+    BoardCloneView,
+    BoardDependenciesView,
+    BoardDetailUpdateDeleteView,
+    BoardInviteView,
+    BoardLabelDetailView,
+    BoardLabelListCreateView,
+    BoardListCreateView,
+)
 
 urlpatterns = [
     path('', BoardListCreateView.as_view(), name='boards-list-create'),
     path('<int:board_id>/', BoardDetailUpdateDeleteView.as_view(), name='boards-detail-update-delete'),
+    path('<int:board_id>/members/invite/', BoardInviteView.as_view(), name='boards-members-invite'),
+    path('<int:board_id>/labels/', BoardLabelListCreateView.as_view(), name='boards-label-list-create'),
+    path('<int:board_id>/labels/<int:label_id>/', BoardLabelDetailView.as_view(), name='boards-label-detail'),
+    path('<int:board_id>/clone/', BoardCloneView.as_view(), name='boards-clone'),
+    path('<int:board_id>/dependencies/', BoardDependenciesView.as_view(), name='boards-dependencies'),
+    path('<int:board_id>/tasks/', BoardTaskListView.as_view(), name='boards-task-list'),
 ]
@@ -1,7 +1,11 @@
+import copy
+
 from django.db.models import Count, F, Q, Value
 from django.db.models.functions import Coalesce
 from django.shortcuts import get_object_or_404
 from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
 
 from rest_framework import status
 from rest_framework.exceptions import PermissionDenied
@@ -11,54 +15,112 @@ from rest_framework.generics import (
 )
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.jobs import enqueue
+from user_auth_app.models import normalize_email
 
-from ..models import Board
+from ..activity import touch_board
+from ..cloning import clone_board
+from ..models import Board, BoardMember
+from ...tasks.dependencies import analyze
+from ...tasks.models import Label
+from ...tasks.reminders import forget_member_digests
 from .serializers import (
+    BoardCloneSerializer,
     BoardCreateSerializer,
     BoardDetailSerializer,
+    BoardInviteSerializer,
     BoardListSerializer,
     BoardPatchSerializer,
     BoardUpdateResponseSerializer,
+    LabelSerializer,
+    UserLiteSerializer,
 )
+from ...compact import compact_members, compact_tasks, wants_compact
+from ...concurrency import etag_for, expected_version, versioned_update
+from ...pagination import BoardActivityPagination
 from ...permissions import IsBoardOwner, IsBoardOwnerOrMember
+from ...singleflight import SingleFlight
+from ...sparse import sparse_context, wants
+
+# Coalesces identical concurrent board detail payloads (see retrieve()).
+_board_payloads = SingleFlight()
+
+
+def _board_with_counters(board_id):
+    """The board annotated with the counters of the board list payload."""
+    return (
+        Board.objects.filter(pk=board_id)
+        .select_related("owner")
+        .annotate(
+            members_only=Count("members", distinct=True),
+            ticket_count=Count("tasks", distinct=True),
+            tasks_to_do_count=Count(
+                "tasks", filter=Q(tasks__status="to_do"), distinct=True
+            ),
+            tasks_high_prio_count=Count(
+                "tasks", filter=Q(tasks__priority="high"), distinct=True
+            ),
+        )
+        .annotate(member_count=Coalesce(F("members_only"), Value(0)))
+        .first()
+    )
 
 
 class BoardListCreateView(ListCreateAPIView):
     """
     API endpoint for listing all boards the user has access to
     or creating a new board.
+
+    Boards are listed most recently active first; archived boards only
+    with ?archived=true, template boards only with ?templates=true.
+    ?limit=N returns the top N with a `next` cursor.
     """
 
     permission_classes = [IsAuthenticated]
+    pagination_class = BoardActivityPagination
 
     def get_serializer_class(self):
         # Choose serializer based on request method (create vs. list)
         return BoardCreateSerializer if self.request.method == "POST" else BoardListSerializer
 
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context.update(sparse_context(self.request))
+        return context
+
     def get_queryset(self):
         """
         Return boards where the user is either the owner or a member.
-        Adds annotation fields like task counts and member counts.
+        Adds annotation fields like task counts and member counts; with
+        ?fields= only the requested counters are computed.
         """
         user = self.request.user
+        fieldset = sparse_context(self.request)["fieldset"]
+        archived = self.request.query_params.get("archived") == "true"
+        templates = self.request.query_params.get("templates") == "true"
         queryset = (
-            Board.objects.filter(Q(owner=user) | Q(members=user))
+            Board.objects.filter(
+                Q(owner=user) | Q(members=user), archived=archived, is_template=templates
+            )
             .distinct()
-            .select_related("owner")
+            .order_by("-last_activity_at", "-id")
         )
 
-        queryset = queryset.annotate(
-            members_only=Count("members", distinct=True),
-            ticket_count=Count("tasks", distinct=True),
-            tasks_to_do_count=Count(
+        counters = {
+            "member_count": Count("members", distinct=True),
+            "ticket_count": Count("tasks", distinct=True),
+            "tasks_to_do_count": Count(
                 "tasks", filter=Q(tasks__status="to_do"), distinct=True
             ),
-            tasks_high_prio_count=Count(
+            "tasks_high_prio_count": Count(
                 "tasks", filter=Q(tasks__priority="high"), distinct=True
             ),
-        ).annotate(
-            member_count=Coalesce(F("members_only"), Value(0))
-        )
+        }
+        wanted = {name: expr for name, expr in counters.items() if wants(fieldset, name)}
+        if wanted:
+            queryset = queryset.annotate(**wanted)
         return queryset
 
     def create(self, request, *args, **kwargs):
@@ -70,23 +132,7 @@ class BoardListCreateView(ListCreateAPIView):
         serializer.is_valid(raise_exception=True)
         board = serializer.save()
 
-        annotated = (
-            Board.objects.filter(pk=board.pk)
-            .select_related("owner")
-            .annotate(
-                members_only=Count("members", distinct=True),
-                ticket_count=Count("tasks", distinct=True),
-                tasks_to_do_count=Count(
-                    "tasks", filter=Q(tasks__status="to_do"), distinct=True
-                ),
-                tasks_high_prio_count=Count(
-                    "tasks", filter=Q(tasks__priority="high"), distinct=True
-                ),
-            )
-            .annotate(member_count=Coalesce(F("members_only"), Value(0)))
-            .first()
-        )
-        out = BoardListSerializer(annotated)
+        out = BoardListSerializer(_board_with_counters(board.pk))
         return Response(out.data, status=status.HTTP_201_CREATED)
 
 
@@ -97,7 +143,9 @@ class BoardDetailUpdateDeleteView(RetrieveUpdateDestroyAPIView):
     """
 
     lookup_url_kwarg = "board_id"
-    queryset = Board.objects.select_related("owner").prefetch_related("members", "tasks")
+    # Members and tasks are queried by the serializers themselves (only
+    # when requested), so prefetching them here would be wasted work.
+    queryset = Board.objects.select_related("owner")
     permission_classes = [IsAuthenticated, IsBoardOwnerOrMember]
 
     def get_permissions(self):
@@ -114,44 +162,285 @@ class BoardDetailUpdateDeleteView(RetrieveUpdateDestroyAPIView):
         self.check_object_permissions(self.request, board)
         return board
 
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context.update(sparse_context(self.request))
+        return context
+
     def get_serializer_class(self):
         # Use patch serializer for partial updates, detail otherwise
         if self.request.method == "PATCH":
             return BoardPatchSerializer
         return BoardDetailSerializer
 
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Board payloads do not depend on the requesting user, so concurrent
+        opens of the same board version (e.g. everyone joining a stand-up)
+        share one serializer run. Access is still checked per request in
+        get_object().
+        """
+        board = self.get_object()
+        params = request.query_params
+        key = (board.pk, board.version, params.get("fields"), params.get("expand"))
+        data = _board_payloads.do(key, lambda: self.get_serializer(board).data)
+        if wants_compact(request):
+            # The payload may be shared with other requests: compact a copy.
+            data = copy.deepcopy(data)
+            # Users appear once in "users"; members/tasks refer to them by id.
+            users = {}
+            if "members" in data:
+                data["members"] = compact_members(data["members"], users)
+            compact_tasks(data.get("tasks", []), users)
+            data["users"] = users
+        response = Response(data)
+        response["ETag"] = etag_for(board.version)
+        return response
+
     def patch(self, request, *args, **kwargs):
         """
         Update board fields (title and/or members).
         Returns a custom response serializer with owner and members info.
+        With If-Match, the update only applies if the board version still
+        matches (412 otherwise); the version is bumped in the same UPDATE.
         """
         board = self.get_object()
         in_serializer = BoardPatchSerializer(data=request.data, context={"request": request})
         in_serializer.is_valid(raise_exception=True)
         data = in_serializer.validated_data
 
-        # Update title if provided
-        if "title" in data:
-            board.title = data["title"]
-            board.save(update_fields=["title"])
+        with transaction.atomic():
+            # Update title/archived (if provided), bump the version and the
+            # activity timestamp in one statement
+            fields = {
+                k: data[k] for k in ("title", "archived", "is_template") if k in data
+            }
+            fields["last_activity_at"] = timezone.now()
+            versioned_update(
+                Board.objects, board.pk, expected_version(request), **fields
+            )
 
-        # Update members if provided
-        if "members" in data:
-            User = get_user_model()
-            users = list(User.objects.filter(id__in=data["members"]))
-            board.members.set(users)
+            # Update members if provided
+            if "members" in data:
+                User = get_user_model()
+                users = list(User.objects.filter(id__in=data["members"]))
+                removed = set(
+                    BoardMember.objects.filter(board_id=board.pk).values_list(
+                        "user_id", flat=True
+                    )
+                ) - {user.pk for user in users} - {board.owner_id}
+                board.members.set(users)
+                # Removed members stop seeing the board's tasks as due-soon.
+                forget_member_digests(board.pk, removed)
 
-        
-            if getattr(board, "_prefetched_objects_cache", None):
-                board._prefetched_objects_cache.pop("members", None)
+                if getattr(board, "_prefetched_objects_cache", None):
+                    board._prefetched_objects_cache.pop("members", None)
 
+        board.refresh_from_db(fields=["title", "archived", "is_template", "version"])
         out = BoardUpdateResponseSerializer(board)
-        return Response(out.data, status=status.HTTP_200_OK)
+        response = Response(out.data, status=status.HTTP_200_OK)
+        response["ETag"] = etag_for(board.version)
+        return response
 
     def destroy(self, request, *args, **kwargs):
         """
-        Delete the board. Permission narrowed to owner in get_permissions().
+        Soft-delete the board. Permission narrowed to owner in get_permissions().
+        The board disappears from all querysets immediately; tasks, comments
+        and memberships are purged by a background job (`run_jobs`), with
+        `purge_deleted_boards` as a fallback sweep.
         """
         board = self.get_object()
-        board.delete()
+        Board.objects.filter(pk=board.pk).update(deleted_at=timezone.now())
+        enqueue("kanban_app.purge_board", {"board_id": board.pk})
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class BoardInviteView(APIView):
+    """
+    POST /api/boards/{board_id}/members/invite/ with {"emails": [...]}.
+
+    Resolves all emails with one IN query on the indexed normalized email
+    column, adds the matching users as members in a single bulk insert and
+    reports which emails are unknown. Open to board owners and members,
+    like PATCH on the board's member list.
+    """
+
+    permission_classes = [IsAuthenticated, IsBoardOwnerOrMember]
+
+    def post(self, request, board_id):
+        board = get_object_or_404(Board.objects.only("id", "owner_id"), pk=board_id)
+        self.check_object_permissions(request, board)
+        serializer = BoardInviteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        # normalized email -> first spelling the client sent
+        requested = {}
+        for email in serializer.validated_data["emails"]:
+            requested.setdefault(normalize_email(email), email)
+
+        User = get_user_model()
+        users = list(
+            User.objects.filter(userprofile__email_normalized__in=requested)
+            .annotate(email_key=F("userprofile__email_normalized"))
+            .only("id", "email", "first_name", "last_name", "username")
+        )
+        found = {user.email_key for user in users}
+
+        with transaction.atomic():
+            existing = set(
+                BoardMember.objects.filter(
+                    board_id=board.pk, user__in=[u.pk for u in users]
+                ).values_list("user_id", flat=True)
+            )
+            existing.add(board.owner_id)
+            added = [u for u in users if u.pk not in existing]
+            BoardMember.objects.bulk_create(
+                [BoardMember(board_id=board.pk, user_id=u.pk) for u in added],
+                ignore_conflicts=True,
+            )
+            if added:
+                touch_board(board.pk)
+
+        return Response(
+            {
+                "added": UserLiteSerializer(added, many=True).data,
+                "already_members": [u.pk for u in users if u.pk in existing],
+                "unknown": [
+                    email for key, email in requested.items() if key not in found
+                ],
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+def _labels_changed(board_id):
+    """Label edits change the board payload: bump its version and activity."""
+    touch_board(board_id)
+
+
+class BoardLabelListCreateView(ListCreateAPIView):
+    """
+    GET  /api/boards/{board_id}/labels/  labels of the board, by name.
+    POST /api/boards/{board_id}/labels/  create a label {"name", "color"}.
+
+    Open to board owners and members. Tasks are labelled through
+    `label_ids` on task create/PATCH.
+    """
+
+    serializer_class = LabelSerializer
+    permission_classes = [IsAuthenticated, IsBoardOwnerOrMember]
+
+    def get_board(self):
+        board = get_object_or_404(
+            Board.objects.only("id", "owner_id"), pk=self.kwargs["board_id"]
+        )
+        self.check_object_permissions(self.request, board)
+        return board
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["board"] = self.get_board()
+        return context
+
+    def get_queryset(self):
+        return Label.objects.filter(board_id=self.kwargs["board_id"]).order_by("name")
+
+    def list(self, request, *args, **kwargs):
+        self.get_board()
+        return super().list(request, *args, **kwargs)
+
+    def perform_create(self, serializer):
+        board = serializer.context["board"]
+        with transaction.atomic():
+            serializer.save(board=board)
+            _labels_changed(board.pk)
+
+
+class BoardLabelDetailView(RetrieveUpdateDestroyAPIView):
+    """
+    GET/PATCH/DELETE /api/boards/{board_id}/labels/{label_id}/.
+
+    Deleting a label removes it from all tasks of the board.
+    """
+
+    serializer_class = LabelSerializer
+    permission_classes = [IsAuthenticated, IsBoardOwnerOrMember]
+    http_method_names = ["get", "patch", "delete", "head", "options"]
+
+    def get_object(self):
+        label = get_object_or_404(
+            Label.objects.select_related("board").only(
+                "id", "name", "color", "usage_count", "board__id", "board__owner_id"
+            ),
+            pk=self.kwargs["label_id"],
+            board_id=self.kwargs["board_id"],
+            board__deleted_at__isnull=True,
+        )
+        self.check_object_permissions(self.request, label)
+        return label
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["board"] = self.kwargs["board_id"]
+        return context
+
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            serializer.save()
+            _labels_changed(serializer.instance.board_id)
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            instance.delete()
+            _labels_changed(instance.board_id)
+
+
+class BoardDependenciesView(APIView):
+    """
+    GET /api/boards/{board_id}/dependencies/
+
+    The critical path (longest chain of unfinished tasks, each blocking
+    the next; ids in order) and the unfinished tasks still waiting on an
+    unfinished blocker. The graph is served from a per-process index that
+    is only rebuilt when the board's dependency_version changes.
+    """
+
+    permission_classes = [IsAuthenticated, IsBoardOwnerOrMember]
+
+    def get(self, request, board_id):
+        board = get_object_or_404(Board.objects.only("id", "owner_id"), pk=board_id)
+        self.check_object_permissions(request, board)
+        return Response(analyze(board.pk))
+
+
+class BoardCloneView(APIView):
+    """
+    POST /api/boards/{board_id}/clone/
+
+    Copy a board (typically a template) into a new board owned by the
+    requesting user: labels, tasks with subtasks, labels and dependencies,
+    plus members (default) and comments (opt-in). The copy is written with
+    one INSERT ... SELECT per table, see cloning.py.
+    """
+
+    permission_classes = [IsAuthenticated, IsBoardOwnerOrMember]
+
+    def post(self, request, board_id):
+        source = get_object_or_404(
+            Board.objects.only("id", "title", "owner_id"), pk=board_id
+        )
+        self.check_object_permissions(request, source)
+        serializer = BoardCloneSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        board = clone_board(
+            source,
+            request.user,
+            title=data.get("title", source.title),
+            include_members=data["include_members"],
+            include_comments=data["include_comments"],
+            as_template=data["as_template"],
+        )
+        out = BoardListSerializer(_board_with_counters(board.pk))
+        return Response(out.data, status=status.HTTP_201_CREATED)
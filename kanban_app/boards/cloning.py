@@ -0,0 +1,148 @@
+"""
+Board cloning.
+
+`clone_board` copies a board (typically a template, see
+`Board.is_template`) with its labels, tasks, subtask links, task labels,
+dependencies and optionally members and comments. Every table is copied
+with a single `INSERT ... SELECT`, so no row passes through Python and
+the number of statements does not depend on the board's size. Copies
+record their source in `Task.cloned_from`; the (cloned_from, board)
+index maps old task ids to new ones for parent links, labels,
+dependencies and comments. Labels are matched by name on the new board.
+"""
+from django.db import connection, transaction
+from django.utils import timezone
+
+from ..comments.models import Comment
+from ..tasks.models import Label, Task, TaskDependency, TaskLabel
+from ..tasks.reminders import refresh_task_digests
+from .models import Board, BoardMember
+
+_q = connection.ops.quote_name
+
+
+def _columns(model):
+    """Quoted column names of `model`'s fields, by field name."""
+    return {field.name: _q(field.column) for field in model._meta.concrete_fields}
+
+
+# Every identifier is quoted: some columns (e.g. rank) are reserved words
+# on other backends.
+_TASK, _T = _q(Task._meta.db_table), _columns(Task)
+_LABEL, _L = _q(Label._meta.db_table), _columns(Label)
+_TASK_LABEL, _TL = _q(TaskLabel._meta.db_table), _columns(TaskLabel)
+_DEPENDENCY, _D = _q(TaskDependency._meta.db_table), _columns(TaskDependency)
+_COMMENT, _C = _q(Comment._meta.db_table), _columns(Comment)
+_MEMBER, _M = _q(BoardMember._meta.db_table), _columns(BoardMember)
+
+_LABELS_SQL = (
+    f"INSERT INTO {_LABEL} ({_L['board']}, {_L['name']}, {_L['color']}, "
+    f"{_L['usage_count']}, {_L['created_at']}) "
+    f"SELECT %(board)s, {_L['name']}, {_L['color']}, {_L['usage_count']}, %(now)s "
+    f"FROM {_LABEL} WHERE {_L['board']} = %(source)s"
+)
+
+# Assignees and reviewers must be members (or the owner) of the new board.
+_ALLOWED = (
+    f"{{column}} = %(owner)s OR {{column}} IN "
+    f"(SELECT {_M['user']} FROM {_MEMBER} WHERE {_M['board']} = %(board)s)"
+)
+# The rollups are copied as they are: same tree, same statuses. parent_id
+# still points into the source board until _PARENTS_SQL remaps it.
+_COPIED = ("title", "description", "status", "priority", "rank")
+_TASKS_SQL = (
+    f"INSERT INTO {_TASK} ({_T['board']}, {_T['cloned_from']}, {_T['parent']}, "
+    f"{', '.join(_T[name] for name in _COPIED)}, {_T['assignee']}, {_T['reviewer']}, "
+    f"{_T['due_date']}, {_T['created_at']}, {_T['created_by']}, {_T['version']}, "
+    f"{_T['comments_count']}, {_T['last_comment_at']}, {_T['subtasks_total']}, "
+    f"{_T['subtasks_done']}) "
+    f"SELECT %(board)s, {_T['id']}, {_T['parent']}, "
+    f"{', '.join(_T[name] for name in _COPIED)}, "
+    f"CASE WHEN {_ALLOWED.format(column=_T['assignee'])} THEN {_T['assignee']} END, "
+    f"CASE WHEN {_ALLOWED.format(column=_T['reviewer'])} THEN {_T['reviewer']} END, "
+    f"{_T['due_date']}, %(now)s, %(owner)s, 1, "
+    f"CASE WHEN %(comments)s THEN {_T['comments_count']} ELSE 0 END, "
+    f"CASE WHEN %(comments)s AND {_T['comments_count']} > 0 THEN %(now)s END, "
+    f"{_T['subtasks_total']}, {_T['subtasks_done']} "
+    f"FROM {_TASK} WHERE {_T['board']} = %(source)s"
+)
+_PARENTS_SQL = (
+    f"UPDATE {_TASK} SET {_T['parent']} = ("
+    f"SELECT p.{_T['id']} FROM {_TASK} p WHERE p.{_T['cloned_from']} = {_TASK}.{_T['parent']} "
+    f"AND p.{_T['board']} = %(board)s"
+    f") WHERE {_T['board']} = %(board)s AND {_T['parent']} IS NOT NULL"
+)
+_TASK_LABELS_SQL = (
+    f"INSERT INTO {_TASK_LABEL} ({_TL['task']}, {_TL['label']}) "
+    f"SELECT t.{_T['id']}, nl.{_L['id']} FROM {_TASK} t "
+    f"JOIN {_TASK_LABEL} tl ON tl.{_TL['task']} = t.{_T['cloned_from']} "
+    f"JOIN {_LABEL} ol ON ol.{_L['id']} = tl.{_TL['label']} "
+    f"JOIN {_LABEL} nl ON nl.{_L['board']} = %(board)s AND nl.{_L['name']} = ol.{_L['name']} "
+    f"WHERE t.{_T['board']} = %(board)s"
+)
+# The blocked side is a scalar subquery: as a second join, planners tend to
+# pair every new task with every other one before probing the edge index.
+_DEPENDENCIES_SQL = (
+    f"INSERT INTO {_DEPENDENCY} ({_D['board']}, {_D['blocker']}, {_D['blocked']}, "
+    f"{_D['created_at']}) "
+    f"SELECT %(board)s, a.{_T['id']}, ("
+    f"SELECT b.{_T['id']} FROM {_TASK} b WHERE b.{_T['cloned_from']} = d.{_D['blocked']} "
+    f"AND b.{_T['board']} = %(board)s"
+    f"), %(now)s FROM {_DEPENDENCY} d "
+    f"JOIN {_TASK} a ON a.{_T['cloned_from']} = d.{_D['blocker']} "
+    f"AND a.{_T['board']} = %(board)s "
+    f"WHERE d.{_D['board']} = %(source)s"
+)
+_COMMENTS_SQL = (
+    f"INSERT INTO {_COMMENT} ({_C['task']}, {_C['author']}, {_C['content']}, "
+    f"{_C['created_at']}) "
+    f"SELECT t.{_T['id']}, c.{_C['author']}, c.{_C['content']}, %(now)s FROM {_TASK} t "
+    f"JOIN {_COMMENT} c ON c.{_C['task']} = t.{_T['cloned_from']} "
+    f"WHERE t.{_T['board']} = %(board)s"
+)
+
+def clone_board(
+    source: Board,
+    owner,
+    title: str,
+    include_members: bool = True,
+    include_comments: bool = False,
+    as_template: bool = False,
+) -> Board:
+    """
+    Copy `source` into a new board owned by `owner`. Without members,
+    assignees and reviewers are cleared (they must be board members).
+    Copied comments are new comments, timestamped now. The due-soon
+    digests of the copied tasks are built right away.
+    """
+    with transaction.atomic():
+        board = Board.objects.create(title=title, owner=owner, is_template=as_template)
+
+        if include_members:
+            members = set(
+                BoardMember.objects.filter(board_id=source.pk).values_list(
+                    "user_id", flat=True
+                )
+            )
+            members.add(source.owner_id)
+            members.discard(owner.pk)
+            BoardMember.objects.bulk_create(
+                [BoardMember(board_id=board.pk, user_id=user_id) for user_id in members]
+            )
+
+        params = {
+            "board": board.pk,
+            "source": source.pk,
+            "owner": owner.pk,
+            "now": connection.ops.adapt_datetimefield_value(timezone.now()),
+            "comments": include_comments,
+        }
+        steps = [_LABELS_SQL, _TASKS_SQL, _PARENTS_SQL, _TASK_LABELS_SQL, _DEPENDENCIES_SQL]
+        if include_comments:
+            steps.append(_COMMENTS_SQL)
+        with connection.cursor() as cursor:
+            for sql in steps:
+                cursor.execute(sql, params)
+
+        refresh_task_digests(Task.all_objects.filter(board_id=board.pk).values("id"))
+    return board
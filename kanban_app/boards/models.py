@@ -1,11 +1,24 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.utils import timezone
+
+
+class LiveBoardManager(models.Manager):
+    """
+    Default board manager: hides soft-deleted boards from every queryset,
+    including related managers such as `user.owned_boards`.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
 
 
 class Board(models.Model):
     """
     Represents a project board which contains tasks and members.
     Each board has an owner (creator) and can include multiple members.
+    Deleting a board only sets `deleted_at`; its children are removed later
+    in batches by a background job (see kanban_app/jobs.py).
     """
 
     title = models.CharField(max_length=200)
@@ -26,6 +39,44 @@ class Board(models.Model):
         auto_now_add=True,
         help_text="Timestamp when the board was created."
     )
+    version = models.PositiveIntegerField(
+        default=1,
+        help_text="Incremented on every update; used for If-Match checks.",
+    )
+    deleted_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        db_index=True,
+        help_text="Set when the board was deleted; pending purge.",
+    )
+    archived = models.BooleanField(
+        default=False,
+        help_text="Archived boards are left out of the board list unless requested.",
+    )
+    last_activity_at = models.DateTimeField(
+        default=timezone.now,
+        help_text="Last write to the board, its tasks or comments (see activity.py).",
+    )
+    is_template = models.BooleanField(
+        default=False,
+        help_text="Template boards are cloned into new boards (see cloning.py).",
+    )
+    dependency_version = models.PositiveIntegerField(
+        default=0,
+        help_text="Incremented on every change to the task dependency graph.",
+    )
+
+    objects = LiveBoardManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        indexes = [
+            # Board list: most recently active first, archived filtered out.
+            models.Index(
+                fields=["archived", "-last_activity_at", "-id"],
+                name="board_activity_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.title
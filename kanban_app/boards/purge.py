@@ -0,0 +1,101 @@
+"""
+Batched removal of soft-deleted boards.
+
+Board deletion only marks the row (see `Board.deleted_at`). The children
+are removed here with raw `DELETE ... WHERE id IN (SELECT ... LIMIT n)`
+statements, leaves first, so no ORM collector loads rows into memory and
+every statement holds its locks for a single bounded batch only.
+"""
+from django.db import connection, transaction
+
+from ..comments.models import Comment
+from ..tasks.models import DueTaskDigest, Label, Task, TaskDependency, TaskLabel
+from .models import Board, BoardMember
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def _purge_steps():
+    """
+    Return (table, subquery) pairs in deletion order. Each subquery selects
+    ids of rows belonging to board %s and is limited to one batch.
+    """
+    task = Task._meta.db_table
+    return [
+        (
+            DueTaskDigest._meta.db_table,
+            f"SELECT id FROM {DueTaskDigest._meta.db_table} WHERE task_id IN "
+            f"(SELECT id FROM {task} WHERE board_id = %s)",
+        ),
+        (
+            Comment._meta.db_table,
+            f"SELECT id FROM {Comment._meta.db_table} WHERE task_id IN "
+            f"(SELECT id FROM {task} WHERE board_id = %s)",
+        ),
+        (
+            TaskLabel._meta.db_table,
+            f"SELECT id FROM {TaskLabel._meta.db_table} WHERE task_id IN "
+            f"(SELECT id FROM {task} WHERE board_id = %s)",
+        ),
+        (
+            TaskDependency._meta.db_table,
+            f"SELECT id FROM {TaskDependency._meta.db_table} WHERE board_id = %s",
+        ),
+        (task, f"SELECT id FROM {task} WHERE board_id = %s"),
+        (
+            Label._meta.db_table,
+            f"SELECT id FROM {Label._meta.db_table} WHERE board_id = %s",
+        ),
+        (
+            BoardMember._meta.db_table,
+            f"SELECT id FROM {BoardMember._meta.db_table} WHERE board_id = %s",
+        ),
+    ]
+
+
+def _delete_batch(table: str, subquery: str, board_id: int, batch_size: int) -> int:
+    """Delete at most `batch_size` rows of `table`; return how many went."""
+    sql = f"DELETE FROM {table} WHERE id IN ({subquery} LIMIT %s)"
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(sql, [board_id, batch_size])
+        return cursor.rowcount
+
+
+def _detach_batch(board_id: int, batch_size: int) -> int:
+    """Unlink at most `batch_size` subtasks from their parents."""
+    task = Task._meta.db_table
+    sql = (
+        f"UPDATE {task} SET parent_id = NULL WHERE id IN "
+        f"(SELECT id FROM {task} WHERE board_id = %s AND parent_id IS NOT NULL LIMIT %s)"
+    )
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(sql, [board_id, batch_size])
+        return cursor.rowcount
+
+
+def purge_board(board_id: int, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """
+    Remove a soft-deleted board and all its children in bounded batches.
+    Returns the total number of deleted rows. Live boards are left alone.
+    """
+    if not Board.all_objects.filter(pk=board_id, deleted_at__isnull=False).exists():
+        return 0
+
+    # Subtasks point at their parent; unlinked, tasks can go in any order.
+    while _detach_batch(board_id, batch_size) == batch_size:
+        pass
+
+    total = 0
+    for table, subquery in _purge_steps():
+        while True:
+            deleted = _delete_batch(table, subquery, board_id, batch_size)
+            total += deleted
+            if deleted < batch_size:
+                break
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {Board._meta.db_table} WHERE id = %s AND deleted_at IS NOT NULL",
+            [board_id],
+        )
+        total += cursor.rowcount
+    return total
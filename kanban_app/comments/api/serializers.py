@@ -1,13 +1,22 @@
 from rest_framework import serializers
 
 from kanban_app.comments.models import Comment
+from kanban_app.sparse import SparseFieldsetMixin
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer for reading comment data.
     Includes the author's full name as a read-only field.
     """
+
+    # Model fields read per payload field (see kanban_app.sparse.trim_queryset)
+    sparse_columns = {
+        "created_at": ["created_at"],
+        "author": ["author"],
+        "content": ["content"],
+    }
+
     author = serializers.SerializerMethodField()
 
     class Meta:
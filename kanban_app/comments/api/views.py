@@ -1,12 +1,16 @@
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 from rest_framework import generics, permissions
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.permissions import IsAuthenticated
 
-from ...tasks.models import Task
+from ...boards.activity import touch_board
+from ..counters import record_comment_added, record_comment_removed
 from ..models import Comment
 from .serializers import CommentCreateSerializer, CommentSerializer
 from ...permissions import CanAccessTaskBoardFromURL, IsCommentAuthor
+from ...resolvers import resolve_url_task
+from ...sparse import sparse_context, trim_queryset, wants
 
 
 class CommentListCreateView(generics.ListCreateAPIView):
@@ -17,8 +21,23 @@ class CommentListCreateView(generics.ListCreateAPIView):
     permission_classes = [IsAuthenticated, CanAccessTaskBoardFromURL]
 
     def get_queryset(self):
-        task = get_object_or_404(Task, id=self.kwargs["task_id"])
-        return Comment.objects.filter(task=task).order_by("created_at")
+        task = resolve_url_task(self.request, self)
+        fieldset = sparse_context(self.request)["fieldset"]
+        qs = trim_queryset(
+            Comment.objects.filter(task_id=task.pk),
+            fieldset,
+            (),
+            columns=CommentSerializer.sparse_columns,
+        )
+        if wants(fieldset, "author"):
+            # The author's name is always rendered, so join it up front.
+            qs = qs.select_related("author")
+        return qs.order_by("created_at")
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context.update(sparse_context(self.request))
+        return context
 
     def get_serializer_class(self):
         return (
@@ -28,8 +47,11 @@ class CommentListCreateView(generics.ListCreateAPIView):
         )
 
     def perform_create(self, serializer):
-        task = get_object_or_404(Task, pk=self.kwargs["task_id"])
-        serializer.save(task=task, author=self.request.user)
+        task = resolve_url_task(self.request, self)
+        with transaction.atomic():
+            comment = serializer.save(task=task, author=self.request.user)
+            record_comment_added(comment)
+            touch_board(task.board_id)
 
 
 class CommentDeleteView(generics.DestroyAPIView):
@@ -44,10 +66,17 @@ class CommentDeleteView(generics.DestroyAPIView):
     permission_classes = [IsAuthenticated, CanAccessTaskBoardFromURL, IsCommentAuthor]
 
     def get_object(self):
-        task = get_object_or_404(Task, pk=self.kwargs["task_id"])
+        task = resolve_url_task(self.request, self)
         obj = get_object_or_404(
-            Comment, pk=self.kwargs["comment_id"], task=task
+            Comment, pk=self.kwargs["comment_id"], task_id=task.pk
         )
+        obj.task = task
         # Apply object-level permissions (e.g., IsCommentAuthor)
         self.check_object_permissions(self.request, obj)
         return obj
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            instance.delete()
+            record_comment_removed(instance.task_id)
+            touch_board(instance.task.board_id)
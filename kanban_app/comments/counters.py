@@ -0,0 +1,88 @@
+"""
+Denormalized comment counters on Task.
+
+`Task.comments_count` and `Task.last_comment_at` are updated with F()
+expressions in the same transaction as the comment insert/delete, so
+task payloads read two columns instead of grouping over the comments
+table. `reconcile_comment_counters` recomputes them in id batches and
+repairs any drift (e.g. rows changed outside the API); each batch is one
+correlated UPDATE, so it never writes back values read earlier.
+"""
+from datetime import datetime, timezone
+
+from django.db.models import Count, DateTimeField, F, Max, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from ..boards.activity import touch_boards
+from ..tasks.models import Task
+from .models import Comment
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def record_comment_added(comment: Comment) -> None:
+    """Count a newly created comment on its task."""
+    # Greatest: a comment committing late must not move the time backwards.
+    Task.all_objects.filter(pk=comment.task_id).update(
+        comments_count=F("comments_count") + 1,
+        last_comment_at=Greatest(
+            Coalesce("last_comment_at", Value(comment.created_at)),
+            Value(comment.created_at),
+        ),
+    )
+
+
+def record_comment_removed(task_id: int) -> None:
+    """Uncount a deleted comment; last_comment_at falls back to the newest left."""
+    newest = (
+        Comment.objects.filter(task_id=OuterRef("pk"))
+        .order_by("-created_at")
+        .values("created_at")[:1]
+    )
+    Task.all_objects.filter(pk=task_id, comments_count__gt=0).update(
+        comments_count=F("comments_count") - 1,
+        last_comment_at=Subquery(newest),
+    )
+
+
+# Stands in for "no comments" so NULL timestamps compare as equal.
+_NEVER = Value(datetime(1970, 1, 1, tzinfo=timezone.utc), output_field=DateTimeField())
+
+
+def _comments_of_task(aggregate):
+    return Subquery(
+        Comment.objects.filter(task_id=OuterRef("pk"))
+        .order_by()
+        .values("task_id")
+        .annotate(value=aggregate)
+        .values("value")
+    )
+
+
+def reconcile_comment_counters(batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """Recompute the counters of all tasks; return how many were wrong."""
+    actual_count = Coalesce(_comments_of_task(Count("pk")), 0)
+    actual_last = _comments_of_task(Max("created_at"))
+    fixed = 0
+    last_id = 0
+    while True:
+        ids = list(
+            Task.all_objects.filter(pk__gt=last_id)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:batch_size]
+        )
+        if not ids:
+            return fixed
+        batch_fixed = (
+            Task.all_objects.filter(pk__in=ids)
+            .alias(
+                stored_last=Coalesce("last_comment_at", _NEVER),
+                expected_last=Coalesce(actual_last, _NEVER),
+            )
+            .filter(~Q(comments_count=actual_count) | ~Q(stored_last=F("expected_last")))
+            .update(comments_count=actual_count, last_comment_at=actual_last)
+        )
+        if batch_fixed:
+            touch_boards(Task.all_objects.filter(pk__in=ids).values("board_id"))
+        fixed += batch_fixed
+        last_id = ids[-1]
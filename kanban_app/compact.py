@@ -0,0 +1,36 @@
+"""
+Opt-in compact payloads (?compact=true).
+
+Task payloads repeat the same user objects for every assignee/reviewer.
+In compact mode each user is sent once in a top-level "users" table keyed
+by id, and tasks (and board members) refer to users by id only.
+"""
+from typing import Any, Dict, Iterable, List
+
+USER_KEYS = ("assignee", "reviewer")
+
+
+def wants_compact(request) -> bool:
+    """True if the client asked for the compact representation."""
+    return request.query_params.get("compact", "").lower() in ("1", "true", "yes")
+
+
+def _intern(user: Any, users: Dict[str, dict]):
+    """Move a nested user dict into the side table and return its id."""
+    if not isinstance(user, dict):
+        return user
+    users[str(user["id"])] = user
+    return user["id"]
+
+
+def compact_tasks(tasks: Iterable[dict], users: Dict[str, dict]) -> None:
+    """Replace nested user objects in `tasks` by ids, filling `users`."""
+    for task in tasks:
+        for key in USER_KEYS:
+            if key in task:
+                task[key] = _intern(task[key], users)
+
+
+def compact_members(members: List[Any], users: Dict[str, dict]) -> List[Any]:
+    """Return member ids for a list of user objects, filling `users`."""
+    return [_intern(member, users) for member in members]
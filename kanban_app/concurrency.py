@@ -0,0 +1,56 @@
+"""Optimistic concurrency helpers shared by board and task updates.
+
+Boards and tasks carry a `version` counter. Clients send the version they
+last saw in an `If-Match` header; the write is a single conditional UPDATE
+that only matches the expected version and increments it atomically, so
+no row locks or preceding reads are needed.
+"""
+from typing import Optional
+
+from django.db.models import F
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.request import Request
+
+
+class PreconditionFailed(APIException):
+    """Raised when the If-Match version no longer matches the stored row."""
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = "The resource was modified by someone else. Reload and retry."
+    default_code = "precondition_failed"
+
+
+def etag_for(version: int) -> str:
+    """Format a version number as a strong ETag value."""
+    return f'"{version}"'
+
+
+def expected_version(request: Request) -> Optional[int]:
+    """
+    Parse the If-Match header into a version number.
+    Returns None when the header is absent or "*" (unconditional write).
+    """
+    raw = (request.headers.get("If-Match") or "").strip()
+    if not raw or raw == "*":
+        return None
+    if raw.startswith("W/"):
+        raw = raw[2:]
+    try:
+        return int(raw.strip('"'))
+    except ValueError:
+        raise ValidationError({"If-Match": "Expected a version number."})
+
+
+def versioned_update(queryset, pk, version: Optional[int], **fields) -> int:
+    """
+    Apply `fields` to the row `pk` and bump its version in one UPDATE.
+    When `version` is given, only a row still at that version is written.
+    Raises PreconditionFailed if nothing matched; returns the rows updated.
+    """
+    rows = queryset.filter(pk=pk)
+    if version is not None:
+        rows = rows.filter(version=version)
+    updated = rows.update(version=F("version") + 1, **fields)
+    if not updated:
+        raise PreconditionFailed()
+    return updated
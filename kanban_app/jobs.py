@@ -0,0 +1,53 @@
+"""Background job handlers for the kanban app (see core/jobs.py)."""
+from datetime import timedelta
+from typing import Optional
+
+from core.jobs import enqueue, job
+
+from .boards.purge import purge_board
+from .comments.counters import reconcile_comment_counters
+from .tasks.hierarchy import reconcile_subtask_rollups
+from .tasks.reminders import scan_due_tasks
+
+
+@job("kanban_app.purge_board")
+def purge_board_job(board_id: int):
+    """Remove a soft-deleted board with all its children in batches."""
+    purge_board(board_id)
+
+
+@job("kanban_app.scan_due_tasks")
+def scan_due_tasks_job(window_days: int = 3, every_minutes: Optional[int] = None):
+    """
+    Rebuild the per-user due/overdue digests. With `every_minutes`, queue
+    the next scan however this one ends (see `scan_due_tasks --every`);
+    such scans run once (max_attempts=1), so a failure is not retried
+    next to the scan that replaces it.
+    """
+    try:
+        scan_due_tasks(window_days=window_days)
+    finally:
+        if every_minutes:
+            enqueue_due_scan(window_days, every_minutes, delay=timedelta(minutes=every_minutes))
+
+
+def enqueue_due_scan(window_days: int, every_minutes: int, delay: timedelta = timedelta()):
+    """Queue one run of a repeating due scan."""
+    enqueue(
+        "kanban_app.scan_due_tasks",
+        {"window_days": window_days, "every_minutes": every_minutes},
+        delay=delay,
+        max_attempts=1,
+    )
+
+
+@job("kanban_app.reconcile_comment_counts")
+def reconcile_comment_counts_job():
+    """Repair drifted Task.comments_count / last_comment_at values."""
+    reconcile_comment_counters()
+
+
+@job("kanban_app.reconcile_subtask_rollups")
+def reconcile_subtask_rollups_job(board_id: Optional[int] = None):
+    """Repair drifted Task.subtasks_total / subtasks_done values."""
+    reconcile_subtask_rollups(board_id=board_id)
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from kanban_app.boards.models import Board
+from kanban_app.boards.purge import DEFAULT_BATCH_SIZE, purge_board
+
+
+class Command(BaseCommand):
+    """
+    Physically remove soft-deleted boards with their tasks, comments and
+    memberships. Safe to interrupt and re-run; intended for cron.
+    """
+
+    help = "Purge soft-deleted boards and their children in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="Maximum rows removed per DELETE statement.",
+        )
+
+    def handle(self, *args, **options):
+        board_ids = list(
+            Board.all_objects.filter(deleted_at__isnull=False)
+            .order_by("deleted_at")
+            .values_list("id", flat=True)
+        )
+        total = 0
+        for board_id in board_ids:
+            total += purge_board(board_id, batch_size=options["batch_size"])
+        self.stdout.write(f"Purged {len(board_ids)} board(s), {total} row(s).")
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+from django.db.models.functions import Length
+
+from kanban_app.boards.activity import lock_board, touch_board
+from kanban_app.tasks.models import Task
+from kanban_app.tasks.ranking import REBALANCE_LENGTH, rebalance_column
+
+
+class Command(BaseCommand):
+    """
+    Rewrite task ranks in columns whose keys have grown too long.
+    Intended to run periodically (e.g. from cron); moves never need it.
+    """
+
+    help = "Rebalance task rank keys in columns with overly long keys."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--threshold",
+            type=int,
+            default=REBALANCE_LENGTH,
+            help="Rebalance columns containing a key longer than this.",
+        )
+
+    def handle(self, *args, **options):
+        columns = (
+            Task.objects.values("board_id", "status")
+            .annotate(longest=Max(Length("rank")))
+            .filter(longest__gt=options["threshold"])
+            .values_list("board_id", "status")
+        )
+        total = 0
+        for board_id, status in columns:
+            with transaction.atomic():
+                column = Task.all_objects.select_for_update().filter(
+                    board_id=board_id, status=status
+                )
+                # Task rows, then the board (see boards.activity); the board
+                # lock holds off moves into the column until it is rewritten.
+                list(column.values_list("pk"))
+                lock_board(board_id)
+                total += rebalance_column(column)
+                touch_board(board_id)
+        self.stdout.write(f"Rebalanced {total} task(s) in {len(columns)} column(s).")
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from kanban_app.comments.counters import DEFAULT_BATCH_SIZE, reconcile_comment_counters
+
+
+class Command(BaseCommand):
+    """
+    Recompute Task.comments_count / last_comment_at from the comments
+    table and fix rows that drifted. Safe to run at any time.
+    """
+
+    help = "Repair denormalized comment counters on tasks."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="Tasks checked per query.",
+        )
+
+    def handle(self, *args, **options):
+        fixed = reconcile_comment_counters(batch_size=options["batch_size"])
+        self.stdout.write(f"Fixed {fixed} task(s).")
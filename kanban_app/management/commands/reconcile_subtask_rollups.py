@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from kanban_app.tasks.hierarchy import DEFAULT_BATCH_SIZE, reconcile_subtask_rollups
+
+
+class Command(BaseCommand):
+    """
+    Recompute Task.subtasks_total / subtasks_done from the parent links
+    and fix rows that drifted. Safe to run at any time.
+    """
+
+    help = "Repair the stored subtask progress of parent tasks."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--board",
+            type=int,
+            default=None,
+            help="Only reconcile the tasks of this board.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="Tasks written per query.",
+        )
+
+    def handle(self, *args, **options):
+        fixed = reconcile_subtask_rollups(
+            board_id=options["board"], batch_size=options["batch_size"]
+        )
+        self.stdout.write(f"Fixed {fixed} task(s).")
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from kanban_app.tasks.labels import recount_label_usage
+
+
+class Command(BaseCommand):
+    """
+    Recompute Label.usage_count from the task/label attachments.
+    Safe to run at any time.
+    """
+
+    help = "Recount how many tasks carry each label."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--board",
+            type=int,
+            default=None,
+            help="Only recount the labels of this board.",
+        )
+
+    def handle(self, *args, **options):
+        updated = recount_label_usage(board_id=options["board"])
+        self.stdout.write(f"Recounted {updated} label(s).")
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+
+from core.models import Job
+from kanban_app.jobs import enqueue_due_scan
+from kanban_app.tasks.reminders import DEFAULT_BATCH_SIZE, DUE_SOON_DAYS, scan_due_tasks
+
+
+class Command(BaseCommand):
+    """
+    Rebuild the per-user due/overdue digests served by /api/tasks/due-soon/.
+    Intended to run on a schedule: either from cron, or once with
+    `--every MINUTES` to queue a scan job that reschedules itself on the
+    `run_jobs` worker.
+    """
+
+    help = "Scan for overdue and soon-due tasks and rebuild user digests."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=DUE_SOON_DAYS,
+            help="Include tasks due within this many days.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="Tasks read per keyset page.",
+        )
+        parser.add_argument(
+            "--every",
+            type=int,
+            metavar="MINUTES",
+            help="Instead of scanning now, queue a scan job repeating every MINUTES.",
+        )
+
+    def handle(self, *args, **options):
+        if options["every"]:
+            name = "kanban_app.scan_due_tasks"
+            if Job.objects.filter(name=name, status__in=[Job.QUEUED, Job.RUNNING]).exists():
+                self.stdout.write("A due scan job is already queued.")
+                return
+            enqueue_due_scan(options["days"], options["every"])
+            self.stdout.write(f"Queued a due scan repeating every {options['every']} minute(s).")
+            return
+        written = scan_due_tasks(
+            window_days=options["days"], batch_size=options["batch_size"]
+        )
+        self.stdout.write(f"Wrote {written} due digest(s).")
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.5 on 2026-10-19 10:25
+
+from django.conf import settings
+from django.db import migrations, models
+
+# Frozen copy of kanban_app.tasks.ranking.evenly_spaced_ranks: migrations
+# must not change when application code does.
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+
+
+def evenly_spaced_ranks(count):
+    """Return `count` ascending keys of minimal length, spread evenly."""
+    length = 1
+    while BASE ** length <= count:
+        length += 1
+    step = BASE ** length // (count + 1)
+
+    ranks = []
+    for i in range(1, count + 1):
+        value = step * i
+        digits = []
+        for _ in range(length):
+            value, rem = divmod(value, BASE)
+            digits.append(DIGITS[rem])
+        ranks.append("".join(reversed(digits)).rstrip("0"))
+    return ranks
+
+
+def backfill_ranks(apps, schema_editor):
+    """Give existing tasks distinct ranks per column, keeping creation order."""
+    Task = apps.get_model("kanban_app", "Task")
+    columns = Task.objects.values_list("board_id", "status").distinct()
+    for board_id, status in columns:
+        tasks = list(
+            Task.objects.filter(board_id=board_id, status=status)
+            .order_by("id")
+            .only("id")
+        )
+        for task, rank in zip(tasks, evenly_spaced_ranks(len(tasks))):
+            task.rank = rank
+        Task.objects.bulk_update(tasks, ["rank"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0006_alter_comment_author_alter_comment_content_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='rank',
+            field=models.CharField(default='i', max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['board', 'status', 'rank'], name='task_board_status_rank_idx'),
+        ),
+        migrations.RunPython(backfill_ranks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-19 10:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0008_board_version_task_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, db_index=True, help_text='Set when the board was deleted; pending purge.', null=True),
+        ),
+    ]
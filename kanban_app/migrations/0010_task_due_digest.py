@@ -0,0 +1,46 @@
+# Generated by Django 5.2.5 on 2026-10-19 10:29
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0009_board_deleted_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DueTaskDigest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('due_date', models.DateField()),
+                ('scanned_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['due_date', 'status'], name='task_due_date_status_idx'),
+        ),
+        migrations.AddField(
+            model_name='duetaskdigest',
+            name='task',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='due_digests', to='kanban_app.task'),
+        ),
+        migrations.AddField(
+            model_name='duetaskdigest',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='due_digests', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='duetaskdigest',
+            index=models.Index(fields=['user', 'due_date'], name='due_digest_user_due_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='duetaskdigest',
+            constraint=models.UniqueConstraint(fields=('user', 'task'), name='due_digest_user_task_uniq'),
+        ),
+    ]
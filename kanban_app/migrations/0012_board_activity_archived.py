@@ -0,0 +1,59 @@
+# Generated by Django 5.2.5 on 2026-10-19 10:42
+
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+
+def backfill_last_activity(apps, schema_editor):
+    """Seed last_activity_at from the newest task or comment of each board."""
+    Board = apps.get_model("kanban_app", "Board")
+    Task = apps.get_model("kanban_app", "Task")
+    Comment = apps.get_model("kanban_app", "Comment")
+    newest_task = (
+        Task.objects.filter(board_id=OuterRef("pk"))
+        .values("board_id")
+        .annotate(newest=Max("created_at"))
+        .values("newest")
+    )
+    newest_comment = (
+        Comment.objects.filter(task__board_id=OuterRef("pk"))
+        .values("task__board_id")
+        .annotate(newest=Max("created_at"))
+        .values("newest")
+    )
+    Board.objects.update(
+        last_activity_at=Greatest(
+            "created_at",
+            Coalesce(Subquery(newest_task), "created_at"),
+            Coalesce(Subquery(newest_comment), "created_at"),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0011_task_filter_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='archived',
+            field=models.BooleanField(default=False, help_text='Archived boards are left out of the board list unless requested.'),
+        ),
+        migrations.AddField(
+            model_name='board',
+            name='last_activity_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, help_text='Last write to the board, its tasks or comments (see activity.py).'),
+        ),
+        migrations.RunPython(backfill_last_activity, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='board',
+            index=models.Index(fields=['archived', '-last_activity_at', '-id'], name='board_activity_idx'),
+        ),
+    ]
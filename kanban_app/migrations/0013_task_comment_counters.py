@@ -0,0 +1,39 @@
+# Generated by Django 5.2.5 on 2026-10-19 10:43
+
+from django.db import migrations, models
+from django.db.models import Count, Max, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_comment_counters(apps, schema_editor):
+    """Compute comments_count/last_comment_at for existing tasks."""
+    Task = apps.get_model("kanban_app", "Task")
+    Comment = apps.get_model("kanban_app", "Comment")
+    per_task = Comment.objects.filter(task_id=OuterRef("pk")).values("task_id")
+    Task.objects.update(
+        comments_count=Coalesce(
+            Subquery(per_task.annotate(n=Count("id")).values("n")), Value(0)
+        ),
+        last_comment_at=Subquery(per_task.annotate(last=Max("created_at")).values("last")),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0012_board_activity_archived'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='last_comment_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_comment_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.5 on 2026-10-19 10:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0013_task_comment_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Label',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50)),
+                ('color', models.CharField(default='#9e9e9e', max_length=7)),
+                ('usage_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='labels', to='kanban_app.board')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TaskLabel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('label', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_labels', to='kanban_app.label')),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_labels', to='kanban_app.task')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='labels',
+            field=models.ManyToManyField(blank=True, related_name='tasks', through='kanban_app.TaskLabel', to='kanban_app.label'),
+        ),
+        migrations.AddConstraint(
+            model_name='label',
+            constraint=models.UniqueConstraint(fields=('board', 'name'), name='label_board_name_uniq'),
+        ),
+        migrations.AddIndex(
+            model_name='tasklabel',
+            index=models.Index(fields=['label', 'task'], name='task_label_label_task_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='tasklabel',
+            constraint=models.UniqueConstraint(fields=('task', 'label'), name='task_label_task_label_uniq'),
+        ),
+    ]
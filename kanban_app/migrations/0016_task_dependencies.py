@@ -0,0 +1,32 @@
+# Generated by Django 5.2.5 on 2026-10-19 10:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0015_task_subtasks'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='dependency_version',
+            field=models.PositiveIntegerField(default=0, help_text='Incremented on every change to the task dependency graph.'),
+        ),
+        migrations.CreateModel(
+            name='TaskDependency',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('blocked', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='blocked_by_links', to='kanban_app.task')),
+                ('blocker', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='blocking_links', to='kanban_app.task')),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_dependencies', to='kanban_app.board')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('blocker', 'blocked'), name='task_dependency_uniq'), models.CheckConstraint(condition=models.Q(('blocker', models.F('blocked')), _negated=True), name='task_dependency_not_self')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-19 10:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0016_task_dependencies'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='is_template',
+            field=models.BooleanField(default=False, help_text='Template boards are cloned into new boards (see cloning.py).'),
+        ),
+    ]
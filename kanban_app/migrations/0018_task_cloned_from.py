@@ -0,0 +1,24 @@
+# Generated by Django 5.2.5 on 2026-10-19 11:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0017_board_is_template'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='cloned_from',
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('cloned_from__isnull', False)), fields=['cloned_from', 'board'], name='task_cloned_from_idx'),
+        ),
+    ]
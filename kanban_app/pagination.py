@@ -0,0 +1,35 @@
+"""Pagination classes shared by kanban list endpoints."""
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+
+
+class OptionalLimitOffsetPagination(LimitOffsetPagination):
+    """
+    Paginate only when ?limit= is given (then the response is wrapped in
+    count/next/previous/results); without it the plain list is returned,
+    so existing clients keep working.
+    """
+    max_limit = 200
+
+
+class OptionalCursorPagination(CursorPagination):
+    """
+    Cursor pagination that, like OptionalLimitOffsetPagination, only kicks
+    in when asked for: ?limit=N returns the first N rows plus a `next`
+    cursor link; following it (?cursor=...) keeps the page size. Cursors
+    seek on the ordering columns, so deep pages cost the same as the first.
+    Subclasses set `ordering` (ending in a unique column).
+    """
+    page_size_query_param = "limit"
+    max_page_size = 200
+    default_page_size = 20
+
+    def get_page_size(self, request):
+        size = super().get_page_size(request)
+        if size is None and self.cursor_query_param in request.query_params:
+            return self.default_page_size
+        return size
+
+
+class BoardActivityPagination(OptionalCursorPagination):
+    """Boards, most recently active first (served by board_activity_idx)."""
+    ordering = ("-last_activity_at", "-id")
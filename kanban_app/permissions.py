@@ -7,7 +7,7 @@ from rest_framework.permissions import BasePermission, SAFE_METHODS
 from rest_framework.request import Request
 
 from .boards.models import Board
-from .tasks.models import Task
+from .resolvers import has_board_access, is_board_member, resolve_url_task
 
 
 def _resolve_board(obj: Any) -> Optional[Board]:
@@ -44,7 +44,7 @@ class IsBoardMember(BasePermission):
         return bool(
             user.is_authenticated
             and board
-            and board.members.filter(pk=user.id).exists()
+            and is_board_member(request, board.pk)
         )
 
 
@@ -57,7 +57,7 @@ class IsBoardOwnerOrMember(BasePermission):
             return False
         return (
             board.owner_id == user.id
-            or board.members.filter(pk=user.id).exists()
+            or is_board_member(request, board.pk)
         )
 
 
@@ -79,7 +79,7 @@ class CanCreateTaskOnBoard(BasePermission):
         board = get_object_or_404(Board, pk=board_id)
         return (
             board.owner_id == request.user.id
-            or board.members.filter(pk=request.user.id).exists()
+            or is_board_member(request, board.pk)
         )
 
 
@@ -105,21 +105,15 @@ class CanAccessTaskBoardFromURL(BasePermission):
     Pre-object permission using task_id from URL:
     allow if the user is the board owner OR a board member.
     Intended for list/create/delete of comments under a task.
+    The task is resolved once per request (see resolvers.py) and reused
+    by the view.
     """
     message = "You must be an owner or member of this board."
 
     def has_permission(self, request: Request, view) -> bool:
-        task_id = view.kwargs.get("task_id")
-        if not task_id or not request.user.is_authenticated:
+        if not view.kwargs.get("task_id") or not request.user.is_authenticated:
             return False
-
-        task = get_object_or_404(Task, pk=task_id)
-        board = task.board
-        user = request.user
-        return (
-            board.owner_id == user.id
-            or board.members.filter(pk=user.id).exists()
-        )
+        return has_board_access(request, resolve_url_task(request, view))
 
 
 class IsCommentAuthor(BasePermission):
@@ -0,0 +1,66 @@
+"""
+URL-kwarg resolvers shared by permissions and views.
+
+Nested endpoints such as /tasks/{task_id}/comments/ need the same task,
+its board and the caller's membership in the permission check, the
+queryset and the create hook. `resolve_url_task` loads all three in one
+joined query and caches the result on the view, so later callers in the
+same request reuse it instead of fetching the task again.
+
+Membership verdicts are memoized per request by `is_board_member`;
+/api/batch/ hands one memo to all of its sub-requests.
+"""
+from django.db.models import Exists, OuterRef
+from django.shortcuts import get_object_or_404
+
+from .boards.models import BoardMember
+from .tasks.models import Task
+
+
+MEMBERSHIP_MEMO_ATTR = "kanban_board_memberships"
+
+
+def membership_memo(request) -> dict:
+    """board id -> membership verdict for request.user, kept on the HttpRequest."""
+    http_request = getattr(request, "_request", request)
+    memo = getattr(http_request, MEMBERSHIP_MEMO_ATTR, None)
+    if memo is None:
+        memo = {}
+        setattr(http_request, MEMBERSHIP_MEMO_ATTR, memo)
+    return memo
+
+
+def is_board_member(request, board_id: int) -> bool:
+    """True if request.user is a member of the board (memoized per request)."""
+    memo = membership_memo(request)
+    if board_id not in memo:
+        memo[board_id] = BoardMember.objects.filter(
+            board_id=board_id, user_id=request.user.id
+        ).exists()
+    return memo[board_id]
+
+
+def resolve_url_task(request, view) -> Task:
+    """
+    Return the task named by the `task_id` URL kwarg with `board` loaded
+    and `is_board_member` annotated for request.user (404 if missing).
+    """
+    task = getattr(view, "_url_task", None)
+    if task is None:
+        membership = BoardMember.objects.filter(
+            board_id=OuterRef("board_id"), user_id=request.user.id
+        )
+        task = get_object_or_404(
+            Task.objects.select_related("board")
+            .only("id", "board", "board__owner_id")
+            .annotate(is_board_member=Exists(membership)),
+            pk=view.kwargs["task_id"],
+        )
+        view._url_task = task
+        membership_memo(request)[task.board_id] = task.is_board_member
+    return task
+
+
+def has_board_access(request, task: Task) -> bool:
+    """True if request.user owns the task's board or is one of its members."""
+    return task.board.owner_id == request.user.id or task.is_board_member
@@ -0,0 +1,136 @@
+"""
+Sparse fieldsets for kanban payloads.
+
+    ?fields=id,title,status              only these keys
+    ?fields=id,tasks.id,tasks.status     dotted names select nested keys
+    ?expand=assignee,reviewer            render these relations as objects
+
+Without ?fields= every payload keeps its full, expanded shape. With it,
+expandable relations are rendered as plain ids unless named in ?expand=,
+and views use `trim_queryset` so unrequested columns, joins and count
+annotations are dropped from the SQL as well.
+"""
+from typing import Dict, Iterable, Mapping, Optional, Set
+
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+Fieldset = Dict[str, Optional["Fieldset"]]
+
+
+def parse_fieldset(raw: Optional[str]) -> Optional[Fieldset]:
+    """
+    Parse "id,tasks.id,tasks.title" into {"id": None, "tasks": {"id": None,
+    "title": None}}. None means "all fields"; so does a bare nested name.
+    """
+    if not raw:
+        return None
+    fieldset: Fieldset = {}
+    for name in (part.strip() for part in raw.split(",")):
+        head, _, rest = name.partition(".")
+        if not head:
+            continue
+        if not rest:
+            fieldset[head] = None
+        elif fieldset.get(head, {}) is not None:
+            fieldset.setdefault(head, {})[rest] = None
+    return fieldset or None
+
+
+def parse_expand(raw: Optional[str]) -> Set[str]:
+    """Parse "assignee,reviewer" into a set of relation names."""
+    return {part.strip() for part in (raw or "").split(",") if part.strip()}
+
+
+def sparse_context(request) -> dict:
+    """
+    Serializer context entries derived from ?fields= and ?expand=.
+    Only reads are trimmed; writes always validate the full serializer.
+    """
+    if request.method not in SAFE_METHODS:
+        return {"fieldset": None, "expand": set()}
+    return {
+        "fieldset": parse_fieldset(request.query_params.get("fields")),
+        "expand": parse_expand(request.query_params.get("expand")),
+    }
+
+
+def wants(fieldset: Optional[Fieldset], name: str) -> bool:
+    """True if `name` is part of the payload (always, without a fieldset)."""
+    return fieldset is None or name in fieldset
+
+
+class SparseFieldsetMixin:
+    """
+    Serializer mixin that keeps only the fields named in the fieldset,
+    given as `fieldset=` kwarg or via context["fieldset"].
+
+    `expandable_fields` maps relation fields to their id attribute; in
+    sparse mode they are rendered as ids unless listed in context["expand"].
+    """
+
+    expandable_fields: Mapping[str, str] = {}
+
+    def __init__(self, *args, **kwargs):
+        fieldset = kwargs.pop("fieldset", None)
+        super().__init__(*args, **kwargs)
+        if fieldset is None:
+            fieldset = self.context.get("fieldset")
+        self.fieldset = fieldset
+        if fieldset is None:
+            return
+
+        for name in list(self.fields):
+            if name not in fieldset:
+                self.fields.pop(name)
+
+        expand = self.context.get("expand") or set()
+        for name, id_attr in self.expandable_fields.items():
+            if name in self.fields and name not in expand:
+                self.fields[name] = serializers.IntegerField(
+                    source=id_attr, read_only=True
+                )
+
+    def nested_fieldset(self, name: str) -> Optional[Fieldset]:
+        """Fieldset requested for the nested payload `name` (None = all)."""
+        if self.fieldset is None:
+            return None
+        return self.fieldset.get(name)
+
+
+def trim_queryset(
+    queryset,
+    fieldset: Optional[Fieldset],
+    expand: Iterable[str],
+    columns: Mapping[str, Iterable[str]],
+    relations: Iterable[str] = (),
+    annotations: Optional[Mapping[str, object]] = None,
+):
+    """
+    Load only what the payload needs.
+
+    columns      serializer field -> model fields it reads
+    relations    FK fields rendered as nested objects when expanded
+    annotations  serializer field -> expression, annotated only if requested
+    """
+    annotations = annotations or {}
+    if fieldset is None:
+        if relations:
+            queryset = queryset.select_related(*relations)
+        if annotations:
+            queryset = queryset.annotate(**annotations)
+        return queryset
+
+    needed = {"id"}
+    for name in fieldset:
+        needed.update(columns.get(name, ()))
+    joined = [r for r in relations if r in fieldset and r in expand]
+    needed.update(joined)
+
+    queryset = queryset.only(*needed)
+    if joined:
+        queryset = queryset.select_related(*joined)
+    wanted = {k: v for k, v in annotations.items() if k in fieldset}
+    if wanted:
+        queryset = queryset.annotate(**wanted)
+    return queryset
@@ -1,5 +1,7 @@
 from rest_framework.permissions import BasePermission
 
+from ...resolvers import is_board_member
+
 class CanUpdateTaskOnBoard(BasePermission):
     """
     Darf Task ändern, wenn User Board-Owner oder Board-Mitglied ist.
@@ -10,5 +12,5 @@ class CanUpdateTaskOnBoard(BasePermission):
         board = obj.board
         return (
             user.is_authenticated
-            and (board.owner_id == user.id or board.members.filter(pk=user.id).exists())
+            and (board.owner_id == user.id or is_board_member(request, board.pk))
         )
\ No newline at end of file
@@ -1,19 +1,46 @@
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from rest_framework import serializers
 from kanban_app.boards.api.serializers import UserLiteSerializer
+from kanban_app.sparse import SparseFieldsetMixin
 
-from ..models import Task
+from ..hierarchy import record_task_added
+from ..labels import set_task_labels, task_label_ids, unknown_labels
+from ..models import DueTaskDigest, Task
+from ..moving import MAX_BULK_MOVE
 
 User = get_user_model()
 
 
-class TaskCreateSerializer(serializers.ModelSerializer):
+class TaskCreateSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer for creating tasks.
     Includes validation for status, priority, and board membership
     of the assignee and reviewer.
+    Also used for task lists, where ?fields=/?expand= trim the payload.
     """
-    comments_count = serializers.SerializerMethodField(read_only=True)
+    expandable_fields = {"assignee": "assignee_id", "reviewer": "reviewer_id"}
+
+    # Model fields read per payload field (see kanban_app.sparse.trim_queryset)
+    sparse_columns = {
+        "board": ["board"],
+        "title": ["title"],
+        "description": ["description"],
+        "status": ["status"],
+        "priority": ["priority"],
+        "assignee": ["assignee"],
+        "reviewer": ["reviewer"],
+        "due_date": ["due_date"],
+        "rank": ["rank"],
+        "version": ["version"],
+        "comments_count": ["comments_count"],
+        "last_comment_at": ["last_comment_at"],
+        "labels": [],
+        "parent": ["parent"],
+        "subtasks_total": ["subtasks_total"],
+        "subtasks_done": ["subtasks_done"],
+    }
+
     assignee = UserLiteSerializer(read_only=True)
     reviewer = UserLiteSerializer(read_only=True)
 
@@ -23,6 +50,10 @@ class TaskCreateSerializer(serializers.ModelSerializer):
     reviewer_id = serializers.PrimaryKeyRelatedField(
         queryset=User.objects.all(), source="reviewer", write_only=True, required=False
     )
+    labels = serializers.SerializerMethodField()
+    label_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), write_only=True, required=False
+    )
 
     class Meta:
         model = Task
@@ -38,12 +69,27 @@ class TaskCreateSerializer(serializers.ModelSerializer):
             "assignee_id",
             "reviewer_id",
             "due_date",
-            "comments_count"
+            "comments_count",
+            "last_comment_at",
+            "labels",
+            "label_ids",
+            "parent",
+            "subtasks_total",
+            "subtasks_done",
+            "rank",
+            "version",
+        ]
+        read_only_fields = [
+            "rank",
+            "version",
+            "comments_count",
+            "last_comment_at",
+            "subtasks_total",
+            "subtasks_done",
         ]
 
-    def get_comments_count(self, obj):
-        # Falls dein related_name anders heißt, hier anpassen
-        return obj.comments.count()
+    def get_labels(self, obj):
+        return task_label_ids(obj)
 
     def validate_status(self, value):
         """
@@ -68,6 +114,7 @@ class TaskCreateSerializer(serializers.ModelSerializer):
         Additional validation:
         - Assignee must be a board member.
         - Reviewer must be a board member.
+        - A parent task must be on the same board.
         """
         board = attrs.get("board")
         assignee = attrs.get("assignee")
@@ -83,8 +130,29 @@ class TaskCreateSerializer(serializers.ModelSerializer):
                 "Reviewer must be a member of the board."
             )
 
+        parent = attrs.get("parent")
+        if parent and parent.board_id != board.pk:
+            raise serializers.ValidationError(
+                {"parent": "The parent task must be on the same board."}
+            )
+
+        unknown = unknown_labels(board.pk, attrs.get("label_ids", ()))
+        if unknown:
+            raise serializers.ValidationError(
+                {"label_ids": f"Unknown label id(s) for this board: {unknown}"}
+            )
+
         return attrs
 
+    def create(self, validated_data):
+        label_ids = validated_data.pop("label_ids", None)
+        with transaction.atomic():
+            task = super().create(validated_data)
+            record_task_added(task)
+            if label_ids:
+                set_task_labels(task, label_ids)
+        return task
+
 
 class TaskUpdateSerializer(serializers.ModelSerializer):
     """
@@ -101,6 +169,10 @@ class TaskUpdateSerializer(serializers.ModelSerializer):
     reviewer_id = serializers.PrimaryKeyRelatedField(
         queryset=User.objects.all(), source="reviewer", write_only=True, required=False
     )
+    labels = serializers.SerializerMethodField()
+    label_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), write_only=True, required=False
+    )
 
     class Meta:
         model = Task
@@ -115,7 +187,17 @@ class TaskUpdateSerializer(serializers.ModelSerializer):
             "assignee_id",
             "reviewer_id",
             "due_date",
+            "labels",
+            "label_ids",
+            "parent",
+            "subtasks_total",
+            "subtasks_done",
+            "version",
         ]
+        read_only_fields = ["version", "subtasks_total", "subtasks_done"]
+
+    def get_labels(self, obj):
+        return task_label_ids(obj)
 
     def validate(self, data):
         """
@@ -123,6 +205,9 @@ class TaskUpdateSerializer(serializers.ModelSerializer):
         - Board cannot be changed once set.
         - Assignee must remain a board member.
         - Reviewer must remain a board member.
+        - A new parent must be on the same board (cycles are rejected by
+          the view, which locks the board's tree first, see
+          hierarchy.lock_tree).
         """
         task = self.instance
 
@@ -149,4 +234,67 @@ class TaskUpdateSerializer(serializers.ModelSerializer):
                 "The reviewer must be a member of the board."
             )
 
+        parent = data.get("parent")
+        if parent and parent.board_id != task.board_id:
+            raise serializers.ValidationError(
+                {"parent": "The parent task must be on the same board."}
+            )
+
+        unknown = unknown_labels(task.board_id, data.get("label_ids", ()))
+        if unknown:
+            raise serializers.ValidationError(
+                {"label_ids": f"Unknown label id(s) for this board: {unknown}"}
+            )
+
         return data
+
+
+class TaskMoveSerializer(serializers.Serializer):
+    """
+    Input serializer for moving a task within or across status columns.
+    `after_id` is the task the moved task should follow (null = top).
+    """
+    status = serializers.ChoiceField(choices=Task.STATUS, required=False)
+    after_id = serializers.IntegerField(required=False, allow_null=True, min_value=1)
+
+
+class TaskBlockerSerializer(serializers.Serializer):
+    """
+    Input serializer for POST /api/tasks/{task_id}/blockers/: the task
+    that must be finished first. It has to be on the same board.
+    """
+    blocker = serializers.IntegerField(min_value=1)
+
+
+class TaskBulkMoveSerializer(serializers.Serializer):
+    """
+    Input serializer for POST /api/tasks/bulk-move/. `non_members` decides
+    what happens to assignees/reviewers who are not members of the target
+    board: "reject" the whole move (default) or "clear" them.
+    """
+    task_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=MAX_BULK_MOVE,
+    )
+    board = serializers.IntegerField(min_value=1)
+    non_members = serializers.ChoiceField(choices=["reject", "clear"], default="reject")
+
+
+class DueTaskSerializer(serializers.ModelSerializer):
+    """
+    Read-only representation of a due digest entry for the current user.
+    """
+    id = serializers.IntegerField(source="task_id")
+    board = serializers.IntegerField(source="task.board_id")
+    title = serializers.CharField(source="task.title")
+    status = serializers.CharField(source="task.status")
+    priority = serializers.CharField(source="task.priority")
+    overdue = serializers.SerializerMethodField()
+
+    class Meta:
+        model = DueTaskDigest
+        fields = ["id", "board", "title", "status", "priority", "due_date", "overdue"]
+
+    def get_overdue(self, obj):
+        return obj.due_date < self.context["today"]
@@ -2,14 +2,32 @@ from django.urls import path
 
 from .views import (
     AssignedToMeTaskListView,
+    DueSoonTaskListView,
+    MyWorkSummaryView,
     ReviewingTaskListView,
     TaskCreateView,
     TaskDetailUpdateDeleteView,
+    TaskMoveView,
+    TaskBlockerDeleteView,
+    TaskBlockerListCreateView,
+    TaskBulkMoveView,
+    TaskSubtreeView,
 )
 
 urlpatterns = [
     path("", TaskCreateView.as_view(), name="tasks-create"),
     path("assigned-to-me/", AssignedToMeTaskListView.as_view(), name="tasks-assigned-to-me"),
     path("reviewing/", ReviewingTaskListView.as_view(), name="tasks-reviewing"),
+    path("due-soon/", DueSoonTaskListView.as_view(), name="tasks-due-soon"),
+    path("my-work/", MyWorkSummaryView.as_view(), name="tasks-my-work"),
+    path("bulk-move/", TaskBulkMoveView.as_view(), name="tasks-bulk-move"),
     path("<int:task_id>/", TaskDetailUpdateDeleteView.as_view(), name="task-detail-update-delete"),
+    path("<int:task_id>/move/", TaskMoveView.as_view(), name="task-move"),
+    path("<int:task_id>/subtree/", TaskSubtreeView.as_view(), name="task-subtree"),
+    path("<int:task_id>/blockers/", TaskBlockerListCreateView.as_view(), name="task-blockers"),
+    path(
+        "<int:task_id>/blockers/<int:blocker_id>/",
+        TaskBlockerDeleteView.as_view(),
+        name="task-blocker-delete",
+    ),
 ]
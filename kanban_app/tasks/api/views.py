@@ -1,8 +1,12 @@
+from django.db.models import Count, Q
+from django.db import transaction
 from django.shortcuts import get_object_or_404
-from rest_framework import generics, permissions
-from rest_framework.exceptions import PermissionDenied
+from django.utils import timezone
+from rest_framework import generics, permissions, serializers, status
+from rest_framework.exceptions import NotFound, PermissionDenied
 from rest_framework.generics import RetrieveUpdateDestroyAPIView
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
 from ...permissions import (
     IsBoardOwner,
@@ -11,11 +15,48 @@ from ...permissions import (
     CanCreateTaskOnBoard,
     CanDeleteTaskIfCreatorOrBoardOwner,
 )
-from ..models import Task
+from ..dependencies import (
+    DependencyCycle,
+    add_dependency,
+    forget_tasks,
+    remove_dependency,
+)
+from ..hierarchy import (
+    is_in_subtree,
+    lock_rollup_state,
+    lock_tree,
+    record_task_changed,
+    record_task_removed,
+    subtree_ids,
+)
+from ..labels import label_prefetch, release_task_labels, set_task_labels
+from ..models import DueTaskDigest, Task, TaskDependency
+from ..moving import NonMemberAssignees, move_tasks
+from ...boards.activity import lock_board, touch_board
+from ...boards.api.serializers import TaskLiteSerializer
 from ...boards.models import Board
-from .serializers import TaskCreateSerializer, TaskUpdateSerializer
+from ...compact import compact_tasks, wants_compact
+from ...concurrency import etag_for, expected_version, versioned_update
+from ...pagination import OptionalLimitOffsetPagination
+from ...resolvers import is_board_member
+from ...sparse import sparse_context, trim_queryset, wants
+from .filters import TaskFilterBackend, TaskOrderingFilter
+from ..reminders import refresh_task_digests
+from ..ranking import RANK_MAX_LENGTH, rank_after, rank_between, rebalance_column
+from .serializers import (
+    DueTaskSerializer,
+    TaskBlockerSerializer,
+    TaskBulkMoveSerializer,
+    TaskCreateSerializer,
+    TaskMoveSerializer,
+    TaskUpdateSerializer,
+)
 from .permissions import CanUpdateTaskOnBoard
 
+# Task fields the due-soon digests depend on (see reminders.py).
+DIGEST_FIELDS = frozenset({"assignee", "reviewer", "due_date", "status"})
+
+
 class TaskCreateView(generics.CreateAPIView):
     """
     Create a new task in a board.
@@ -31,34 +72,197 @@ class TaskCreateView(generics.CreateAPIView):
 
         # Additional runtime check; permission above guards this pre-object.
         if not (
-            board.owner_id == user.id or board.members.filter(pk=user.id).exists()
+            board.owner_id == user.id or is_board_member(self.request, board.pk)
         ):
             raise PermissionDenied(
                 "You must be a member of this board to create a task."
             )
 
-        obj = serializer.save(board=board, created_by=user)
-        obj = Task.objects.select_related("assignee", "reviewer").get(pk=obj.pk)
+        # New tasks are appended to the end of their status column.
+        column_status = serializer.validated_data.get("status", "to-do")
+        column = Task.all_objects.filter(board=board, status=column_status)
+        with transaction.atomic():
+            # Concurrent appends would otherwise read the same last rank.
+            lock_board(board.pk)
+            rank = rank_after(self._last_rank(column))
+            if len(rank) > RANK_MAX_LENGTH:
+                # Keys exhausted at the end: compact the column and retry once.
+                rebalance_column(column)
+                rank = rank_after(self._last_rank(column))
+            obj = serializer.save(board=board, created_by=user, rank=rank)
+            touch_board(board.pk)
+        obj = (
+            Task.all_objects.select_related("assignee", "reviewer")
+            .prefetch_related(label_prefetch())
+            .get(pk=obj.pk)
+        )
         self.instance = obj
 
+    @staticmethod
+    def _last_rank(column):
+        return column.order_by("-rank").values_list("rank", flat=True).first()
 
-class AssignedToMeTaskListView(generics.ListAPIView):
-    """List all tasks assigned to the current user."""
+
+class TaskListView(generics.ListAPIView):
+    """
+    Base for task lists: query-string filters (see filters.py), whitelisted
+    ?ordering=, optional ?limit=/&offset= pagination, sparse ?fields= and
+    ?compact=true (users sent once in a side table).
+    Lists the current user's tasks by `scope_field`; columns and user joins
+    are only loaded when the payload includes them.
+    """
     serializer_class = TaskCreateSerializer
     permission_classes = [IsAuthenticated]
+    filter_backends = [TaskFilterBackend, TaskOrderingFilter]
+    pagination_class = OptionalLimitOffsetPagination
+    # Task field that must point at the requesting user.
+    scope_field = "assignee"
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context.update(sparse_context(self.request))
+        return context
 
     def get_queryset(self):
-        return Task.objects.filter(assignee=self.request.user)
+        return self.trim_tasks(Task.objects.filter(**{self.scope_field: self.request.user}))
+
+    def trim_tasks(self, queryset):
+        """Restrict `queryset` to what the requested payload needs."""
+        context = sparse_context(self.request)
+        queryset = trim_queryset(
+            queryset,
+            context["fieldset"],
+            context["expand"],
+            columns=TaskCreateSerializer.sparse_columns,
+            relations=("assignee", "reviewer"),
+        )
+        if wants(context["fieldset"], "labels"):
+            queryset = queryset.prefetch_related(label_prefetch())
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        if wants_compact(request):
+            users = {}
+            if isinstance(response.data, dict):
+                compact_tasks(response.data["results"], users)
+                response.data["users"] = users
+            else:
+                compact_tasks(response.data, users)
+                response.data = {"users": users, "tasks": response.data}
+        return response
 
 
-class ReviewingTaskListView(generics.ListAPIView):
+class AssignedToMeTaskListView(TaskListView):
+    """List all tasks assigned to the current user."""
+
+    scope_field = "assignee"
+
+
+class ReviewingTaskListView(TaskListView):
     """List all tasks where the current user is the reviewer."""
-    serializer_class = TaskCreateSerializer
+
+    scope_field = "reviewer"
+
+
+class BoardTaskListView(TaskListView):
+    """
+    GET /boards/{board_id}/tasks/
+    List the tasks of one board (board owner or member), same filters.
+    """
+    permission_classes = [IsAuthenticated, IsBoardOwnerOrMember]
+
+    def get_board(self):
+        board = get_object_or_404(Board, pk=self.kwargs["board_id"])
+        self.check_object_permissions(self.request, board)
+        return board
+
+    def get_queryset(self):
+        return self.trim_tasks(Task.all_objects.filter(board=self.get_board()))
+
+
+class DueSoonTaskListView(generics.ListAPIView):
+    """
+    List the current user's overdue and soon-due tasks (as assignee or
+    reviewer). Reads the digests precomputed by `scan_due_tasks`, so the
+    cost depends on the number of results, not on the size of the task table.
+    """
+    serializer_class = DueTaskSerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        user = self.request.user
-        return Task.objects.filter(reviewer=user)
+        return (
+            DueTaskDigest.objects.filter(
+                user=self.request.user, task__board__deleted_at__isnull=True
+            )
+            .exclude(task__status="done")
+            .select_related("task")
+            .order_by("due_date", "task_id")
+        )
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["today"] = timezone.localdate()
+        return context
+
+
+class MyWorkSummaryView(generics.GenericAPIView):
+    """
+    GET /tasks/my-work/
+
+    Badge counts for the current user as assignee and as reviewer: tasks
+    by status, open (not done) tasks by priority, open and overdue totals.
+    Computed with a single conditional-aggregate query; the list endpoints
+    remain the way to fetch the tasks themselves.
+    """
+    permission_classes = [IsAuthenticated]
+
+    ROLES = ("assignee", "reviewer")
+    ROLE_KEYS = {"assignee": "assigned", "reviewer": "reviewing"}
+
+    def _counters(self, role, user, today):
+        """Aggregate expressions for one role, keyed by alias."""
+        mine = Q(**{role: user})
+        is_open = ~Q(status="done")
+        counters = {
+            f"{role}__total": Count("id", filter=mine),
+            f"{role}__open": Count("id", filter=mine & is_open),
+            f"{role}__overdue": Count(
+                "id", filter=mine & is_open & Q(due_date__lt=today)
+            ),
+        }
+        for i, (value, _) in enumerate(Task.STATUS):
+            counters[f"{role}__status{i}"] = Count("id", filter=mine & Q(status=value))
+        for i, (value, _) in enumerate(Task.PRIORITY):
+            counters[f"{role}__priority{i}"] = Count(
+                "id", filter=mine & is_open & Q(priority=value)
+            )
+        return counters
+
+    def get(self, request, *args, **kwargs):
+        user = request.user
+        today = timezone.localdate()
+        counters = {}
+        for role in self.ROLES:
+            counters.update(self._counters(role, user, today))
+        row = Task.objects.filter(Q(assignee=user) | Q(reviewer=user)).aggregate(**counters)
+
+        data = {}
+        for role in self.ROLES:
+            data[self.ROLE_KEYS[role]] = {
+                "total": row[f"{role}__total"],
+                "open": row[f"{role}__open"],
+                "overdue": row[f"{role}__overdue"],
+                "by_status": {
+                    value: row[f"{role}__status{i}"]
+                    for i, (value, _) in enumerate(Task.STATUS)
+                },
+                "by_priority": {
+                    value: row[f"{role}__priority{i}"]
+                    for i, (value, _) in enumerate(Task.PRIORITY)
+                },
+            }
+        return Response(data, status=status.HTTP_200_OK)
 
 
 class TaskDetailUpdateDeleteView(generics.RetrieveUpdateDestroyAPIView):
@@ -69,6 +273,9 @@ class TaskDetailUpdateDeleteView(generics.RetrieveUpdateDestroyAPIView):
     - GET:   board owner OR member
     - PATCH: board owner OR member (adjust here if only owner may edit)
     - DELETE: board owner OR task creator (extra rule handled by permission)
+
+    Updates are optimistic: send the last seen `version` as If-Match to get
+    412 instead of overwriting a concurrent change.
     """
     lookup_url_kwarg = "task_id"
     queryset = Task.objects.all()
@@ -104,7 +311,313 @@ class TaskDetailUpdateDeleteView(generics.RetrieveUpdateDestroyAPIView):
         self.check_object_permissions(self.request, obj)
         return obj
 
+    def retrieve(self, request, *args, **kwargs):
+        response = super().retrieve(request, *args, **kwargs)
+        response["ETag"] = etag_for(response.data["version"])
+        return response
+
+    def update(self, request, *args, **kwargs):
+        response = super().update(request, *args, **kwargs)
+        response["ETag"] = etag_for(response.data["version"])
+        return response
+
+    def perform_update(self, serializer):
+        # One conditional UPDATE instead of instance.save() (last-write-wins).
+        task_id = serializer.instance.pk
+        data = serializer.validated_data
+        label_ids = data.pop("label_ids", None)
+        with transaction.atomic():
+            before = None
+            if "parent" in data or "status" in data:
+                before = lock_rollup_state(task_id)
+                parent = data.get("parent")
+                if parent:
+                    # Board row after task row, the order touch_board uses.
+                    lock_tree(serializer.instance.board_id)
+                if parent and is_in_subtree(task_id, parent.pk):
+                    raise serializers.ValidationError(
+                        {"parent": "A task cannot be moved below itself or its subtasks."}
+                    )
+            versioned_update(
+                Task.all_objects,
+                task_id,
+                expected_version(self.request),
+                **data,
+            )
+            if before is not None:
+                parent_id = before["parent_id"]
+                if "parent" in data:
+                    parent_id = data["parent"].pk if data["parent"] else None
+                record_task_changed(
+                    before, parent_id, data.get("status", before["status"])
+                )
+            if label_ids is not None:
+                set_task_labels(serializer.instance, label_ids)
+            if DIGEST_FIELDS.intersection(data):
+                refresh_task_digests([task_id])
+            touch_board(serializer.instance.board_id)
+        serializer.instance = (
+            Task.all_objects.select_related("assignee", "reviewer")
+            .prefetch_related(label_prefetch())
+            .get(pk=task_id)
+        )
 
     def perform_destroy(self, instance: Task):
         # Special delete rule is enforced by CanDeleteTaskIfCreatorOrBoardOwner.
-        instance.delete()
+        # Subtasks go with their parent (CASCADE).
+        with transaction.atomic():
+            record_task_removed(lock_rollup_state(instance.pk))
+            release_task_labels(subtree_ids(instance.pk))
+            forget_tasks(instance.board_id, subtree_ids(instance.pk))
+            instance.delete()
+            touch_board(instance.board_id)
+
+
+class TaskMoveView(generics.GenericAPIView):
+    """
+    PATCH /tasks/{task_id}/move/
+
+    Move a task inside its column or into another status column.
+    Body: {"status": "in-progress", "after_id": 12}; after_id null = top.
+    Only the moved row is written: its new rank is generated between
+    the two neighbours, which are read from the board/status/rank index.
+    """
+    lookup_url_kwarg = "task_id"
+    permission_classes = [IsAuthenticated, IsBoardOwnerOrMember]
+
+    def get_object(self):
+        obj = get_object_or_404(
+            Task.objects.select_related("board"), id=self.kwargs["task_id"]
+        )
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    def _neighbour_ranks(self, column, after_id):
+        """Return the ranks of the tasks directly above and below the drop spot."""
+        if after_id is None:
+            above = None
+        else:
+            above = column.filter(pk=after_id).values_list("rank", flat=True).first()
+            if above is None:
+                raise serializers.ValidationError(
+                    {"after_id": "Task is not in the target column."}
+                )
+            column = column.filter(rank__gt=above)
+        below = column.order_by("rank").values_list("rank", flat=True).first()
+        return above, below
+
+    def patch(self, request, *args, **kwargs):
+        task = self.get_object()
+        serializer = TaskMoveSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        target_status = serializer.validated_data.get("status", task.status)
+        after_id = serializer.validated_data.get("after_id")
+
+        column = Task.all_objects.filter(
+            board_id=task.board_id, status=target_status
+        ).exclude(pk=task.pk)
+        with transaction.atomic():
+            before = lock_rollup_state(task.pk)
+            # Neighbours are read under the board lock, so two moves to the
+            # same spot cannot get the same rank.
+            lock_board(task.board_id)
+            new_rank = rank_between(*self._neighbour_ranks(column, after_id))
+            if len(new_rank) > RANK_MAX_LENGTH:
+                # Keys exhausted at this spot: compact the column and retry once.
+                rebalance_column(column)
+                new_rank = rank_between(*self._neighbour_ranks(column, after_id))
+            versioned_update(
+                Task.all_objects,
+                task.pk,
+                expected_version(request),
+                status=target_status,
+                rank=new_rank,
+            )
+            record_task_changed(before, before["parent_id"], target_status)
+            if target_status != before["status"]:
+                # Done tasks leave the due digests, reopened ones come back.
+                refresh_task_digests([task.pk])
+            touch_board(task.board_id)
+        version = Task.all_objects.filter(pk=task.pk).values_list("version", flat=True).get()
+        response = Response(
+            {"id": task.id, "status": target_status, "rank": new_rank, "version": version},
+            status=status.HTTP_200_OK,
+        )
+        response["ETag"] = etag_for(version)
+        return response
+
+
+class TaskSubtreeView(generics.GenericAPIView):
+    """
+    GET /api/tasks/{task_id}/subtree/
+
+    The task with all its subtasks, nested under "subtasks" (by id).
+    The whole subtree is loaded with one recursive query; every node
+    carries the stored `subtasks_total` / `subtasks_done` rollup.
+    Supports ?fields= and ?expand= like the board payload's tasks.
+    """
+    permission_classes = [IsAuthenticated, IsBoardOwnerOrMember]
+
+    def get(self, request, *args, **kwargs):
+        root = get_object_or_404(
+            Task.objects.select_related("board"), id=self.kwargs["task_id"]
+        )
+        self.check_object_permissions(request, root)
+
+        context = sparse_context(request)
+        fieldset, expand = context["fieldset"], context["expand"]
+        # The tree is assembled from parent ids, whatever the payload holds.
+        loaded = fieldset if fieldset is None else {**fieldset, "parent": None}
+        qs = trim_queryset(
+            Task.all_objects.filter(pk__in=subtree_ids(root.pk)),
+            loaded,
+            expand,
+            columns=TaskLiteSerializer.sparse_columns,
+            relations=("assignee", "reviewer"),
+        ).order_by("id")
+        if wants(fieldset, "labels"):
+            qs = qs.prefetch_related(label_prefetch())
+        tasks = list(qs)
+        rows = TaskLiteSerializer(
+            tasks, many=True, fieldset=fieldset, context={"expand": expand}
+        ).data
+
+        nodes = {}
+        for task, row in zip(tasks, rows):
+            row["subtasks"] = []
+            nodes[task.pk] = row
+        for task in tasks:
+            if task.pk != root.pk:
+                nodes[task.parent_id]["subtasks"].append(nodes[task.pk])
+        return Response(nodes[root.pk])
+
+
+class TaskBlockerListCreateView(generics.GenericAPIView):
+    """
+    GET  /api/tasks/{task_id}/blockers/  {"blocked_by": [...], "blocking": [...]}
+    POST /api/tasks/{task_id}/blockers/  {"blocker": id} -- `blocker` must be
+         finished first. 201 when added, 200 if it already was a blocker,
+         400 if the edge would create a cycle.
+    """
+    permission_classes = [IsAuthenticated, IsBoardOwnerOrMember]
+    serializer_class = TaskBlockerSerializer
+
+    def get_object(self):
+        obj = get_object_or_404(
+            Task.objects.select_related("board"), id=self.kwargs["task_id"]
+        )
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    def get(self, request, *args, **kwargs):
+        task = self.get_object()
+        links = TaskDependency.objects.filter(
+            Q(blocked_id=task.pk) | Q(blocker_id=task.pk)
+        ).values_list("blocker_id", "blocked_id")
+        blocked_by, blocking = [], []
+        for blocker_id, blocked_id in links:
+            if blocked_id == task.pk:
+                blocked_by.append(blocker_id)
+            else:
+                blocking.append(blocked_id)
+        return Response({"blocked_by": sorted(blocked_by), "blocking": sorted(blocking)})
+
+    def post(self, request, *args, **kwargs):
+        task = self.get_object()
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        blocker_id = serializer.validated_data["blocker"]
+        if blocker_id == task.pk:
+            raise serializers.ValidationError({"blocker": "A task cannot block itself."})
+        if not Task.all_objects.filter(pk=blocker_id, board_id=task.board_id).exists():
+            raise serializers.ValidationError(
+                {"blocker": "Task is not on the same board."}
+            )
+        try:
+            with transaction.atomic():
+                added = add_dependency(task.board_id, blocker_id, task.pk)
+                if added:
+                    touch_board(task.board_id)
+        except DependencyCycle:
+            raise serializers.ValidationError(
+                {"blocker": "This task already (indirectly) blocks the blocker."}
+            )
+        return Response(
+            {"blocker": blocker_id, "blocked": task.pk},
+            status=status.HTTP_201_CREATED if added else status.HTTP_200_OK,
+        )
+
+
+class TaskBlockerDeleteView(generics.GenericAPIView):
+    """DELETE /api/tasks/{task_id}/blockers/{blocker_id}/"""
+    permission_classes = [IsAuthenticated, IsBoardOwnerOrMember]
+
+    def delete(self, request, *args, **kwargs):
+        task = get_object_or_404(
+            Task.objects.select_related("board"), id=self.kwargs["task_id"]
+        )
+        self.check_object_permissions(request, task)
+        with transaction.atomic():
+            removed = remove_dependency(task.board_id, self.kwargs["blocker_id"], task.pk)
+            if removed:
+                touch_board(task.board_id)
+        if not removed:
+            raise NotFound("Task is not a blocker of this task.")
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class TaskBulkMoveView(generics.GenericAPIView):
+    """
+    POST /api/tasks/bulk-move/
+    {"task_ids": [...], "board": target_id, "non_members": "reject" | "clear"}
+
+    Moves the tasks, with their subtasks and comments, to another board in
+    one transaction (see moving.py). The caller must be owner or member of
+    the target board and of every source board. Assignees/reviewers who
+    are not members of the target are checked with one query; by default
+    the move is rejected (400, offending task ids in "non_members"), with
+    "clear" they are unassigned instead.
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = TaskBulkMoveSerializer
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        user = request.user
+
+        target = get_object_or_404(
+            Board.objects.only("id", "owner_id"), pk=data["board"]
+        )
+        if target.owner_id != user.id and not is_board_member(request, target.pk):
+            raise PermissionDenied("You must be a member of the target board.")
+
+        requested = set(data["task_ids"])
+        visible = {
+            task_id
+            for task_id, board_id, owner_id in Task.objects.filter(
+                pk__in=requested
+            ).values_list("id", "board_id", "board__owner_id")
+            if owner_id == user.id or is_board_member(request, board_id)
+        }
+        unknown = sorted(requested - visible)
+        if unknown:
+            raise serializers.ValidationError(
+                {"task_ids": f"Unknown task id(s): {unknown}"}
+            )
+
+        try:
+            result = move_tasks(
+                visible, target, clear_non_members=data["non_members"] == "clear"
+            )
+        except NonMemberAssignees as exc:
+            # Plain Response, not ValidationError: keep the ids integers.
+            return Response(
+                {
+                    "non_members": exc.task_ids,
+                    "detail": "Assignee or reviewer is not a member of the target board.",
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response({"board": target.pk, **result}, status=status.HTTP_200_OK)
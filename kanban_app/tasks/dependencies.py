@@ -0,0 +1,268 @@
+"""
+Task dependency graph.
+
+Edges (`TaskDependency`) never cross boards. Each process keeps an
+in-memory adjacency index per board, tagged with the board's
+`dependency_version`; every change to the graph bumps that column in
+the same transaction, so a stale index is detected with one cheap read
+and rebuilt from a single query. Writes extend the cached index
+(copy-on-write) after commit instead of reloading it.
+
+Inserting an edge locks the board row and runs an iterative DFS over the
+index, rejecting edges that would close a cycle. `analyze` walks the
+cached topological order once to find the critical path (the longest
+chain of unfinished tasks, each blocking the next) and the tasks that
+are still waiting on an unfinished blocker.
+"""
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import F, Q
+
+from ..boards.models import Board
+from .models import Task, TaskDependency
+
+DONE = "done"
+# Boards whose index is kept per process (least recently used are dropped).
+MAX_CACHED_BOARDS = 256
+
+Adjacency = Dict[int, Tuple[int, ...]]
+
+
+class DependencyCycle(ValueError):
+    """The requested edge would make a task (indirectly) block itself."""
+
+
+class DependencyIndex:
+    """Immutable adjacency lists of one board's graph at one version."""
+
+    __slots__ = ("version", "successors", "predecessors", "_order", "_lock")
+
+    def __init__(self, version: int, successors: Adjacency, predecessors: Adjacency):
+        self.version = version
+        self.successors = successors
+        self.predecessors = predecessors
+        self._order: Optional[List[int]] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_edges(cls, version: int, edges: Iterable[Tuple[int, int]]):
+        successors: Dict[int, list] = {}
+        predecessors: Dict[int, list] = {}
+        for blocker, blocked in edges:
+            successors.setdefault(blocker, []).append(blocked)
+            predecessors.setdefault(blocked, []).append(blocker)
+        return cls(
+            version,
+            {k: tuple(v) for k, v in successors.items()},
+            {k: tuple(v) for k, v in predecessors.items()},
+        )
+
+    def reaches(self, source: int, target: int) -> bool:
+        """True if a chain of edges leads from `source` to `target`."""
+        if source == target:
+            return True
+        seen = {source}
+        stack = [source]
+        while stack:
+            for nxt in self.successors.get(stack.pop(), ()):
+                if nxt == target:
+                    return True
+                if nxt not in seen:
+                    seen.add(nxt)
+                    stack.append(nxt)
+        return False
+
+    def order(self) -> List[int]:
+        """Tasks with edges in topological order (computed once per index)."""
+        with self._lock:
+            if self._order is None:
+                indegree = {node: len(preds) for node, preds in self.predecessors.items()}
+                ready = [node for node in self.successors if node not in indegree]
+                order = []
+                while ready:
+                    node = ready.pop()
+                    order.append(node)
+                    for nxt in self.successors.get(node, ()):
+                        indegree[nxt] -= 1
+                        if not indegree[nxt]:
+                            ready.append(nxt)
+                self._order = order
+            return self._order
+
+    def with_edge(self, blocker: int, blocked: int) -> "DependencyIndex":
+        successors = dict(self.successors)
+        successors[blocker] = successors.get(blocker, ()) + (blocked,)
+        predecessors = dict(self.predecessors)
+        predecessors[blocked] = predecessors.get(blocked, ()) + (blocker,)
+        return DependencyIndex(self.version + 1, successors, predecessors)
+
+    def without_edge(self, blocker: int, blocked: int) -> "DependencyIndex":
+        successors = dict(self.successors)
+        predecessors = dict(self.predecessors)
+        _drop(successors, blocker, blocked)
+        _drop(predecessors, blocked, blocker)
+        return DependencyIndex(self.version + 1, successors, predecessors)
+
+
+def _drop(adjacency: Adjacency, node: int, other: int) -> None:
+    rest = tuple(n for n in adjacency.get(node, ()) if n != other)
+    if rest:
+        adjacency[node] = rest
+    else:
+        adjacency.pop(node, None)
+
+
+_lock = threading.Lock()
+_indexes: "OrderedDict[int, DependencyIndex]" = OrderedDict()
+
+
+def _remember(board_id: int, index: DependencyIndex) -> None:
+    with _lock:
+        current = _indexes.get(board_id)
+        if current is not None and current.version > index.version:
+            return
+        _indexes[board_id] = index
+        _indexes.move_to_end(board_id)
+        while len(_indexes) > MAX_CACHED_BOARDS:
+            _indexes.popitem(last=False)
+
+
+def dependency_index(board_id: int, version: int) -> DependencyIndex:
+    """The board's index at `version`, from this process's cache if current."""
+    with _lock:
+        index = _indexes.get(board_id)
+        if index is not None and index.version == version:
+            _indexes.move_to_end(board_id)
+            return index
+    edges = TaskDependency.objects.filter(board_id=board_id).values_list(
+        "blocker_id", "blocked_id"
+    )
+    index = DependencyIndex.from_edges(version, edges.iterator())
+    _remember(board_id, index)
+    return index
+
+
+def _lock_version(board_id: int) -> int:
+    return (
+        Board.objects.select_for_update()
+        .values_list("dependency_version", flat=True)
+        .get(pk=board_id)
+    )
+
+
+def _bump_version(board_id: int) -> None:
+    Board.objects.filter(pk=board_id).update(
+        dependency_version=F("dependency_version") + 1
+    )
+
+
+def add_dependency(board_id: int, blocker_id: int, blocked_id: int) -> bool:
+    """
+    Record that `blocker_id` blocks `blocked_id` (both on `board_id`).
+    Returns False if the edge already existed; raises DependencyCycle if
+    `blocked_id` already (indirectly) blocks `blocker_id`.
+    """
+    with transaction.atomic():
+        index = dependency_index(board_id, _lock_version(board_id))
+        if blocked_id in index.successors.get(blocker_id, ()):
+            return False
+        if index.reaches(blocked_id, blocker_id):
+            raise DependencyCycle()
+        TaskDependency.objects.create(
+            board_id=board_id, blocker_id=blocker_id, blocked_id=blocked_id
+        )
+        _bump_version(board_id)
+        updated = index.with_edge(blocker_id, blocked_id)
+        transaction.on_commit(lambda: _remember(board_id, updated))
+    return True
+
+
+def remove_dependency(board_id: int, blocker_id: int, blocked_id: int) -> bool:
+    """Drop the edge; returns False if it did not exist."""
+    with transaction.atomic():
+        version = _lock_version(board_id)
+        deleted, _ = TaskDependency.objects.filter(
+            board_id=board_id, blocker_id=blocker_id, blocked_id=blocked_id
+        ).delete()
+        if not deleted:
+            return False
+        _bump_version(board_id)
+        with _lock:
+            index = _indexes.get(board_id)
+        if index is not None and index.version == version:
+            updated = index.without_edge(blocker_id, blocked_id)
+            transaction.on_commit(lambda: _remember(board_id, updated))
+    return True
+
+
+def forget_tasks(board_id: int, task_ids) -> None:
+    """Drop the edges of tasks (ids or an id subquery) that are being deleted."""
+    deleted, _ = TaskDependency.objects.filter(
+        Q(blocker_id__in=task_ids) | Q(blocked_id__in=task_ids)
+    ).delete()
+    if deleted:
+        _bump_version(board_id)
+
+
+def move_dependencies(task_ids, target_board_id: int, source_board_ids) -> None:
+    """
+    Follow tasks (ids or an id subquery) that move to another board: edges
+    among them move along, edges to tasks left behind are dropped.
+    """
+    touching = Q(blocker_id__in=task_ids) | Q(blocked_id__in=task_ids)
+    inside = Q(blocker_id__in=task_ids, blocked_id__in=task_ids)
+    dropped, _ = TaskDependency.objects.filter(touching).exclude(inside).delete()
+    moved = TaskDependency.objects.filter(inside).update(board_id=target_board_id)
+    if dropped or moved:
+        Board.objects.filter(pk__in={target_board_id, *source_board_ids}).update(
+            dependency_version=F("dependency_version") + 1
+        )
+
+
+def analyze(board_id: int) -> dict:
+    """
+    Critical path and blocked tasks of the board, in one pass over the
+    cached topological order. Done tasks neither block nor count.
+    """
+    version = Board.objects.values_list("dependency_version", flat=True).get(pk=board_id)
+    index = dependency_index(board_id, version)
+    open_tasks = set(
+        Task.all_objects.filter(board_id=board_id)
+        .exclude(status=DONE)
+        .values_list("id", flat=True)
+    )
+
+    length: Dict[int, int] = {}
+    previous: Dict[int, Optional[int]] = {}
+    blocked = []
+    end, longest = None, 0
+    for node in index.order():
+        if node not in open_tasks:
+            continue
+        best, via, waiting = 0, None, False
+        for pred in index.predecessors.get(node, ()):
+            if pred in open_tasks:
+                waiting = True
+                if length[pred] > best:
+                    best, via = length[pred], pred
+        if waiting:
+            blocked.append(node)
+        length[node] = best + 1
+        previous[node] = via
+        if length[node] > longest:
+            end, longest = node, length[node]
+
+    path = []
+    while end is not None:
+        path.append(end)
+        end = previous[end]
+    path.reverse()
+    return {
+        "dependency_version": version,
+        "edges": sum(len(v) for v in index.successors.values()),
+        "critical_path": path,
+        "blocked": sorted(blocked),
+    }
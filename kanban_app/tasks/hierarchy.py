@@ -0,0 +1,161 @@
+"""
+Subtask trees.
+
+A task may have a parent on the same board. Subtrees and ancestor chains
+are read with one recursive CTE each (`subtree_ids`, `forest_ids` and
+`ancestor_ids` are subqueries, so they combine with ordinary querysets). Every task stores
+the progress of its whole subtree in `subtasks_total` / `subtasks_done`;
+the record_* functions shift those counters on all ancestors with a
+single UPDATE whenever a task is added, moved, finished or removed.
+Reparenting holds `lock_tree` on the board while it checks for cycles, so
+two concurrent moves cannot each pass the check and commit a loop.
+`reconcile_subtask_rollups` recomputes them if they ever drift.
+"""
+from typing import Optional, Sequence, Tuple
+
+from django.db import connection
+from django.db.models import F, Q
+from django.db.models.expressions import RawSQL
+
+from ..boards.activity import lock_board, touch_boards
+from .models import Task
+
+DONE = "done"
+DEFAULT_BATCH_SIZE = 1000
+
+# Columns the rollup bookkeeping reads before a change (see lock_rollup_state).
+ROLLUP_STATE = ("parent_id", "status", "subtasks_total", "subtasks_done")
+
+_TABLE = Task._meta.db_table
+
+# UNION (not UNION ALL) so a corrupt cycle cannot make the recursion endless.
+_SUBTREE_SQL = (
+    f"WITH RECURSIVE subtree(id) AS ("
+    f"SELECT id FROM {_TABLE} WHERE id IN ({{roots}}) "
+    f"UNION SELECT t.id FROM {_TABLE} t JOIN subtree s ON t.parent_id = s.id"
+    f") SELECT id FROM subtree"
+)
+_ANCESTORS_SQL = (
+    f"WITH RECURSIVE chain(id, parent_id) AS ("
+    f"SELECT id, parent_id FROM {_TABLE} WHERE id = %s "
+    f"UNION SELECT t.id, t.parent_id FROM {_TABLE} t JOIN chain c ON t.id = c.parent_id"
+    f") SELECT id FROM chain"
+)
+_ROLLUP_SQL = (
+    f"WITH RECURSIVE pairs(ancestor_id, id) AS ("
+    f"SELECT parent_id, id FROM {_TABLE} WHERE parent_id IS NOT NULL{{board}} "
+    f"UNION SELECT t.parent_id, p.id FROM pairs p JOIN {_TABLE} t ON t.id = p.ancestor_id "
+    f"WHERE t.parent_id IS NOT NULL"
+    f") SELECT p.ancestor_id, COUNT(*), "
+    f"SUM(CASE WHEN d.status = %s THEN 1 ELSE 0 END) "
+    f"FROM pairs p JOIN {_TABLE} d ON d.id = p.id GROUP BY p.ancestor_id"
+)
+
+
+def subtree_ids(root_id: int) -> RawSQL:
+    """Ids of `root_id` and all its descendants, for use in `pk__in=`."""
+    return forest_ids([root_id])
+
+
+def forest_ids(root_ids: Sequence[int]) -> RawSQL:
+    """Ids of all `root_ids` and their descendants, for use in `pk__in=`."""
+    roots = ", ".join(["%s"] * len(root_ids))
+    return RawSQL(_SUBTREE_SQL.format(roots=roots), list(root_ids))
+
+
+def ancestor_ids(task_id: int) -> RawSQL:
+    """Ids of `task_id` and all its ancestors, for use in `pk__in=`."""
+    return RawSQL(_ANCESTORS_SQL, [task_id])
+
+
+def is_in_subtree(root_id: int, task_id: int) -> bool:
+    """True if `task_id` is `root_id` or one of its descendants."""
+    return Task.all_objects.filter(pk=task_id, pk__in=subtree_ids(root_id)).exists()
+
+
+def lock_tree(board_id: int) -> None:
+    """Serialize parent changes on `board_id` (held until the transaction ends)."""
+    lock_board(board_id)
+
+
+def lock_rollup_state(task_id: int) -> dict:
+    """Read (and lock) the columns a rollup change depends on."""
+    return (
+        Task.all_objects.select_for_update()
+        .values(*ROLLUP_STATE)
+        .get(pk=task_id)
+    )
+
+
+def _weight(state: dict, status: Optional[str] = None) -> Tuple[int, int]:
+    """(total, done) a task contributes to each of its ancestors."""
+    status = state["status"] if status is None else status
+    return 1 + state["subtasks_total"], int(status == DONE) + state["subtasks_done"]
+
+
+def _shift(parent_id: Optional[int], total: int, done: int) -> None:
+    if parent_id is None or not (total or done):
+        return
+    Task.all_objects.filter(pk__in=ancestor_ids(parent_id)).update(
+        subtasks_total=F("subtasks_total") + total,
+        subtasks_done=F("subtasks_done") + done,
+    )
+
+
+def record_task_added(task: Task) -> None:
+    """Count a newly created task on its ancestors."""
+    _shift(task.parent_id, 1, int(task.status == DONE))
+
+
+def record_task_changed(before: dict, parent_id: Optional[int], status: str) -> None:
+    """Apply a change of parent and/or status; `before` from lock_rollup_state."""
+    old_total, old_done = _weight(before)
+    new_total, new_done = _weight(before, status)
+    if parent_id != before["parent_id"]:
+        _shift(before["parent_id"], -old_total, -old_done)
+        _shift(parent_id, new_total, new_done)
+    else:
+        _shift(parent_id, 0, new_done - old_done)
+
+
+def record_task_removed(before: dict) -> None:
+    """Uncount a task that is being deleted together with its subtree."""
+    total, done = _weight(before)
+    _shift(before["parent_id"], -total, -done)
+
+
+def reconcile_subtask_rollups(
+    board_id: Optional[int] = None, batch_size: int = DEFAULT_BATCH_SIZE
+) -> int:
+    """Recompute the rollups from the parent links; return how many were wrong."""
+    params = [DONE]
+    board = ""
+    if board_id is not None:
+        board = " AND board_id = %s"
+        params.insert(0, board_id)
+    with connection.cursor() as cursor:
+        cursor.execute(_ROLLUP_SQL.format(board=board), params)
+        actual = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+
+    candidates = Task.all_objects.filter(
+        Q(subtasks_total__gt=0)
+        | Q(subtasks_done__gt=0)
+        | Q(pk__in=Task.all_objects.filter(parent__isnull=False).values("parent_id"))
+    )
+    if board_id is not None:
+        candidates = candidates.filter(board_id=board_id)
+
+    drifted = []
+    rows = candidates.values_list("pk", "subtasks_total", "subtasks_done")
+    for pk, total, done in rows.iterator(chunk_size=batch_size):
+        expected = actual.get(pk, (0, 0))
+        if (total, done) != expected:
+            drifted.append(Task(pk=pk, subtasks_total=expected[0], subtasks_done=expected[1]))
+    Task.all_objects.bulk_update(
+        drifted, ["subtasks_total", "subtasks_done"], batch_size=batch_size
+    )
+    if drifted:
+        touch_boards(
+            Task.all_objects.filter(pk__in=[task.pk for task in drifted]).values("board_id")
+        )
+    return len(drifted)
@@ -0,0 +1,134 @@
+"""
+Task labelling.
+
+`set_task_labels` replaces the labels of one task by writing only the
+difference, and keeps `Label.usage_count` in step with F() updates in the
+same transaction. `release_task_labels` does the same for tasks that are
+about to be deleted. `move_task_labels` carries labels along when tasks
+change boards. `recount_label_usage` recomputes the counters from the
+through table if they ever drift.
+"""
+from typing import Iterable, List, Optional
+
+from django.db import transaction
+from django.db.models import (
+    BigIntegerField,
+    Case,
+    Count,
+    F,
+    OuterRef,
+    Prefetch,
+    Subquery,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce
+
+from .models import Label, TaskLabel
+
+
+def label_prefetch() -> Prefetch:
+    """Prefetch of the label ids of many tasks in one query on TaskLabel."""
+    return Prefetch(
+        "task_labels",
+        queryset=TaskLabel.objects.only("id", "task_id", "label_id").order_by("label_id"),
+    )
+
+
+def task_label_ids(task) -> List[int]:
+    """Label ids of `task`, read from label_prefetch() when present."""
+    return [link.label_id for link in task.task_labels.all()]
+
+
+def unknown_labels(board_id: int, label_ids: Iterable[int]) -> List[int]:
+    """The ids in `label_ids` that are not labels of the board."""
+    wanted = set(label_ids)
+    known = set(
+        Label.objects.filter(board_id=board_id, pk__in=wanted).values_list("pk", flat=True)
+    )
+    return sorted(wanted - known)
+
+
+def set_task_labels(task, label_ids: Iterable[int]) -> None:
+    """Make `label_ids` the labels of `task`."""
+    wanted = set(label_ids)
+    current = set(
+        TaskLabel.objects.filter(task_id=task.pk).values_list("label_id", flat=True)
+    )
+    added, removed = wanted - current, current - wanted
+    with transaction.atomic():
+        if removed:
+            TaskLabel.objects.filter(task_id=task.pk, label_id__in=removed).delete()
+            Label.objects.filter(pk__in=removed).update(usage_count=F("usage_count") - 1)
+        if added:
+            TaskLabel.objects.bulk_create(
+                [TaskLabel(task_id=task.pk, label_id=label_id) for label_id in added]
+            )
+            Label.objects.filter(pk__in=added).update(usage_count=F("usage_count") + 1)
+
+
+def release_task_labels(task_ids) -> None:
+    """Uncount the labels of tasks (ids or an id subquery) that are being deleted."""
+    usage = (
+        TaskLabel.objects.filter(label_id=OuterRef("pk"), task_id__in=task_ids)
+        .values("label_id")
+        .annotate(n=Count("id"))
+        .values("n")
+    )
+    labelled = TaskLabel.objects.filter(task_id__in=task_ids).values("label_id")
+    Label.objects.filter(pk__in=labelled).update(
+        usage_count=F("usage_count") - Subquery(usage)
+    )
+
+
+def move_task_labels(task_ids: List[int], target_board_id: int, source_board_ids) -> None:
+    """
+    Re-point the labels of tasks moving to another board at the target
+    board's labels of the same name, creating missing ones, then recount
+    the labels of all boards involved.
+    """
+    links = TaskLabel.objects.filter(task_id__in=task_ids)
+    sources = {
+        pk: (name, color)
+        for pk, name, color in Label.objects.filter(
+            pk__in=links.values("label_id")
+        ).values_list("pk", "name", "color")
+    }
+    if not sources:
+        return
+    targets = dict(
+        Label.objects.filter(
+            board_id=target_board_id, name__in=[name for name, _ in sources.values()]
+        ).values_list("name", "pk")
+    )
+    missing = {
+        name: Label(board_id=target_board_id, name=name, color=color)
+        for name, color in sources.values()
+        if name not in targets
+    }
+    Label.objects.bulk_create(missing.values())
+    targets.update((name, label.pk) for name, label in missing.items())
+
+    links.update(
+        label_id=Case(
+            *[When(label_id=pk, then=Value(targets[name])) for pk, (name, _) in sources.items()],
+            default=F("label_id"),
+            output_field=BigIntegerField(),
+        )
+    )
+    for board_id in {target_board_id, *source_board_ids}:
+        recount_label_usage(board_id)
+
+
+def recount_label_usage(board_id: Optional[int] = None) -> int:
+    """Recompute usage_count from TaskLabel; return the number of labels updated."""
+    usage = (
+        TaskLabel.objects.filter(label_id=OuterRef("pk"))
+        .values("label_id")
+        .annotate(n=Count("id"))
+        .values("n")
+    )
+    labels = Label.objects.all()
+    if board_id is not None:
+        labels = labels.filter(board_id=board_id)
+    return labels.update(usage_count=Coalesce(Subquery(usage), Value(0)))
@@ -2,10 +2,23 @@ from django.contrib.auth import get_user_model
 from django.db import models
 
 from ..boards.models import Board
+from .ranking import RANK_MAX_LENGTH
 
 User = get_user_model()
 
 
+class LiveTaskManager(models.Manager):
+    """
+    Default task manager: hides tasks of soft-deleted boards at the cost of
+    a join to Board. Use it where a request enters by task id or spans
+    boards (assigned-to-me, my-work, ...); queries already scoped to a
+    board that was checked to be live go through `Task.all_objects`.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(board__deleted_at__isnull=True)
+
+
 class Task(models.Model):
     """
     Represents a single task within a board.
@@ -51,6 +64,12 @@ class Task(models.Model):
         default="medium",
     )
 
+    # Fractional sort key within the (board, status) column, see ranking.py
+    rank = models.CharField(
+        max_length=RANK_MAX_LENGTH,
+        default="i",
+    )
+
     # User assignments
     assignee = models.ForeignKey(
         User,
@@ -80,9 +99,225 @@ class Task(models.Model):
         on_delete=models.SET_NULL,  # Creator may be deleted without removing the task
     )
 
+    # Incremented on every update; clients send it back via If-Match
+    version = models.PositiveIntegerField(default=1)
+
+    # Denormalized comment stats, maintained by comments/counters.py
+    # (reconcile_comment_counts repairs drift)
+    comments_count = models.PositiveIntegerField(default=0)
+    last_comment_at = models.DateTimeField(null=True, blank=True)
+
+    # Optional parent task on the same board; subtasks form a tree
+    parent = models.ForeignKey(
+        "self",
+        related_name="subtasks",
+        null=True,
+        blank=True,
+        on_delete=models.CASCADE,  # Deleting a task removes its subtasks
+    )
+
+    # Progress of the whole subtree below this task, maintained by
+    # hierarchy.py (reconcile_subtask_rollups repairs drift)
+    subtasks_total = models.PositiveIntegerField(default=0)
+    subtasks_done = models.PositiveIntegerField(default=0)
+
+    # Task this one was copied from by board cloning (see boards/cloning.py);
+    # a plain id, not a foreign key, so the source may be deleted freely
+    cloned_from = models.BigIntegerField(null=True, blank=True, editable=False)
+
+    # Board-scoped labels (see Label / TaskLabel and labels.py)
+    labels = models.ManyToManyField(
+        "Label", through="TaskLabel", related_name="tasks", blank=True
+    )
+
+    objects = LiveTaskManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        indexes = [
+            # Serves ordered column reads and neighbour lookups on move.
+            models.Index(
+                fields=["board", "status", "rank"],
+                name="task_board_status_rank_idx",
+            ),
+            # Serves the due-date scanner's range scan (see reminders.py).
+            models.Index(
+                fields=["due_date", "status"],
+                name="task_due_date_status_idx",
+            ),
+            # Serve the filtered "assigned to me" / "reviewing" / board lists.
+            models.Index(
+                fields=["assignee", "status", "due_date"],
+                name="task_assignee_status_due_idx",
+            ),
+            models.Index(
+                fields=["reviewer", "status", "due_date"],
+                name="task_reviewer_status_due_idx",
+            ),
+            models.Index(
+                fields=["board", "due_date"],
+                name="task_board_due_date_idx",
+            ),
+            # Serve ?ordering=created_at / ?ordering=title on those lists
+            # (id, the tie-breaker, is implied by the index).
+            models.Index(
+                fields=["assignee", "created_at"],
+                name="task_assignee_created_idx",
+            ),
+            models.Index(fields=["assignee", "title"], name="task_assignee_title_idx"),
+            models.Index(
+                fields=["reviewer", "created_at"],
+                name="task_reviewer_created_idx",
+            ),
+            models.Index(fields=["reviewer", "title"], name="task_reviewer_title_idx"),
+            models.Index(fields=["board", "created_at"], name="task_board_created_idx"),
+            models.Index(fields=["board", "title"], name="task_board_title_idx"),
+            # Maps source tasks to their copies while a board is cloned.
+            models.Index(
+                fields=["cloned_from", "board"],
+                name="task_cloned_from_idx",
+                condition=models.Q(cloned_from__isnull=False),
+            ),
+        ]
+
     def __str__(self):
         """
         String representation of the task,
         by default the task's title is shown.
         """
         return self.title
+
+
+class DueTaskDigest(models.Model):
+    """
+    Precomputed reminder entry: `task` is overdue or due soon and `user`
+    is its assignee or reviewer. Rebuilt by the `scan_due_tasks` command,
+    so the due-soon endpoint only reads the current user's rows.
+    """
+
+    user = models.ForeignKey(
+        User,
+        related_name="due_digests",
+        on_delete=models.CASCADE,
+    )
+    task = models.ForeignKey(
+        Task,
+        related_name="due_digests",
+        on_delete=models.CASCADE,
+    )
+
+    # Copy of Task.due_date at scan time, used for ordering per user
+    due_date = models.DateField()
+    scanned_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "task"], name="due_digest_user_task_uniq"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["user", "due_date"], name="due_digest_user_due_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.task_id} due {self.due_date} for {self.user_id}"
+
+
+class Label(models.Model):
+    """
+    A label defined on a board and attached to any of its tasks.
+    `usage_count` is maintained by labels.py whenever tasks are
+    (un)labelled, so the board can show counts without aggregating.
+    """
+
+    board = models.ForeignKey(
+        Board,
+        related_name="labels",
+        on_delete=models.CASCADE,
+    )
+    name = models.CharField(max_length=50)
+    color = models.CharField(max_length=7, default="#9e9e9e")
+
+    # Number of tasks carrying this label
+    usage_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["board", "name"], name="label_board_name_uniq"
+            ),
+        ]
+
+    def __str__(self):
+        return self.name
+
+
+class TaskLabel(models.Model):
+    """Attachment of a label to a task."""
+
+    task = models.ForeignKey(
+        Task,
+        related_name="task_labels",
+        on_delete=models.CASCADE,
+    )
+    label = models.ForeignKey(
+        Label,
+        related_name="task_labels",
+        on_delete=models.CASCADE,
+    )
+
+    class Meta:
+        constraints = [
+            # Also serves "labels of these tasks" (prefetch) lookups.
+            models.UniqueConstraint(
+                fields=["task", "label"], name="task_label_task_label_uniq"
+            ),
+        ]
+        indexes = [
+            # Serves label filters: "tasks carrying label X".
+            models.Index(fields=["label", "task"], name="task_label_label_task_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.label_id} on {self.task_id}"
+
+
+class TaskDependency(models.Model):
+    """
+    `blocker` must be finished before `blocked` can be. Both tasks are on
+    `board`, which is stored here so a board's whole graph is read with
+    one indexed query (see dependencies.py).
+    """
+
+    board = models.ForeignKey(
+        Board,
+        related_name="task_dependencies",
+        on_delete=models.CASCADE,
+    )
+    blocker = models.ForeignKey(
+        Task,
+        related_name="blocking_links",
+        on_delete=models.CASCADE,
+    )
+    blocked = models.ForeignKey(
+        Task,
+        related_name="blocked_by_links",
+        on_delete=models.CASCADE,
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["blocker", "blocked"], name="task_dependency_uniq"
+            ),
+            models.CheckConstraint(
+                condition=~models.Q(blocker=models.F("blocked")),
+                name="task_dependency_not_self",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.blocker_id} blocks {self.blocked_id}"
@@ -0,0 +1,132 @@
+"""
+Moving tasks between boards.
+
+`move_tasks` transfers a set of tasks in one transaction. Subtasks always
+travel with their parent; a moved task whose parent stays behind becomes
+a top-level task on the target board. Comments follow by foreign key;
+labels are re-pointed at the target board's labels of the same name;
+dependencies to tasks left behind are dropped. Assignees and reviewers
+are checked against the target board's members with one query and
+either rejected or cleared. Moved tasks are appended to the ends of the
+target columns, keeping their relative order.
+"""
+from typing import Dict, Iterable, List
+
+from django.db import transaction
+from django.db.models import F, Max
+
+from ..boards.activity import lock_board, touch_boards
+from ..boards.models import Board, BoardMember
+from .dependencies import move_dependencies
+from .hierarchy import ROLLUP_STATE, forest_ids, record_task_changed
+from .labels import move_task_labels
+from .models import DueTaskDigest, Task
+from .ranking import RANK_MAX_LENGTH, evenly_spaced_ranks, rank_after, rebalance_column
+
+# Upper bound for the tasks named in one bulk move request.
+MAX_BULK_MOVE = 1000
+
+
+class NonMemberAssignees(ValueError):
+    """Moved tasks are assigned to (or reviewed by) non-members of the target."""
+
+    def __init__(self, task_ids: List[int]):
+        super().__init__(task_ids)
+        self.task_ids = task_ids
+
+
+def _append_ranks(target: Board, tasks: List[Task]) -> None:
+    """Rank the moved tasks after the current ends of the target's columns."""
+    ends = dict(
+        Task.all_objects.filter(board_id=target.pk)
+        .values("status")
+        .annotate(last=Max("rank"))
+        .values_list("status", "last")
+    )
+    columns: Dict[str, List[Task]] = {}
+    for task in sorted(tasks, key=lambda t: (t.status, t.rank, t.pk)):
+        columns.setdefault(task.status, []).append(task)
+    for status, column in columns.items():
+        keys = evenly_spaced_ranks(len(column))
+        base = rank_after(ends.get(status))
+        if len(base) + max(map(len, keys)) > RANK_MAX_LENGTH:
+            # The column's keys grew long: compact it first.
+            existing = Task.all_objects.filter(board_id=target.pk, status=status)
+            rebalance_column(existing)
+            base = rank_after(existing.aggregate(last=Max("rank"))["last"])
+        for task, key in zip(column, keys):
+            task.rank = base + key
+
+
+def move_tasks(task_ids: Iterable[int], target: Board, clear_non_members: bool) -> dict:
+    """
+    Move `task_ids` (and their subtasks) to `target`. Tasks already on
+    `target` are left alone. Raises NonMemberAssignees unless
+    `clear_non_members`, in which case those users are unassigned.
+    """
+    with transaction.atomic():
+        rows = list(
+            Task.all_objects.select_for_update()
+            .filter(pk__in=forest_ids(list(task_ids)))
+            .exclude(board_id=target.pk)
+            .values("id", "board_id", "rank", "assignee_id", "reviewer_id", *ROLLUP_STATE)
+        )
+        if not rows:
+            return {"moved": [], "detached": [], "cleared": []}
+        moved_ids = [row["id"] for row in rows]
+        source_boards = {row["board_id"] for row in rows}
+
+        users = {row[f] for row in rows for f in ("assignee_id", "reviewer_id")} - {None}
+        members = set(
+            BoardMember.objects.filter(board_id=target.pk, user_id__in=users).values_list(
+                "user_id", flat=True
+            )
+        )
+        members.add(target.owner_id)
+        invalid = sorted(
+            row["id"]
+            for row in rows
+            if {row["assignee_id"], row["reviewer_id"]} - members - {None}
+        )
+        if invalid and not clear_non_members:
+            raise NonMemberAssignees(invalid)
+
+        moved = set(moved_ids)
+        detached = []
+        tasks = []
+        for row in rows:
+            parent_id = row["parent_id"]
+            if parent_id is not None and parent_id not in moved:
+                # The parent stays behind: uncount the subtree from its old
+                # ancestors and make the task top-level on the target board.
+                record_task_changed(row, None, row["status"])
+                detached.append(row["id"])
+                parent_id = None
+            task = Task(
+                pk=row["id"], status=row["status"], rank=row["rank"], parent_id=parent_id
+            )
+            for field in ("assignee_id", "reviewer_id"):
+                setattr(task, field, row[field] if row[field] in members else None)
+            tasks.append(task)
+        lock_board(target.pk)
+        _append_ranks(target, tasks)
+
+        Task.all_objects.filter(pk__in=moved_ids).update(
+            board_id=target.pk, version=F("version") + 1
+        )
+        Task.all_objects.bulk_update(tasks, ["rank", "parent", "assignee", "reviewer"])
+
+        move_task_labels(moved_ids, target.pk, source_boards)
+        move_dependencies(moved_ids, target.pk, source_boards)
+        if invalid:
+            # Reminders of users who lost the task; the next scan rebuilds the rest.
+            DueTaskDigest.objects.filter(task_id__in=invalid).exclude(
+                user_id__in=members
+            ).delete()
+
+        touch_boards({target.pk, *source_boards})
+    return {
+        "moved": sorted(moved_ids),
+        "detached": sorted(detached),
+        "cleared": invalid if clear_non_members else [],
+    }
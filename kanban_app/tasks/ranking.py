@@ -0,0 +1,94 @@
+"""
+Fractional rank keys used to order tasks inside a (board, status) column.
+
+A rank is a base-36 string interpreted as the digits after a decimal point,
+so "i" sits at 0.5 and lexicographic order equals numeric order. Because a
+key can always be generated strictly between two neighbours, moving a task
+only ever rewrites the moved row. Keys never end in "0", which guarantees
+there is always room below any key.
+"""
+from typing import List, Optional
+
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+
+# Hard limit of the database column; keys growing past REBALANCE_LENGTH are
+# rewritten by the `rebalance_task_ranks` management command.
+RANK_MAX_LENGTH = 64
+REBALANCE_LENGTH = 24
+
+
+def _midpoint(lower: str, upper: Optional[str]) -> str:
+    """Return a key strictly between `lower` ("" = min) and `upper` (None = max)."""
+    if upper is not None:
+        # Skip the common prefix, padding `lower` with zeros.
+        n = 0
+        while n < len(upper) and (lower[n] if n < len(lower) else "0") == upper[n]:
+            n += 1
+        if n > 0:
+            return upper[:n] + _midpoint(lower[n:], upper[n:])
+
+    digit_lower = DIGITS.index(lower[0]) if lower else 0
+    digit_upper = DIGITS.index(upper[0]) if upper is not None else BASE
+    if digit_upper - digit_lower > 1:
+        return DIGITS[(digit_lower + digit_upper + 1) // 2]
+
+    # Adjacent digits: either truncate `upper` or descend one level below `lower`.
+    if upper is not None and len(upper) > 1:
+        return upper[:1]
+    return DIGITS[digit_lower] + _midpoint(lower[1:], None)
+
+
+def rank_between(before: Optional[str], after: Optional[str]) -> str:
+    """
+    Return a rank key that sorts strictly between `before` and `after`.
+    Pass None for `before` to insert at the top, None for `after` to append.
+    """
+    lower = before or ""
+    if after is not None and lower >= after:
+        raise ValueError(f"Rank {before!r} must sort before {after!r}.")
+    return _midpoint(lower, after)
+
+
+def rank_after(before: Optional[str]) -> str:
+    """
+    Return the shortest key that sorts after `before` (None = empty column).
+    Used to append: the key grows by one digit only once `before` is all
+    "z", i.e. every BASE - 1 appends instead of every append or two.
+    """
+    if before is None:
+        return rank_between(None, None)
+    for i, digit in enumerate(before):
+        if digit != DIGITS[-1]:
+            return before[:i] + DIGITS[DIGITS.index(digit) + 1]
+    return before + DIGITS[1]
+
+
+def evenly_spaced_ranks(count: int) -> List[str]:
+    """Return `count` ascending keys of minimal length, spread evenly."""
+    length = 1
+    while BASE ** length <= count:
+        length += 1
+    step = BASE ** length // (count + 1)
+
+    ranks = []
+    for i in range(1, count + 1):
+        value = step * i
+        digits = []
+        for _ in range(length):
+            value, rem = divmod(value, BASE)
+            digits.append(DIGITS[rem])
+        ranks.append("".join(reversed(digits)).rstrip("0"))
+    return ranks
+
+
+def rebalance_column(queryset) -> int:
+    """
+    Rewrite the ranks of one column (a Task queryset) with short, evenly
+    spaced keys while keeping the current order. Returns the number of rows.
+    """
+    tasks = list(queryset.order_by("rank", "id").only("id", "rank"))
+    for task, rank in zip(tasks, evenly_spaced_ranks(len(tasks))):
+        task.rank = rank
+    queryset.model._base_manager.bulk_update(tasks, ["rank"], batch_size=500)
+    return len(tasks)
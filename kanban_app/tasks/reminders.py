@@ -0,0 +1,113 @@
+"""
+Due-date scanner that precomputes per-user reminder digests.
+
+Open tasks due within the window (or already overdue) are read in
+keyset-paginated batches over the (due_date, status) index, and one
+DueTaskDigest row per (user, task) is upserted for the assignee and the
+reviewer. Rows not touched by the current scan are removed afterwards.
+
+Between scans, writes keep the digests from leaking tasks to users who
+lost them: `refresh_task_digests` rebuilds the rows of tasks whose
+assignee, reviewer, due date or status changed, and
+`forget_member_digests` drops those of users removed from a board. The
+`kanban_app.scan_due_tasks` job can reschedule itself (see
+`scan_due_tasks --every`).
+"""
+from datetime import date, timedelta
+from typing import Iterable, Optional
+
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import DueTaskDigest, Task
+
+DUE_SOON_DAYS = 3
+DEFAULT_BATCH_SIZE = 500
+
+
+def scan_due_tasks(
+    window_days: int = DUE_SOON_DAYS,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    today: Optional[date] = None,
+) -> int:
+    """
+    Rebuild the due digests for tasks due up to `window_days` from `today`.
+    Returns the number of digest rows written.
+    """
+    today = today or timezone.localdate()
+    horizon = today + timedelta(days=window_days)
+    scanned_at = timezone.now()
+
+    due = (
+        Task.objects.filter(due_date__isnull=False, due_date__lte=horizon)
+        .exclude(status="done")
+        .order_by("due_date", "id")
+        .values_list("id", "due_date", "assignee_id", "reviewer_id")
+    )
+
+    written = 0
+    last = None
+    while True:
+        page = due
+        if last is not None:
+            last_due, last_id = last
+            page = due.filter(
+                Q(due_date__gt=last_due) | Q(due_date=last_due, id__gt=last_id)
+            )
+        rows = list(page[:batch_size])
+        if not rows:
+            break
+
+        digests = {}
+        for task_id, due_date, assignee_id, reviewer_id in rows:
+            for user_id in (assignee_id, reviewer_id):
+                if user_id:
+                    digests[(user_id, task_id)] = DueTaskDigest(
+                        user_id=user_id,
+                        task_id=task_id,
+                        due_date=due_date,
+                        scanned_at=scanned_at,
+                    )
+        DueTaskDigest.objects.bulk_create(
+            digests.values(),
+            update_conflicts=True,
+            unique_fields=["user", "task"],
+            update_fields=["due_date", "scanned_at"],
+        )
+        written += len(digests)
+        last_id, last_due = rows[-1][:2]
+        last = (last_due, last_id)
+
+    # Anything the scan did not refresh is no longer due (done, moved, ...).
+    DueTaskDigest.objects.filter(scanned_at__lt=scanned_at).delete()
+    return written
+
+
+def refresh_task_digests(task_ids, window_days: int = DUE_SOON_DAYS) -> None:
+    """
+    Rebuild the digests of tasks (ids or an id subquery) right away, e.g.
+    after they changed hands: users who no longer hold a task lose its row.
+    """
+    horizon = timezone.localdate() + timedelta(days=window_days)
+    scanned_at = timezone.now()
+    digests = [
+        DueTaskDigest(user_id=user_id, task_id=task_id, due_date=due_date, scanned_at=scanned_at)
+        for task_id, due_date, assignee_id, reviewer_id in (
+            Task.all_objects.filter(pk__in=task_ids, due_date__lte=horizon)
+            .exclude(status="done")
+            .values_list("id", "due_date", "assignee_id", "reviewer_id")
+        )
+        for user_id in {assignee_id, reviewer_id} - {None}
+    ]
+    DueTaskDigest.objects.filter(task_id__in=task_ids).delete()
+    DueTaskDigest.objects.bulk_create(
+        digests,
+        update_conflicts=True,
+        unique_fields=["user", "task"],
+        update_fields=["due_date", "scanned_at"],
+    )
+
+
+def forget_member_digests(board_id: int, user_ids: Iterable[int]) -> None:
+    """Drop the digests of users who were removed from the board."""
+    DueTaskDigest.objects.filter(task__board_id=board_id, user_id__in=list(user_ids)).delete()
@@ -1,3 +1,433 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from core.models import Job
+from user_auth_app.tokens import issue_token
+
+from .boards.models import Board, BoardMember
+from .comments.counters import reconcile_comment_counters, record_comment_added
+from .comments.models import Comment
+from .jobs import scan_due_tasks_job
+from .tasks import dependencies
+from .tasks.api.filters import TaskOrderingFilter
+from .tasks.models import DueTaskDigest, Task, TaskDependency
+from .tasks.reminders import scan_due_tasks
+
+
+class KanbanAPITestCase(APITestCase):
+    """A board owned by `owner` with `member` on it; requests run as the owner."""
+
+    def setUp(self):
+        # Rolled back tests reuse board ids and versions, which would make
+        # the process-wide dependency index of an earlier test look current.
+        dependencies._indexes.clear()
+        self.owner = self.make_user("owner")
+        self.member = self.make_user("member")
+        self.board = Board.objects.create(title="Board", owner=self.owner)
+        BoardMember.objects.create(board=self.board, user=self.member)
+        self.client.force_authenticate(self.owner)
+
+    @staticmethod
+    def make_user(name):
+        return User.objects.create_user(
+            username=name, email=f"{name}@example.com", password="secret-pass-1"
+        )
+
+    def create_task(self, title="Task", status="to-do", **fields):
+        response = self.client.post(
+            "/api/tasks/",
+            {"board": self.board.pk, "title": title, "status": status,
+             "priority": "medium", **fields},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201, response.data)
+        return response.data
+
+
+class BoardVersionTests(KanbanAPITestCase):
+    def board_etag(self):
+        response = self.client.get(f"/api/boards/{self.board.pk}/")
+        self.assertEqual(response.status_code, 200)
+        return response["ETag"]
+
+    def test_etag_changes_after_task_write(self):
+        before = self.board_etag()
+        task = self.create_task()
+        after_create = self.board_etag()
+        self.assertNotEqual(before, after_create)
+
+        self.client.patch(f"/api/tasks/{task['id']}/", {"title": "Renamed"}, format="json")
+        self.assertNotEqual(after_create, self.board_etag())
+
+    def test_etag_changes_after_comment(self):
+        task = self.create_task()
+        before = self.board_etag()
+        response = self.client.post(
+            f"/api/tasks/{task['id']}/comments/", {"content": "Hi"}, format="json"
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertNotEqual(before, self.board_etag())
+
+    def test_etag_is_stable_without_writes(self):
+        self.create_task()
+        self.assertEqual(self.board_etag(), self.board_etag())
+
+
+@skipUnless(connection.vendor == "sqlite", "reads SQLite's EXPLAIN QUERY PLAN")
+class TaskListOrderingPlanTests(KanbanAPITestCase):
+    """Every list scope x ordering is an index walk, never a sort."""
+
+    def ordered(self, queryset, ordering):
+        request = Request(APIRequestFactory().get("/", {"ordering": ordering}))
+        fields = TaskOrderingFilter().get_ordering(request, queryset, None)
+        return queryset.order_by(*fields)
+
+    def test_orderings_use_an_index(self):
+        scopes = {
+            "assignee": Task.objects.filter(assignee=self.owner),
+            "reviewer": Task.objects.filter(reviewer=self.owner),
+            "board": Task.all_objects.filter(board=self.board),
+        }
+        for scope, queryset in scopes.items():
+            for ordering in ("created_at", "-created_at", "title", "-title"):
+                with self.subTest(scope=scope, ordering=ordering):
+                    plan = self.ordered(queryset, ordering).explain()
+                    self.assertNotIn("TEMP B-TREE", plan)
+                    column = ordering.lstrip("-").replace("created_at", "created")
+                    self.assertIn(f"task_{scope}_{column}_idx", plan)
+
+
+class SubtaskTests(KanbanAPITestCase):
+    def rollup(self, task_id):
+        return Task.objects.values_list("subtasks_total", "subtasks_done").get(pk=task_id)
+
+    def test_rollups_follow_status_and_parent_changes(self):
+        root = self.create_task("Root")["id"]
+        child = self.create_task("Child", parent=root)["id"]
+        self.create_task("Grandchild", parent=child, status="done")
+        self.assertEqual(self.rollup(root), (2, 1))
+
+        self.client.patch(f"/api/tasks/{child}/", {"status": "done"}, format="json")
+        self.assertEqual(self.rollup(root), (2, 2))
+
+        self.client.patch(f"/api/tasks/{child}/", {"parent": None}, format="json")
+        self.assertEqual(self.rollup(root), (0, 0))
+        self.assertEqual(self.rollup(child), (1, 1))
+
+    def test_reparenting_below_own_subtree_is_rejected(self):
+        root = self.create_task("Root")["id"]
+        child = self.create_task("Child", parent=root)["id"]
+        response = self.client.patch(f"/api/tasks/{root}/", {"parent": child}, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("parent", response.data)
+        self.assertIsNone(Task.objects.get(pk=root).parent_id)
+
+
+class CommentCounterTests(KanbanAPITestCase):
+    def counters(self, task_id):
+        return Task.objects.values_list("comments_count", "last_comment_at").get(pk=task_id)
+
+    def comment(self, task_id):
+        response = self.client.post(
+            f"/api/tasks/{task_id}/comments/", {"content": "Note"}, format="json"
+        )
+        self.assertEqual(response.status_code, 201)
+        return Comment.objects.latest("pk")
+
+    def test_counters_follow_comment_writes(self):
+        task = self.create_task()["id"]
+        first = self.comment(task)
+        second = self.comment(task)
+        self.assertEqual(self.counters(task), (2, second.created_at))
+
+        self.client.delete(f"/api/tasks/{task}/comments/{second.pk}/")
+        self.assertEqual(self.counters(task), (1, first.created_at))
+
+    def test_late_comment_does_not_move_last_comment_at_back(self):
+        task = self.create_task()["id"]
+        newest = self.comment(task)
+        late = Comment.objects.create(
+            task_id=task, author=self.owner, content="Late",
+        )
+        Comment.objects.filter(pk=late.pk).update(
+            created_at=newest.created_at - timedelta(minutes=5)
+        )
+        late.refresh_from_db()
+        record_comment_added(late)
+        self.assertEqual(self.counters(task), (2, newest.created_at))
+
+    def test_reconcile_repairs_drift(self):
+        tasks = [self.create_task(f"Task {i}")["id"] for i in range(3)]
+        newest = self.comment(tasks[0])
+        Task.objects.filter(pk=tasks[0]).update(comments_count=5, last_comment_at=None)
+        Task.objects.filter(pk=tasks[1]).update(comments_count=2)
+
+        self.assertEqual(reconcile_comment_counters(batch_size=2), 2)
+        self.assertEqual(self.counters(tasks[0]), (1, newest.created_at))
+        self.assertEqual(self.counters(tasks[1]), (0, None))
+        self.assertEqual(reconcile_comment_counters(batch_size=2), 0)
+
+
+class TaskRankTests(KanbanAPITestCase):
+    def column(self, status="to-do"):
+        return list(
+            Task.objects.filter(board=self.board, status=status)
+            .order_by("rank")
+            .values_list("pk", flat=True)
+        )
+
+    def move(self, task_id, **body):
+        response = self.client.patch(f"/api/tasks/{task_id}/move/", body, format="json")
+        self.assertEqual(response.status_code, 200, response.data)
+        return response
+
+    def test_new_tasks_are_appended(self):
+        ids = [self.create_task(f"Task {i}")["id"] for i in range(4)]
+        self.assertEqual(self.column(), ids)
+
+    def test_move_within_and_across_columns(self):
+        a, b, c = (self.create_task(title)["id"] for title in "abc")
+        self.move(c, after_id=None)
+        self.assertEqual(self.column(), [c, a, b])
+        self.move(c, after_id=a)
+        self.assertEqual(self.column(), [a, c, b])
+
+        done = self.create_task("Done", status="done")["id"]
+        self.move(a, status="done", after_id=done)
+        self.assertEqual(self.column(), [c, b])
+        self.assertEqual(self.column("done"), [done, a])
+
+    def test_after_id_must_be_in_target_column(self):
+        a = self.create_task("a")["id"]
+        other = self.create_task("b", status="done")["id"]
+        response = self.client.patch(
+            f"/api/tasks/{a}/move/", {"after_id": other}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_rebalance_keeps_order_and_shortens_keys(self):
+        ids = [self.create_task(f"Task {i}")["id"] for i in range(3)]
+        for _ in range(30):
+            # Alternate two tasks between the top spots so their keys grow.
+            self.move(ids[2], after_id=None)
+            self.move(ids[1], after_id=None)
+        order = self.column()
+        self.assertGreater(max(len(r) for r in Task.objects.values_list("rank", flat=True)), 3)
+
+        call_command("rebalance_task_ranks", threshold=3, stdout=StringIO())
+        self.assertEqual(self.column(), order)
+        self.assertEqual(max(len(r) for r in Task.objects.values_list("rank", flat=True)), 1)
+
+
+class DueDigestTests(KanbanAPITestCase):
+    def digest_users(self, task_id):
+        return set(DueTaskDigest.objects.filter(task_id=task_id).values_list("user_id", flat=True))
+
+    def test_digests_follow_hand_offs_and_moves(self):
+        task = self.create_task(
+            due_date=str(timezone.localdate() + timedelta(days=1)),
+            assignee_id=self.member.pk,
+        )["id"]
+        scan_due_tasks()
+        self.assertEqual(self.digest_users(task), {self.member.pk})
+
+        other = self.make_user("other")
+        BoardMember.objects.create(board=self.board, user=other)
+        self.client.patch(f"/api/tasks/{task}/", {"assignee_id": other.pk}, format="json")
+        self.assertEqual(self.digest_users(task), {other.pk})
+
+        self.client.patch(f"/api/tasks/{task}/move/", {"status": "done"}, format="json")
+        self.assertEqual(self.digest_users(task), set())
+        self.client.patch(f"/api/tasks/{task}/move/", {"status": "review"}, format="json")
+        self.assertEqual(self.digest_users(task), {other.pk})
+
+    def test_repeating_scan_reschedules_after_a_failure(self):
+        with mock.patch("kanban_app.jobs.scan_due_tasks", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError), self.captureOnCommitCallbacks(execute=True):
+                scan_due_tasks_job(window_days=3, every_minutes=10)
+        follow_up = Job.objects.get(name="kanban_app.scan_due_tasks")
+        self.assertEqual(follow_up.payload, {"window_days": 3, "every_minutes": 10})
+        self.assertEqual(follow_up.max_attempts, 1)
+
+
+class BoardCloneTests(KanbanAPITestCase):
+    def test_clone_remaps_parents_labels_and_dependencies(self):
+        label = self.client.post(
+            f"/api/boards/{self.board.pk}/labels/", {"name": "bug"}, format="json"
+        ).data["id"]
+        root = self.create_task("Root", label_ids=[label])["id"]
+        child = self.create_task("Child", parent=root)["id"]
+        self.client.post(f"/api/tasks/{child}/blockers/", {"blocker": root}, format="json")
+        self.client.post(f"/api/tasks/{root}/comments/", {"content": "Hi"}, format="json")
+
+        response = self.client.post(
+            f"/api/boards/{self.board.pk}/clone/",
+            {"title": "Copy", "include_comments": True},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201, response.data)
+        copy = Board.objects.get(pk=response.data["id"])
+
+        new_root = Task.objects.get(board=copy, title="Root")
+        new_child = Task.objects.get(board=copy, title="Child")
+        self.assertEqual(new_child.parent_id, new_root.pk)
+        self.assertEqual(new_root.cloned_from, root)
+        self.assertEqual(
+            list(new_root.labels.values_list("board_id", "name")), [(copy.pk, "bug")]
+        )
+        self.assertTrue(
+            TaskDependency.objects.filter(
+                board=copy, blocker=new_root, blocked=new_child
+            ).exists()
+        )
+        self.assertEqual(Comment.objects.filter(task=new_root).count(), 1)
+        self.assertEqual(set(copy.members.values_list("pk", flat=True)), {self.member.pk})
+
+
+class DeletedBoardTests(KanbanAPITestCase):
+    def test_labels_of_a_deleted_board_are_gone(self):
+        label = self.client.post(
+            f"/api/boards/{self.board.pk}/labels/", {"name": "bug"}, format="json"
+        ).data["id"]
+        url = f"/api/boards/{self.board.pk}/labels/{label}/"
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+        self.assertEqual(self.client.delete(f"/api/boards/{self.board.pk}/").status_code, 204)
+        self.assertEqual(self.client.get(url).status_code, 404)
+        self.assertEqual(
+            self.client.patch(url, {"color": "#000000"}, format="json").status_code, 404
+        )
+
+
+class ConditionalUpdateTests(KanbanAPITestCase):
+    def test_stale_if_match_is_rejected_with_412(self):
+        task = self.create_task()
+        url = f"/api/tasks/{task['id']}/"
+        etag = self.client.get(url)["ETag"]
+
+        first = self.client.patch(url, {"title": "Mine"}, format="json", HTTP_IF_MATCH=etag)
+        self.assertEqual(first.status_code, 200)
+        self.assertNotEqual(first["ETag"], etag)
+
+        stale = self.client.patch(url, {"title": "Theirs"}, format="json", HTTP_IF_MATCH=etag)
+        self.assertEqual(stale.status_code, 412)
+        self.assertEqual(Task.objects.get(pk=task["id"]).title, "Mine")
+
+        moved = self.client.patch(
+            f"{url}move/", {"status": "done"}, format="json", HTTP_IF_MATCH=etag
+        )
+        self.assertEqual(moved.status_code, 412)
+
+    def test_stale_board_if_match_is_rejected_with_412(self):
+        url = f"/api/boards/{self.board.pk}/"
+        etag = self.client.get(url)["ETag"]
+        self.create_task()
+        response = self.client.patch(url, {"title": "Renamed"}, format="json", HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 412)
+
+
+class IdempotencyTests(KanbanAPITestCase):
+    def setUp(self):
+        super().setUp()
+        # The middleware authenticates by token, ahead of DRF.
+        self.client.force_authenticate(None)
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + issue_token(self.owner))
+
+    def post_task(self, title, key):
+        return self.client.post(
+            "/api/tasks/",
+            {"board": self.board.pk, "title": title, "status": "to-do", "priority": "low"},
+            format="json",
+            HTTP_IDEMPOTENCY_KEY=key,
+        )
+
+    def test_retry_replays_the_first_response(self):
+        first = self.post_task("Once", "key-1")
+        retry = self.post_task("Once", "key-1")
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(retry.content, first.content)
+        self.assertEqual(Task.objects.filter(board=self.board).count(), 1)
+
+    def test_key_reused_for_another_request_is_rejected(self):
+        self.post_task("Once", "key-1")
+        self.assertEqual(self.post_task("Other", "key-1").status_code, 422)
+        self.assertEqual(Task.objects.filter(board=self.board).count(), 1)
+
+
+class DependencyTests(KanbanAPITestCase):
+    def block(self, blocked, blocker):
+        return self.client.post(
+            f"/api/tasks/{blocked}/blockers/", {"blocker": blocker}, format="json"
+        )
+
+    def test_cycles_are_rejected(self):
+        a, b, c = (self.create_task(title)["id"] for title in "abc")
+        self.assertEqual(self.block(b, a).status_code, 201)
+        self.assertEqual(self.block(c, b).status_code, 201)
+        self.assertEqual(self.block(b, a).status_code, 200)
+
+        response = self.block(a, c)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("blocker", response.data)
+        self.assertEqual(self.block(a, a).status_code, 400)
+        self.assertEqual(TaskDependency.objects.filter(board=self.board).count(), 2)
+
+    def test_removed_edge_no_longer_blocks(self):
+        a, b = (self.create_task(title)["id"] for title in "ab")
+        self.block(b, a)
+        self.assertEqual(self.client.delete(f"/api/tasks/{b}/blockers/{a}/").status_code, 204)
+        self.assertEqual(self.client.delete(f"/api/tasks/{b}/blockers/{a}/").status_code, 404)
+        self.assertEqual(self.block(a, b).status_code, 201)
+
+
+class BulkMoveTests(KanbanAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.target = Board.objects.create(title="Target", owner=self.owner)
+
+    def bulk_move(self, task_ids, **body):
+        return self.client.post(
+            "/api/tasks/bulk-move/",
+            {"task_ids": task_ids, "board": self.target.pk, **body},
+            format="json",
+        )
+
+    def test_non_member_assignees_are_rejected(self):
+        task = self.create_task(assignee_id=self.member.pk)["id"]
+        response = self.bulk_move([task])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["non_members"], [task])
+        self.assertEqual(Task.objects.get(pk=task).board_id, self.board.pk)
+
+    def test_non_member_assignees_are_cleared_on_request(self):
+        label = self.client.post(
+            f"/api/boards/{self.board.pk}/labels/", {"name": "bug"}, format="json"
+        ).data["id"]
+        parent = self.create_task("Parent", assignee_id=self.member.pk, label_ids=[label])["id"]
+        child = self.create_task("Child", parent=parent)["id"]
+        blocker = self.create_task("Stays")["id"]
+        self.client.post(f"/api/tasks/{parent}/blockers/", {"blocker": blocker}, format="json")
+
+        response = self.bulk_move([parent], non_members="clear")
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data["moved"], [parent, child])
+        self.assertEqual(response.data["cleared"], [parent])
+
+        moved = Task.objects.get(pk=parent)
+        self.assertEqual(moved.board_id, self.target.pk)
+        self.assertIsNone(moved.assignee_id)
+        self.assertEqual(Task.objects.get(pk=child).parent_id, parent)
+        self.assertEqual(
+            list(moved.labels.values_list("board_id", "name")), [(self.target.pk, "bug")]
+        )
+        self.assertFalse(TaskDependency.objects.filter(blocked=parent).exists())
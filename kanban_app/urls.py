@@ -1,6 +1,9 @@
 from django.urls import include, path
 
+from .batch import BatchView
+
 urlpatterns = [
+    path("batch/", BatchView.as_view(), name="batch"),
     path("boards/", include("kanban_app.boards.api.urls")),
     path("tasks/", include("kanban_app.tasks.api.urls")),
     path("tasks/", include("kanban_app.comments.api.urls")),
@@ -1,6 +1,12 @@
 from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
 
+from ..models import EmailInUse, UserProfile, normalize_email
+
+
+EMAIL_IN_USE = {'email': 'This email address is already in use.'}
+
 
 class RegistrationSerializer(serializers.Serializer):
     """
@@ -25,10 +31,8 @@ class RegistrationSerializer(serializers.Serializer):
             )
 
         email = attrs.get('email')
-        if User.objects.filter(email__iexact=email).exists():
-            raise serializers.ValidationError(
-                {'email': 'This email address is already in use.'}
-            )
+        if UserProfile.objects.filter(email_normalized=normalize_email(email)).exists():
+            raise serializers.ValidationError(EMAIL_IN_USE)
         return attrs
 
     def create(self, validated_data):
@@ -43,19 +47,25 @@ class RegistrationSerializer(serializers.Serializer):
         # Use the email as the username (default User model)
         username = email
 
-        user = User.objects.create_user(
-            username=username,
-            email=email,
-            password=password,
-            first_name=fullname,  # store 'fullname' pragmatically in first_name
-        )
+        # The unique email index settles races between concurrent
+        # registrations that both passed the exists() check in validate().
+        try:
+            with transaction.atomic():
+                user = User.objects.create_user(
+                    username=username,
+                    email=email,
+                    password=password,
+                    first_name=fullname,  # store 'fullname' pragmatically in first_name
+                )
+        except (IntegrityError, EmailInUse):
+            raise serializers.ValidationError(EMAIL_IN_USE)
         return user
 
 
 class LoginSerializer(serializers.Serializer):
     """
     Serializer for login validation.
-    Resolves the user by case-insensitive email and checks the password.
+    Resolves the user by normalized (case-insensitive) email and checks the password.
     """
 
     email = serializers.EmailField()
@@ -65,11 +75,11 @@ class LoginSerializer(serializers.Serializer):
         """
         Validate credentials and attach the authenticated user to attrs.
         """
-        email = (attrs.get('email') or '').strip()
+        email = normalize_email(attrs.get('email'))
         password = attrs.get('password') or ''
 
         try:
-            user = User.objects.get(email__iexact=email)
+            user = User.objects.get(userprofile__email_normalized=email)
         except User.DoesNotExist:
             raise serializers.ValidationError({'detail': 'Invalid credentials.'})
 
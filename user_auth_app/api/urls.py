@@ -1,9 +1,12 @@
 from django.urls import path
+
+from core.middleware import compression_exempt
+
 from .views import RegistrationView, LoginView, EmailCheckView
 
+# Responses carrying tokens are never compressed (see compression_exempt).
 urlpatterns = [
-    path('registration/', RegistrationView.as_view(), name='registration'),
-    path('login/', LoginView.as_view(), name='login'),
+    path('registration/', compression_exempt(RegistrationView.as_view()), name='registration'),
+    path('login/', compression_exempt(LoginView.as_view()), name='login'),
     path('email-check/', EmailCheckView.as_view(), name='email-check'),
 ]
-
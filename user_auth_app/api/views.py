@@ -3,9 +3,10 @@ from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework import status, serializers
-from rest_framework.authtoken.models import Token
 from .serializers import RegistrationSerializer, LoginSerializer
-from rest_framework.throttling import ScopedRateThrottle
+from ..models import normalize_email
+from ..tokens import issue_token
+from core.throttling import ScopedRateThrottle
 from django.contrib.auth import get_user_model
 from django.db.models import Q
 from rest_framework.permissions import IsAuthenticated
@@ -31,10 +32,10 @@ class RegistrationView(APIView):
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
         user = serializer.save()
-        token, _ = Token.objects.get_or_create(user=user)
+        token_key = issue_token(user)
 
         data = {
-            "token": token.key,
+            "token": token_key,
             "fullname": user.first_name,  # value originally captured from "fullname" field in request
             "email": user.email,
             "user_id": user.id,
@@ -60,18 +61,18 @@ class LoginView(APIView):
         email = request.data.get('email', '')
         password = request.data.get('password', '')
 
-        # Case-insensitive email match
+        # Case-insensitive email match via the normalized, indexed column
         try:
-            user = User.objects.get(email__iexact=email)
+            user = User.objects.get(userprofile__email_normalized=normalize_email(email))
         except User.DoesNotExist:
             return Response({"detail": "Invalid credentials."}, status=status.HTTP_400_BAD_REQUEST)
 
         if not user.check_password(password):
             return Response({"detail": "Invalid credentials."}, status=status.HTTP_400_BAD_REQUEST)
 
-        token, _ = Token.objects.get_or_create(user=user)
+        token_key = issue_token(user)
         data = {
-            "token": token.key,
+            "token": token_key,
             "fullname": user.first_name,
             "email": user.email,
             "user_id": user.id,
@@ -96,10 +97,10 @@ class LoginView(APIView):
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
         user = serializer.validated_data['user']
-        token, _ = Token.objects.get_or_create(user=user)
+        token_key = issue_token(user)
 
         return Response({
-            "token": token.key,
+            "token": token_key,
             "fullname": user.first_name,   # stored during registration from "fullname" input
             "email": user.email,
             "user_id": user.id
@@ -139,8 +140,8 @@ class EmailCheckView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # 3) Case-insensitive lookup (narrow selection to required fields)
-        user = User.objects.filter(email__iexact=email).only(
+        # 3) Case-insensitive lookup on the normalized email (narrow selection to required fields)
+        user = User.objects.filter(userprofile__email_normalized=normalize_email(email)).only(
             "id", "email", "first_name", "last_name", "username"
         ).first()
 
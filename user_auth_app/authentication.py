@@ -0,0 +1,28 @@
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+
+from .models import ExpiringToken
+
+
+class ExpiringTokenAuthentication(TokenAuthentication):
+    """
+    `Authorization: Token <key>` against ExpiringToken. The expiry is
+    checked on the row already loaded with the user, so it costs no query
+    beyond the one DRF's TokenAuthentication makes.
+    """
+
+    model = ExpiringToken
+
+    def authenticate_credentials(self, key):
+        try:
+            token = self.model.objects.select_related("user").get(key=key)
+        except self.model.DoesNotExist:
+            raise AuthenticationFailed(_("Invalid token."))
+
+        if token.expires_at <= timezone.now():
+            raise AuthenticationFailed(_("Token has expired."))
+        if not token.user.is_active:
+            raise AuthenticationFailed(_("User inactive or deleted."))
+        return (token.user, token)
@@ -0,0 +1,10 @@
+"""Background job handlers for the auth app (see core/jobs.py)."""
+from core.jobs import job
+
+from .tokens import purge_expired_tokens
+
+
+@job("user_auth_app.purge_expired_tokens")
+def purge_expired_tokens_job():
+    """Sweep expired API tokens in batches."""
+    purge_expired_tokens()
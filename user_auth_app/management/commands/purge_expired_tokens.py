@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from user_auth_app.tokens import DEFAULT_BATCH_SIZE, purge_expired_tokens
+
+
+class Command(BaseCommand):
+    """
+    Delete expired API tokens in bounded batches.
+    Intended to run on a schedule (e.g. daily from cron).
+    """
+
+    help = "Purge expired API tokens in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="Maximum rows removed per DELETE statement.",
+        )
+
+    def handle(self, *args, **options):
+        deleted = purge_expired_tokens(batch_size=options["batch_size"])
+        self.stdout.write(f"Purged {deleted} expired token(s).")
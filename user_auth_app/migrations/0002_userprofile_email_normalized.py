@@ -0,0 +1,37 @@
+# Generated by Django 5.2.5 on 2026-10-19 10:38
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Lower, NullIf, Trim
+
+
+def backfill_email_normalized(apps, schema_editor):
+    """Create missing profiles and fill email_normalized for every user."""
+    User = apps.get_model("auth", "User")
+    UserProfile = apps.get_model("user_auth_app", "UserProfile")
+    missing = User.objects.filter(userprofile__isnull=True).values_list("id", flat=True)
+    UserProfile.objects.bulk_create(
+        (UserProfile(user_id=user_id) for user_id in missing.iterator()),
+        batch_size=1000,
+    )
+    email = User.objects.filter(pk=OuterRef("user_id")).values(
+        normalized=NullIf(Lower(Trim("email")), Value(""))
+    )
+    UserProfile.objects.update(email_normalized=Subquery(email))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_auth_app', '0001_initial'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='email_normalized',
+            field=models.CharField(blank=True, db_index=True, max_length=254, null=True),
+        ),
+        migrations.RunPython(backfill_email_normalized, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.5 on 2026-10-19 10:39
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def release_duplicate_emails(apps, schema_editor):
+    """
+    Legacy accounts sharing an email (in different casing) could never log
+    in reliably. The oldest keeps the lookup key; the others are cleared so
+    the unique index can be built.
+    """
+    UserProfile = apps.get_model("user_auth_app", "UserProfile")
+    duplicates = (
+        UserProfile.objects.exclude(email_normalized=None)
+        .values("email_normalized")
+        .annotate(n=Count("id"), keep=Min("user_id"))
+        .filter(n__gt=1)
+    )
+    for row in duplicates:
+        UserProfile.objects.filter(email_normalized=row["email_normalized"]).exclude(
+            user_id=row["keep"]
+        ).update(email_normalized=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_auth_app', '0002_userprofile_email_normalized'),
+    ]
+
+    operations = [
+        migrations.RunPython(release_duplicate_emails, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='userprofile',
+            name='email_normalized',
+            field=models.CharField(blank=True, max_length=254, null=True, unique=True),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.5 on 2026-10-19 10:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def copy_legacy_tokens(apps, schema_editor):
+    """Carry existing non-expiring tokens over so current sessions survive."""
+    Token = apps.get_model("authtoken", "Token")
+    ExpiringToken = apps.get_model("user_auth_app", "ExpiringToken")
+    now = timezone.now()
+    expires_at = now + settings.AUTH_TOKEN_TTL
+    ExpiringToken.objects.bulk_create(
+        (
+            ExpiringToken(key=key, user_id=user_id, created=now, expires_at=expires_at)
+            for key, user_id in Token.objects.values_list("key", "user_id").iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_auth_app', '0003_unique_email_normalized'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('authtoken', '0004_alter_tokenproxy_options'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExpiringToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=40, unique=True)),
+                ('created', models.DateTimeField()),
+                ('expires_at', models.DateTimeField(db_index=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='auth_token_expiring', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.RunPython(copy_legacy_tokens, migrations.RunPython.noop),
+    ]
@@ -1,10 +1,47 @@
 from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
 from django.db import models
 
+
+def normalize_email(email):
+    """Canonical form used for email lookups: stripped and lowercased (None if empty)."""
+    if not isinstance(email, str):
+        return None
+    return email.strip().lower() or None
+
+
+class EmailInUse(ValidationError):
+    """Another account already has this email (compared normalized)."""
+
+    def __init__(self):
+        super().__init__({"email": "This email address is already in use."})
+
+
 class UserProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     bio = models.TextField(blank=True, null=True)
     location = models.CharField(max_length=100, blank=True, null=True)
+    # normalize_email(user.email), kept in sync by signals.sync_email_normalized
+    # so email lookups are exact matches on an index instead of iexact scans.
+    # Unique: two accounts can never share an email, whatever the casing.
+    email_normalized = models.CharField(max_length=254, blank=True, null=True, unique=True)
 
     def __str__(self):
         return self.user.username
+
+
+class ExpiringToken(models.Model):
+    """
+    API token with a fixed lifetime (settings.AUTH_TOKEN_TTL). One row per
+    user: logging in returns the current key while it is valid (extending
+    its expiry) and rotates it once expired (see tokens.issue_token). Expired rows are swept in
+    batches by tokens.purge_expired_tokens.
+    """
+
+    key = models.CharField(max_length=40, unique=True)
+    user = models.OneToOneField(User, related_name="auth_token_expiring", on_delete=models.CASCADE)
+    created = models.DateTimeField()
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"Token for {self.user.username} (expires {self.expires_at:%Y-%m-%d %H:%M})"
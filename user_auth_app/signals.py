@@ -0,0 +1,42 @@
+from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+from django.db.models.signals import post_save, pre_save
+from django.dispatch import receiver
+
+from .models import EmailInUse, UserProfile, normalize_email
+
+
+def _touches_email(raw, update_fields):
+    return not raw and (update_fields is None or "email" in update_fields)
+
+
+@receiver(pre_save, sender=User)
+def check_email_unique(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Refuse to save a user whose email another account already has."""
+    if not _touches_email(raw, update_fields):
+        return
+    email = normalize_email(instance.email)
+    if email and (
+        UserProfile.objects.filter(email_normalized=email).exclude(user_id=instance.pk).exists()
+    ):
+        raise EmailInUse()
+
+
+@receiver(post_save, sender=User)
+def sync_email_normalized(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """
+    Keep UserProfile.email_normalized in step with User.email.
+    Saves that do not touch the email (e.g. last_login updates) are skipped.
+    A concurrent save that took the email first raises EmailInUse.
+    """
+    if not _touches_email(raw, update_fields):
+        return
+    email = normalize_email(instance.email)
+    try:
+        with transaction.atomic():
+            if created or not UserProfile.objects.filter(user=instance).update(
+                email_normalized=email
+            ):
+                UserProfile.objects.create(user=instance, email_normalized=email)
+    except IntegrityError:
+        raise EmailInUse()
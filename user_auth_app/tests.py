@@ -1,3 +1,123 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from .models import EmailInUse, ExpiringToken, UserProfile
+from .tokens import issue_token, purge_expired_tokens
+
+
+@override_settings(COMPRESSION_MIN_SIZE=0)
+class TokenResponseCompressionTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="ada", email="ada@example.com", password="secret-pass-1", first_name="Ada"
+        )
+
+    def test_login_and_registration_are_not_compressed(self):
+        login = self.client.post(
+            "/api/login/",
+            {"email": "ada@example.com", "password": "secret-pass-1"},
+            format="json",
+            HTTP_ACCEPT_ENCODING="gzip",
+        )
+        self.assertEqual(login.status_code, 200)
+        self.assertIn("token", login.json())
+        self.assertFalse(login.has_header("Content-Encoding"))
+
+        registration = self.client.post(
+            "/api/registration/",
+            {
+                "fullname": "Grace",
+                "email": "grace@example.com",
+                "password": "secret-pass-1",
+                "repeated_password": "secret-pass-1",
+            },
+            format="json",
+            HTTP_ACCEPT_ENCODING="gzip",
+        )
+        self.assertEqual(registration.status_code, 201)
+        self.assertFalse(registration.has_header("Content-Encoding"))
+
+    def test_other_responses_are_still_compressed(self):
+        self.client.force_authenticate(self.user)
+        self.client.post("/api/boards/", {"title": "x" * 200}, format="json")
+        response = self.client.get("/api/boards/", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+
+
+class EmailNormalizedTests(APITestCase):
+    def setUp(self):
+        self.ada = User.objects.create_user(
+            username="ada", email="Ada@Example.com", password="secret-pass-1"
+        )
+
+    def test_profile_follows_email_changes(self):
+        self.ada.email = " ADA@example.org "
+        self.ada.save()
+        self.assertEqual(
+            UserProfile.objects.get(user=self.ada).email_normalized, "ada@example.org"
+        )
+
+    def test_taking_another_accounts_email_is_a_validation_error(self):
+        grace = User.objects.create_user(
+            username="grace", email="grace@example.com", password="secret-pass-1"
+        )
+        grace.email = "ada@example.com"
+        with self.assertRaises(EmailInUse):
+            grace.save()
+        self.assertEqual(
+            UserProfile.objects.get(user=grace).email_normalized, "grace@example.com"
+        )
+
+    def test_registration_rejects_email_in_other_casing(self):
+        response = self.client.post(
+            "/api/registration/",
+            {
+                "fullname": "Ada",
+                "email": "ADA@example.com",
+                "password": "secret-pass-1",
+                "repeated_password": "secret-pass-1",
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("email", response.data)
+
+
+class ExpiringTokenTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="ada", email="ada@example.com", password="secret-pass-1"
+        )
+
+    def test_valid_key_is_kept_and_its_expiry_extended(self):
+        key = issue_token(self.user)
+        ExpiringToken.objects.update(expires_at=timezone.now() + timedelta(minutes=1))
+        self.assertEqual(issue_token(self.user), key)
+        token = ExpiringToken.objects.get()
+        self.assertGreater(token.expires_at, timezone.now() + timedelta(minutes=2))
+
+    def test_expired_key_is_rotated_and_refused(self):
+        key = issue_token(self.user)
+        ExpiringToken.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + key)
+        self.assertEqual(self.client.get("/api/boards/").status_code, 401)
+
+        new_key = issue_token(self.user)
+        self.assertNotEqual(new_key, key)
+        self.assertEqual(ExpiringToken.objects.count(), 1)
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + new_key)
+        self.assertEqual(self.client.get("/api/boards/").status_code, 200)
+
+    def test_purge_removes_only_expired_tokens(self):
+        issue_token(self.user)
+        for name in ("b", "c", "d"):
+            issue_token(User.objects.create_user(username=name, email=f"{name}@example.com"))
+        ExpiringToken.objects.exclude(user=self.user).update(
+            expires_at=timezone.now() - timedelta(days=1)
+        )
+        self.assertEqual(purge_expired_tokens(batch_size=2), 3)
+        self.assertEqual(list(ExpiringToken.objects.values_list("user", flat=True)), [self.user.pk])
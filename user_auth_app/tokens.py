@@ -0,0 +1,65 @@
+"""
+Issuing and sweeping of expiring API tokens.
+
+`issue_token` is a single INSERT ... ON CONFLICT (user) DO UPDATE that
+keeps a still-valid key and rotates an expired one, so concurrent logins
+of the same user agree on one key without a SELECT-then-INSERT race.
+Every login restarts the lifetime, so a returned key is always good for
+a full AUTH_TOKEN_TTL.
+"""
+import secrets
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import ExpiringToken
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def issue_token(user) -> str:
+    """
+    Return the user's valid token key, creating or rotating it as needed,
+    and extend its expiry to a full AUTH_TOKEN_TTL from now.
+    """
+    now = timezone.now()
+    table = connection.ops.quote_name(ExpiringToken._meta.db_table)
+    key = connection.ops.quote_name("key")
+    expired = f"{table}.expires_at <= excluded.created"
+    sql = (
+        f"INSERT INTO {table} ({key}, user_id, created, expires_at) "
+        f"VALUES (%s, %s, %s, %s) "
+        f"ON CONFLICT (user_id) DO UPDATE SET "
+        f"{key} = CASE WHEN {expired} THEN excluded.{key} ELSE {table}.{key} END, "
+        f"created = CASE WHEN {expired} THEN excluded.created ELSE {table}.created END, "
+        f"expires_at = excluded.expires_at "
+        f"RETURNING {key}"
+    )
+    params = [
+        secrets.token_hex(20),
+        user.pk,
+        connection.ops.adapt_datetimefield_value(now),
+        connection.ops.adapt_datetimefield_value(now + settings.AUTH_TOKEN_TTL),
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchone()[0]
+
+
+def purge_expired_tokens(batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """Delete expired tokens in bounded batches; return how many went."""
+    table = ExpiringToken._meta.db_table
+    sql = (
+        f"DELETE FROM {table} WHERE id IN "
+        f"(SELECT id FROM {table} WHERE expires_at <= %s LIMIT %s)"
+    )
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+    total = 0
+    while True:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(sql, [now, batch_size])
+            deleted = cursor.rowcount
+        total += deleted
+        if deleted < batch_size:
+            return total